@@ -0,0 +1,88 @@
+"""画像の読み込みと共有
+
+asset_manager・text_cache・BackgroundLoader（icon_cache・画像閲覧の画像）が渡すサーフェスは
+複数の描画で共有されるため、描画先として変更しないこと。
+"""
+import os
+import pygame
+
+RESOURCE_DIR = "game_resources"
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+def convert_for_display(surface):
+    """画面が作成済みなら画面のピクセル形式に変換したサーフェスを返す（できない場合は元のサーフェス）"""
+    if pygame.display.get_surface() is None:
+        return surface
+    try:
+        return surface.convert_alpha()
+    except pygame.error:
+        return surface
+
+
+class AssetManager:
+    """ゲーム用の画像を一度だけ読み込んで共有する
+
+    画像はパスと拡大縮小後のサイズごとに保持し、画面のピクセル形式に
+    変換（convert_alpha）してから渡す。読み込みに失敗した画像も記録し、
+    同じファイルを何度も読みに行かないようにする。
+    """
+
+    def __init__(self):
+        self._images = {}  # (パス, サイズ) -> サーフェス（失敗時はNone）
+        self._converted = set()  # 画面形式に変換済みのキー
+
+    def preload(self, directory=RESOURCE_DIR):
+        """ディレクトリ内の画像をまとめて読み込む"""
+        try:
+            names = sorted(os.listdir(directory))
+        except OSError as e:
+            print(f"リソースフォルダの読み込みに失敗しました: {e}")
+            return
+        for name in names:
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                self.get_image(os.path.join(directory, name))
+
+    def get_image(self, path, size=None):
+        """画像を取得（sizeを指定するとその大きさに拡大縮小した画像）
+
+        読み込めない場合はNoneを返す。
+        """
+        key = (os.path.normpath(path), size)
+        if key in self._images:
+            image = self._images[key]
+            if image is not None and key not in self._converted:
+                image = self._convert(key, image)
+            return image
+
+        if size is None:
+            try:
+                image = pygame.image.load(key[0])
+            except (pygame.error, FileNotFoundError):
+                image = None
+        else:
+            # 拡大縮小前の画像も共有する
+            original = self.get_image(path)
+            image = pygame.transform.scale(original, size) if original is not None else None
+
+        self._images[key] = image
+        if image is not None:
+            image = self._convert(key, image)
+        return image
+
+    def clear(self):
+        """読み込んだ画像を破棄する"""
+        self._images.clear()
+        self._converted.clear()
+
+    def _convert(self, key, image):
+        """画面形式に変換できたら変換後の画像を記録する"""
+        converted = convert_for_display(image)
+        if converted is not image:
+            self._images[key] = converted
+            self._converted.add(key)
+        return converted
+
+
+# プロセス全体で共有する画像管理
+asset_manager = AssetManager()
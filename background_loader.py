@@ -0,0 +1,128 @@
+import queue
+import threading
+from collections import OrderedDict
+from asset_manager import convert_for_display
+
+
+def get_surface_bytes(surface):
+    """サーフェスのピクセルデータのバイト数"""
+    return surface.get_pitch() * surface.get_height() if surface is not None else 0
+
+
+class BackgroundLoader:
+    """読み込みの重いサーフェスを別スレッドで先読みして保持するLRUキャッシュ
+
+    load はキーからサーフェスを作る関数（読み込めない場合はNone）で、
+    prefetch() で予約したキーは別スレッドで load しておき、画面形式への変換だけを
+    get() の時に行う。同じキーを両方のスレッドで読み込まないように、読み込み中の
+    キーを登録し、読み込み中のキーを get() した場合は読み終わるのを待つ。
+    保持する数が max_entries を、合計バイト数が max_bytes を超えたら
+    （None は上限なし）最も長く使われていないものから破棄する。
+    """
+
+    def __init__(self, load, max_entries=None, max_bytes=None, name="background-loader"):
+        self.load = load
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.name = name
+        self.total_bytes = 0
+        self._surfaces = OrderedDict()  # キー -> サーフェス（読み込めない場合はNone）
+        self._converted = set()  # 画面形式に変換済みのキー
+        self._queued = set()  # 読み込みを予約したキー
+        self._loading = set()  # どちらかのスレッドが読み込み中のキー
+        self._condition = threading.Condition()
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def get(self, key):
+        """サーフェスを取得（先読み中なら読み終わるのを待ち、まだ読み込んでいなければその場で読み込む）
+
+        予約済みでまだ読み込みが始まっていないキーはその場で読み込み、読み込みスレッドは飛ばす。
+        """
+        with self._condition:
+            while key in self._loading:
+                self._condition.wait()
+            found = key in self._surfaces
+            if found:
+                self._surfaces.move_to_end(key)
+                surface = self._surfaces[key]
+            else:
+                self._loading.add(key)
+        if not found:
+            surface = self._load(key)
+        if surface is not None and key not in self._converted:
+            surface = self._convert(key, surface)
+        return surface
+
+    def prefetch(self, key):
+        """読み込みを別スレッドに予約する（すぐに戻る）"""
+        with self._condition:
+            if key in self._surfaces or key in self._queued or key in self._loading:
+                return
+            self._queued.add(key)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._load_loop, name=self.name, daemon=True)
+            self._thread.start()
+        self._queue.put(key)
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    def clear(self):
+        """保持しているサーフェスを破棄する"""
+        with self._condition:
+            self._surfaces.clear()
+            self._converted.clear()
+            self.total_bytes = 0
+
+    def _load_loop(self):
+        """読み込みスレッド：予約されたキーを順に読み込む"""
+        while True:
+            key = self._queue.get()
+            with self._condition:
+                self._queued.discard(key)
+                if key in self._surfaces or key in self._loading:
+                    continue
+                self._loading.add(key)
+            self._load(key)
+
+    def _load(self, key):
+        """読み込み中として登録したキーを読み込んでキャッシュに追加する
+
+        読み込みで例外が起きた場合（壊れたファイルやメモリ不足など）は表示して
+        読み込めなかったものとして記録する（読み込みスレッドは止めない）。
+        """
+        try:
+            surface = self.load(key)
+        except Exception as e:
+            print(f"{self.name}: 読み込みに失敗しました: {key}: {e!r}")
+            surface = None
+        with self._condition:
+            self._put(key, surface)
+            self._loading.discard(key)
+            self._condition.notify_all()
+        return surface
+
+    def _put(self, key, surface):
+        """サーフェスを追加し、上限を超えた分を古いものから破棄する（追加したものは残す）"""
+        if key in self._surfaces:
+            self.total_bytes -= get_surface_bytes(self._surfaces.pop(key))
+            self._converted.discard(key)
+        self._surfaces[key] = surface
+        self.total_bytes += get_surface_bytes(surface)
+        while len(self._surfaces) > 1 and (
+                (self.max_entries is not None and len(self._surfaces) > self.max_entries) or
+                (self.max_bytes is not None and self.total_bytes > self.max_bytes)):
+            old_key, old_surface = self._surfaces.popitem(last=False)
+            self._converted.discard(old_key)
+            self.total_bytes -= get_surface_bytes(old_surface)
+
+    def _convert(self, key, surface):
+        """画面形式に変換できたら変換後のサーフェスを記録する"""
+        converted = convert_for_display(surface)
+        if converted is not surface:
+            with self._condition:
+                if self._surfaces.get(key) is surface:
+                    self._put(key, converted)
+                    self._converted.add(key)
+        return converted
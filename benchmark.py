@@ -0,0 +1,302 @@
+"""ゲームループの性能ベンチマーク
+
+SDLのダミーのビデオドライバー（画面に表示しない）で Game.update() と Game.draw() を
+繰り返し実行し、シナリオごとに1秒あたりの更新回数と描画回数を測る。
+保存した基準値より一定以上遅くなったシナリオがあれば終了コード1で終了する。
+基準値ファイルがない場合や、基準値と描画モードが異なる場合は比較せずに終了コード2で終了する。
+基準値は描画モードごとに別のファイル（benchmark_baseline.json / benchmark_baseline_dirty.json）に保存する。
+
+使い方:
+    python benchmark.py [--scenario 名前 ...] [--ticks 回数] [--repeat 回数] [--dirty]
+                        [--baseline ファイル] [--save-baseline] [--tolerance 割合]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+
+# ウィンドウを表示せずに描画する
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+from constants.constants import *
+from game_logics.block import BlockField
+from game_logics.entity_world import ENTITY_BULLET, ENTITY_ITEM
+from game_logics.layout_cache import DEFAULT_LAYOUT_COLS, DEFAULT_LAYOUT_ROWS
+from game_logics.playfield import Playfield
+from game_logics.input_source import AutoPilotInputSource
+from save_manager import SaveManager
+
+DEFAULT_BASELINE = "benchmark_baseline.json"
+DEFAULT_DIRTY_BASELINE = "benchmark_baseline_dirty.json"  # 差分描画モードの基準値
+DEFAULT_TICKS = 600  # 1回の計測で更新・描画する回数
+DEFAULT_REPEAT = 3  # 計測を繰り返す回数（最も速かった回を使う）
+DEFAULT_TOLERANCE = 0.15  # 基準値からこの割合以上遅くなったら失敗
+BENCHMARK_SEED = 12345
+
+FULL_GRID_DURABILITY = 9  # 全面ブロックの耐久性（計測中になるべく壊れないように）
+MULTI_BALL_COUNT = 5
+CHAOS_BALL_COUNT = 48
+BULLET_COUNT = 6
+MAX_ITEMS = 8
+ITEM_TYPES = ["wide_paddle", "multi_ball", "slow_ball", "extra_life", "bonus_score", "power_ball", "paddle_shot"]
+
+
+class Scenario:
+    """ベンチマークの状況（ステージとボール・弾・アイテムの数）
+
+    計測中は更新の前に keep() で数を保ち、ブロックが減りすぎたら元に戻す。
+    """
+
+    def __init__(self, name, description, full_grid=False, balls=1, bullets=0, items=0, power_ball=False,
+                 laser=False):
+        self.name = name
+        self.description = description
+        self.full_grid = full_grid
+        self.balls = balls
+        self.bullets = bullets
+        self.items = items
+        self.power_ball = power_ball
+        self.laser = laser
+        self.initial_state = None
+        self.initial_remaining = 0
+
+    def setup(self, game):
+        """ゲームをシナリオの状態にする"""
+        if self.full_grid:
+            layout = [[FULL_GRID_DURABILITY] * DEFAULT_LAYOUT_COLS for _ in range(DEFAULT_LAYOUT_ROWS)]
+            game.block_layout = layout
+            game.block_field = BlockField.from_layout(layout, game.foreground, game.background)
+            game.playfield = Playfield(game.background, game.block_field)
+        self.initial_state = game.block_field.get_state()
+        self.initial_remaining = game.block_field.remaining_count()
+
+        game.ball_pool.release_all(game.balls)
+        self.keep(game)
+
+    def keep(self, game):
+        """ボール・弾・アイテムの数を保ち、ゲームオーバーやステージクリアにならないようにする"""
+        game.lives = 99
+        game.paddle_shot_count = 0
+
+        # ブロックが半分を切ったら元に戻す（ステージクリアでセーブデータを書き換えないように）
+        if game.block_field.remaining_count() * 2 < self.initial_remaining:
+            self.restore_blocks(game)
+
+        free_balls = [ball for ball in game.balls if not ball.stuck_to_paddle]
+        while len(free_balls) < self.balls:
+            ball = game.ball_pool.acquire(game.paddle.x, game.current_ball_speed, game.rng)
+            ball.release()
+            game.balls.append(ball)
+            free_balls.append(ball)
+        if self.power_ball:
+            game.power_ball_timer = max(game.power_ball_timer, LOGIC_FPS)
+            for ball in game.balls:
+                ball.power_ball = True
+
+        if self.laser:
+            # 自動操作がスペースキーを押し続けて連射する
+            game.laser_timer = max(game.laser_timer, LOGIC_FPS)
+
+        active_bullets = game.entities.count(ENTITY_BULLET)
+        for i in range(self.bullets - active_bullets):
+            x = game.paddle.x + game.paddle.width * (i + 1) // (self.bullets + 1)
+            game.entities.spawn_bullet(x, game.paddle.y)
+
+        while game.entities.count(ENTITY_ITEM) < self.items:
+            x = game.rng.randrange(0, SCREEN_WIDTH - ITEM_SIZE)
+            y = game.rng.randrange(GAME_AREA_Y, SCREEN_HEIGHT // 2)
+            game.entities.spawn_item(x, y, game.rng.choice(ITEM_TYPES))
+
+    def restore_blocks(self, game):
+        game.block_field.set_state(*self.initial_state)
+        if game.playfield is not None:
+            game.playfield = Playfield(game.background, game.block_field)
+
+
+SCENARIOS = [
+    Scenario("stage", "キャラクターのステージ1（ボール1個）"),
+    Scenario("full_grid", "21x23マスすべてにブロック", full_grid=True),
+    Scenario("multi_ball", f"ボール{MULTI_BALL_COUNT}個", balls=MULTI_BALL_COUNT),
+    Scenario("bullets", f"パドルショット{BULLET_COUNT}発", bullets=BULLET_COUNT),
+    Scenario("items", f"アイテム{MAX_ITEMS}個が落下中", items=MAX_ITEMS),
+    Scenario("laser", "レーザーの連射", laser=True),
+    Scenario("power_ball", "パワーボール（ブロックを貫通）", power_ball=True),
+    Scenario("stress", "すべての組み合わせ", full_grid=True, balls=MULTI_BALL_COUNT,
+             bullets=BULLET_COUNT, items=MAX_ITEMS, power_ball=True),
+    Scenario("chaos", f"ボール{CHAOS_BALL_COUNT}個（Chaos難易度の最大数）", balls=CHAOS_BALL_COUNT),
+]
+
+
+def create_game(dirty):
+    """ベンチマーク用のゲームを作る（最初のキャラクター・Normal）"""
+    from game_logics.game import Game
+
+    save_manager = SaveManager()
+    difficulties = save_manager.load_difficulty_data()
+    difficulty_key = "normal" if "normal" in difficulties else next(iter(difficulties))
+    return Game({
+        "chara": save_manager.load_charas_data()[0],
+        "difficulty": difficulty_key,
+        "difficulty_settings": difficulties[difficulty_key],
+        "seed": BENCHMARK_SEED,
+        "input_source": AutoPilotInputSource(),
+        "record_replay": False,
+        "profile": False,
+        "dirty_rect_rendering": dirty,
+    })
+
+
+def run_scenario(scenario, ticks, dirty):
+    """シナリオを1回計測し、更新と描画それぞれの合計時間（秒）を返す"""
+    game = create_game(dirty)
+    scenario.setup(game)
+
+    update_time = 0.0
+    draw_time = 0.0
+    for _ in range(ticks):
+        scenario.keep(game)
+        game.apply_input(game.input_source.read(game))
+
+        start = time.perf_counter()
+        game.update()
+        middle = time.perf_counter()
+        game.draw(0.5)
+        end = time.perf_counter()
+
+        update_time += middle - start
+        draw_time += end - middle
+        # 描画イベントがたまらないようにする
+        pygame.event.pump()
+    return update_time, draw_time
+
+
+def run_benchmark(scenarios, ticks=DEFAULT_TICKS, repeat=DEFAULT_REPEAT, dirty=False):
+    """シナリオごとに計測して 1秒あたりの更新回数・描画回数 を返す"""
+    results = {}
+    for scenario in scenarios:
+        best_update = best_draw = None
+        for _ in range(repeat):
+            # ゲームのメッセージ表示（ボール速度の上昇など）は結果の表示に混ぜない
+            with contextlib.redirect_stdout(io.StringIO()):
+                update_time, draw_time = run_scenario(scenario, ticks, dirty)
+            best_update = update_time if best_update is None else min(best_update, update_time)
+            best_draw = draw_time if best_draw is None else min(best_draw, draw_time)
+        results[scenario.name] = {
+            "ticks_per_sec": round(ticks / best_update, 1) if best_update else 0,
+            "draws_per_sec": round(ticks / best_draw, 1) if best_draw else 0,
+        }
+    return results
+
+
+def compare_with_baseline(results, baseline, tolerance):
+    """基準値より tolerance 以上遅くなった項目を (シナリオ, 項目, 基準値, 今回) のリストで返す"""
+    regressions = []
+    for name, values in results.items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            continue
+        for key, value in values.items():
+            if key in base and value < base[key] * (1 - tolerance):
+                regressions.append((name, key, base[key], value))
+    return regressions
+
+
+def load_baseline(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"基準値ファイルの読み込みに失敗しました: {e}")
+        return None
+
+
+def save_baseline(path, results, ticks, dirty):
+    data = {
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "machine": platform.node(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "ticks": ticks,
+        "dirty_rect_rendering": dirty,
+        "scenarios": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def print_results(results, baseline=None):
+    print(f"{'シナリオ':<10}{'更新/秒':>9}{'描画/秒':>9}")
+    for name, values in results.items():
+        line = f"{name:<14}{values['ticks_per_sec']:>12.0f}{values['draws_per_sec']:>12.0f}"
+        base = (baseline or {}).get("scenarios", {}).get(name)
+        if base:
+            ticks_ratio = values["ticks_per_sec"] / base["ticks_per_sec"] - 1
+            draws_ratio = values["draws_per_sec"] / base["draws_per_sec"] - 1
+            line += f"   （基準比 更新 {ticks_ratio:+.1%} / 描画 {draws_ratio:+.1%}）"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ゲームループの性能ベンチマーク")
+    parser.add_argument("--scenario", nargs="*", default=None,
+                        help=f"計測するシナリオ（省略時はすべて: {', '.join(s.name for s in SCENARIOS)}）")
+    parser.add_argument("--ticks", type=int, default=DEFAULT_TICKS, help="1回の計測の更新・描画回数")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="計測の繰り返し回数（最速の回を使う）")
+    parser.add_argument("--dirty", action="store_true", help="差分描画モードで計測する")
+    parser.add_argument("--baseline", default=None,
+                        help=f"基準値ファイル（省略時は {DEFAULT_BASELINE}、--dirty の場合は {DEFAULT_DIRTY_BASELINE}）")
+    parser.add_argument("--save-baseline", action="store_true", help="今回の結果を基準値として保存する")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="失敗とする基準値からの低下の割合")
+    args = parser.parse_args(argv)
+    if args.baseline is None:
+        args.baseline = DEFAULT_DIRTY_BASELINE if args.dirty else DEFAULT_BASELINE
+
+    scenarios = SCENARIOS
+    if args.scenario:
+        names = {scenario.name for scenario in SCENARIOS}
+        unknown = [name for name in args.scenario if name not in names]
+        if unknown:
+            raise SystemExit(f"シナリオが見つかりません: {', '.join(unknown)}")
+        scenarios = [scenario for scenario in SCENARIOS if scenario.name in args.scenario]
+
+    pygame.init()
+    results = run_benchmark(scenarios, args.ticks, args.repeat, args.dirty)
+    pygame.quit()
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results, args.ticks, args.dirty)
+        print_results(results)
+        print(f"基準値を保存しました: {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print_results(results)
+        print(f"基準値ファイルがありません（--save-baseline で作成）: {args.baseline}")
+        return 2
+    if baseline.get("dirty_rect_rendering", False) != args.dirty:
+        # 差分描画と全画面描画の結果は比べられないため比較しない
+        print_results(results)
+        print(f"基準値と描画モードが異なるため比較できません: {args.baseline}")
+        return 2
+    print_results(results, baseline)
+    if baseline.get("machine") != platform.node():
+        print(f"注意: 基準値は別のマシン（{baseline.get('machine')}）で計測されています")
+
+    regressions = compare_with_baseline(results, baseline, args.tolerance)
+    for name, key, base, value in regressions:
+        print(f"性能低下: {name} {key} {base:.0f} -> {value:.0f}（許容 -{args.tolerance:.0%}）")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+import json
+import os
+
+CHARAS_FILE_PATH = "settings/charas.json"
+DIFFICULTY_FILE_PATH = "settings/game_difficulty.json"
+STAGE_FILE_NAME = "stage.json"
+
+
+class ConfigRepository:
+    """設定ファイル（charas.json・各キャラクターのstage.json・game_difficulty.json）を共有するキャッシュ
+
+    ファイルは一度だけ読み込んでプロセス全体で共有し、更新日時か大きさが
+    変わった時だけ読み直す。返すデータは共有されるため変更しないこと。
+    読み込みに失敗した場合の例外（FileNotFoundError・json.JSONDecodeError・KeyError）は
+    そのまま呼び出し元に渡す（フォールバックは呼び出し元ごとに異なるため）。
+    """
+
+    def __init__(self):
+        self._files = {}  # ファイルパス -> ((更新日時, 大きさ), 読み込んだデータ)
+        self._folder_indexes = {}  # フォルダ名 -> charas.jsonの記述順
+        self._folder_indexes_source = None  # 対応表を作った時のキャラクターリスト
+
+    def load_json(self, path):
+        """JSONファイルを読み込む（前回の読み込みから変更がなければキャッシュを返す）"""
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        entry = self._files.get(path)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        self._files[path] = (version, data)
+        return data
+
+    def get_charas(self):
+        """charas.jsonのキャラクターリストを取得"""
+        return self.load_json(CHARAS_FILE_PATH)["charas"]
+
+    def get_chara_index(self, chara_folder):
+        """キャラクターのフォルダ名からcharas.jsonの記述順を取得（ない場合はNone）"""
+        charas = self.get_charas()
+        if self._folder_indexes_source is not charas:
+            self._folder_indexes = {}
+            for i, chara in enumerate(charas):
+                self._folder_indexes.setdefault(chara["folder"], i)
+            self._folder_indexes_source = charas
+        return self._folder_indexes.get(chara_folder)
+
+    def get_stages(self, chara_folder):
+        """キャラクターのstage.jsonのステージリストを取得"""
+        return self.load_json(os.path.join(chara_folder, STAGE_FILE_NAME))["stages"]
+
+    def get_difficulties(self):
+        """game_difficulty.jsonの難易度設定を取得"""
+        return self.load_json(DIFFICULTY_FILE_PATH)["difficulties"]
+
+    def clear(self):
+        """読み込んだ設定を破棄する"""
+        self._files.clear()
+        self._folder_indexes = {}
+        self._folder_indexes_source = None
+
+
+# プロセス全体で共有する設定ファイルのキャッシュ
+config_repository = ConfigRepository()
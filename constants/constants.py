@@ -16,6 +16,11 @@ BALL_SPEED_INITIAL = 8  # ボールの初期速度
 BALL_SPEED_MAX = 18     # ボールの最大速度
 BALL_SPEED_INCREMENT = 1  # 速度上昇値
 BLOCKS_PER_SPEED_UP = 10  # 速度上昇に必要なブロック破壊数
+BALL_MAX_BOUNCES = 4  # 1回の更新で処理する反射の最大回数
+MAX_BALLS = 5  # 同時に出せるボールの最大数（難易度設定の max_balls で変更できる）
+VECTORIZED_BALLS = True  # NumPyがあれば、多数のボールの移動をまとめて計算する
+VECTORIZED_BALL_MIN = 8  # まとめて計算するボール数の下限（少ない時は1個ずつの方が速い）
+ENTITY_POOL_SIZE = 64  # EntityPool に取っておく使い終わったボールの最大数（アイテムと弾丸は EntityWorld が管理）
 
 # ブロック設定
 BLOCK_SIZE = 32  # 32x32ピクセルの正方形ブロック
@@ -24,10 +29,37 @@ BLOCK_SIZE = 32  # 32x32ピクセルの正方形ブロック
 ITEM_SIZE = 24
 ITEM_FALL_SPEED = 3
 ITEM_SCORE_THRESHOLD = 200  # アイテム出現に必要なスコア
+ENTITY_CAPACITY = 64  # アイテムと弾丸の成分配列の初期の大きさ（足りなければ広げる）
 
 # 弾丸設定
 BULLET_SIZE = 8
 BULLET_SPEED = 12
+MAX_BULLETS = 64  # 同時に飛ばせる弾の最大数
+LASER_DURATION = 300  # レーザーの効果時間（60fps × 5秒）
+LASER_FIRE_INTERVAL = 4  # レーザーの発射間隔（更新回数）
+
+# ゲームループ設定
+LOGIC_FPS = 60  # ゲームロジックの更新回数（1秒あたり、タイマーはこの回数で数える）
+MAX_FRAME_TIME = 250  # 1回の描画までに処理する経過時間の上限（ミリ秒、処理落ち時の追いつき防止）
+RENDER_FPS = 60  # 描画の上限フレームレート（0で上限なし）
+
+# リプレイ設定
+RECORD_REPLAY = False  # プレイの入力をリプレイとして記録する
+REPLAY_DIR = "replays"  # リプレイの保存先
+REPLAY_KEYFRAME_INTERVAL = LOGIC_FPS * 10  # キーフレーム（途中から再生するための状態）を保存する間隔（更新回数）
+
+# 描画設定
+DIRTY_RECT_RENDERING = False  # 変化した領域だけを画面転送する描画モード（低性能な筐体向け）
+
+# キャッシュ設定
+TEXT_CACHE_SIZE = 512  # text_cache に保持する描画済みの文字列の最大数
+ICON_CACHE_SIZE = 128  # icon_cache に保持する拡大縮小済みのキャラクターアイコンの最大数
+GALLERY_CACHE_BYTES = 32 * 1024 * 1024  # 画像閲覧で拡大縮小済みの画像を保持するメモリの上限（全画面の画像で約14枚分）
+
+# プロファイラ設定
+FRAME_PROFILING = False  # 処理ごとの時間を計測する（F3キーでオーバーレイ表示、計測していなくてもF3で開始）
+PROFILE_HISTORY = 600  # パーセンタイルを求める直近のフレーム数
+PROFILE_DIR = "profiles"  # 終了時に計測結果を書き出す先
 
 # 色の定義
 BLACK = (0, 0, 0)
@@ -1,8 +1,11 @@
 import pygame
 import os
 import json
-import csv
 from constants.constants import *
+from text_cache import text_cache
+from config_repository import config_repository
+from save_manager import SaveManager
+from gallery_logics.image_loader import gallery_image_loader
 
 class Gallery:
     def __init__(self, chara):
@@ -16,14 +19,9 @@ class Gallery:
         self.clock = pygame.time.Clock()
         
         # フォントの設定
-        try:
-            self.font = pygame.font.Font("PixelMplus12-Regular.ttf", 32)
-            self.small_font = pygame.font.Font("PixelMplus12-Regular.ttf", 24)
-            self.tiny_font = pygame.font.Font("PixelMplus12-Regular.ttf", 18)
-        except (pygame.error, FileNotFoundError):
-            self.font = pygame.font.Font(None, 32)
-            self.small_font = pygame.font.Font(None, 24)
-            self.tiny_font = pygame.font.Font(None, 18)
+        self.font = text_cache.get_font(32)
+        self.small_font = text_cache.get_font(24)
+        self.tiny_font = text_cache.get_font(18)
         
         # セーブデータを読み込み
         self.save_data = self.load_save_data()
@@ -46,70 +44,12 @@ class Gallery:
     
     def load_save_data(self):
         """セーブデータを読み込む"""
-        save_data = {}
-        try:
-            with open("save/save.dat", "r", encoding="utf-8") as f:
-                csv_reader = csv.reader(f)
-                header = next(csv_reader)  # ヘッダー行をスキップ
-                
-                # charas.jsonからキャラクターの順序を取得
-                charas_data = self.load_charas_data()
-                chara_index = None
-                for i, g in enumerate(charas_data):
-                    if g["folder"] == self.chara["folder"]:
-                        chara_index = i
-                        break
-                
-                if chara_index is not None:
-                    # 該当するキャラクターの行を読み込み
-                    for i, row in enumerate(csv_reader):
-                        if i == chara_index and len(row) >= 8:
-                            save_data = {
-                                "clear": int(row[0]) if row[0] else 0,
-                                "hi_score": int(row[1]) if row[1] else 0,
-                                "bonus_flags": [int(row[j]) if row[j] else 0 for j in range(2, 8)]
-                            }
-                            break
-                    else:
-                        # データがない場合はデフォルト値
-                        save_data = {
-                            "clear": 0,
-                            "hi_score": 0,
-                            "bonus_flags": [0, 0, 0, 0, 0, 0]
-                        }
-                else:
-                    save_data = {
-                        "clear": 0,
-                        "hi_score": 0,
-                        "bonus_flags": [0, 0, 0, 0, 0, 0]
-                    }
-        except (FileNotFoundError, csv.Error) as e:
-            print(f"セーブデータの読み込みに失敗しました: {e}")
-            save_data = {
-                "clear": 0,
-                "hi_score": 0,
-                "bonus_flags": [0, 0, 0, 0, 0, 0]
-            }
-        
-        return save_data
-    
-    def load_charas_data(self):
-        """charas.jsonからキャラクターデータを読み込む"""
-        try:
-            with open("settings/charas.json", "r", encoding="utf-8") as f:
-                data = json.load(f)
-            return data["charas"]
-        except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
-            print(f"charas.jsonの読み込みに失敗しました: {e}")
-            return []
+        return SaveManager().get_chara_data(self.chara["folder"])
     
     def load_stages_data(self):
         """ステージデータを読み込む"""
         try:
-            stage_json_path = os.path.join(self.chara["folder"], "stage.json")
-            with open(stage_json_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            return data["stages"]
+            return config_repository.get_stages(self.chara["folder"])
         except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
             print(f"{self.chara['folder']}/stage.jsonの読み込みに失敗しました: {e}")
             return []
@@ -192,15 +132,19 @@ class Gallery:
         return True
     
     def load_current_image(self):
-        """現在の画像を読み込み"""
+        """現在の画像を読み込み（画面サイズに合わせてスケールした画像、読み込めない場合はNone）"""
         if self.current_image is None and self.image_list:
-            try:
-                image_info = self.image_list[self.current_index]
-                self.current_image = pygame.image.load(image_info["path"])
-                # 画面サイズに合わせてスケール（全画面表示）
-                self.current_image = pygame.transform.scale(self.current_image, (SCREEN_WIDTH, SCREEN_HEIGHT))
-            except (pygame.error, FileNotFoundError):
-                self.current_image = None
+            image_info = self.image_list[self.current_index]
+            self.current_image = gallery_image_loader.get(image_info["path"])
+            
+            # 次と前の画像を先に読み込んでおく
+            self.prefetch_adjacent_images()
+    
+    def prefetch_adjacent_images(self):
+        """次と前の画像を別スレッドで読み込んでおく"""
+        for index in (self.current_index + 1, self.current_index - 1):
+            if 0 <= index < len(self.image_list):
+                gallery_image_loader.prefetch(self.image_list[index]["path"])
     
     def draw(self):
         """画面描画"""
@@ -220,13 +164,13 @@ class Gallery:
                 self.draw_info_window()
         else:
             # 画像がない場合
-            no_image_text = self.font.render("表示できる画像がありません", True, WHITE)
+            no_image_text = text_cache.render(self.font, "表示できる画像がありません", WHITE)
             no_image_rect = no_image_text.get_rect()
             no_image_x = (SCREEN_WIDTH - no_image_rect.width) // 2
             no_image_y = (SCREEN_HEIGHT - no_image_rect.height) // 2
             self.screen.blit(no_image_text, (no_image_x, no_image_y))
             
-            instruction_text = self.small_font.render("ESC: 戻る", True, (150, 150, 150))
+            instruction_text = text_cache.render(self.small_font, "ESC: 戻る", (150, 150, 150))
             instruction_rect = instruction_text.get_rect()
             instruction_x = (SCREEN_WIDTH - instruction_rect.width) // 2
             self.screen.blit(instruction_text, (instruction_x, no_image_y + 50))
@@ -267,13 +211,13 @@ class Gallery:
             title_text = self.chara["name"]
             title_color = WHITE
         
-        title_surface = self.small_font.render(title_text, True, title_color)
+        title_surface = text_cache.render(self.small_font, title_text, title_color)
         title_rect = title_surface.get_rect()
         title_x = info_x + (info_width - title_rect.width) // 2
         self.screen.blit(title_surface, (title_x, info_y + 10))
         
         # ページ情報
-        page_text = self.small_font.render(f"{self.current_index + 1} / {len(self.image_list)}", True, (200, 200, 200))
+        page_text = text_cache.render(self.small_font, f"{self.current_index + 1} / {len(self.image_list)}", (200, 200, 200))
         page_rect = page_text.get_rect()
         page_x = info_x + (info_width - page_rect.width) // 2
         self.screen.blit(page_text, (page_x, info_y + 40))
@@ -285,7 +229,7 @@ class Gallery:
         controls.extend(["I: 情報表示切り替え", "ESC: 戻る"])
         
         for i, control in enumerate(controls):
-            control_text = self.tiny_font.render(control, True, (120, 120, 120))
+            control_text = text_cache.render(self.tiny_font, control, (120, 120, 120))
             control_rect = control_text.get_rect()
             control_x = info_x + (info_width - control_rect.width) // 2
             control_y = info_y + 65 + i * 20
@@ -2,6 +2,7 @@ import pygame
 import json
 import os
 from constants.constants import *
+from text_cache import text_cache
 from select_logics.base import BaseSelector
 
 class GalleryCharacterSelect(BaseSelector):
@@ -48,6 +49,9 @@ class GalleryCharacterSelect(BaseSelector):
         
         # ボタンの配置を計算
         self.calculate_button_positions()
+        
+        # 前後のページのアイコンを先に読み込んでおく
+        self.prefetch_adjacent_page_icons()
     
         # 背景色を紫系に変更
         self.background.fill((30, 15, 40))  # 濃い紫色
@@ -292,7 +296,7 @@ class GalleryCharacterSelect(BaseSelector):
         
         pygame.draw.rect(self.screen, back_color, self.back_button_rect)
         pygame.draw.rect(self.screen, back_border, self.back_button_rect, back_border_width)
-        back_text = self.small_font.render("戻る", True, self.colors["text_normal"])
+        back_text = text_cache.render(self.small_font, "戻る", self.colors["text_normal"])
         back_rect = back_text.get_rect(center=self.back_button_rect.center)
         self.screen.blit(back_text, back_rect)
         
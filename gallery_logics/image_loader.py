@@ -0,0 +1,20 @@
+import pygame
+from background_loader import BackgroundLoader
+from constants.constants import *
+
+
+def load_scaled_image(path, size):
+    """画像を読み込んで指定サイズに拡大縮小する（読み込めない場合はNone）"""
+    try:
+        return pygame.transform.scale(pygame.image.load(path), size)
+    except (pygame.error, FileNotFoundError):
+        return None
+
+
+def load_gallery_image(path):
+    """画像閲覧モードの画像を画面の大きさで読み込む"""
+    return load_scaled_image(path, (SCREEN_WIDTH, SCREEN_HEIGHT))
+
+
+# プロセス全体で共有する画像閲覧用の画像キャッシュ（パスをキーに、合計バイト数の上限付きで保持する）
+gallery_image_loader = BackgroundLoader(load_gallery_image, max_bytes=GALLERY_CACHE_BYTES, name="gallery-loader")
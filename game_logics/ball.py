@@ -2,9 +2,14 @@ import pygame
 import math
 import random
 from constants.constants import *
+from asset_manager import convert_for_display
 
 class Ball:
-    def __init__(self, paddle_x=None, ball_speed=BALL_SPEED_INITIAL):
+    def __init__(self, paddle_x=None, ball_speed=BALL_SPEED_INITIAL, rng=None):
+        self.reset(paddle_x, ball_speed, rng)
+    
+    def reset(self, paddle_x=None, ball_speed=BALL_SPEED_INITIAL, rng=None):
+        """作成時の状態に初期化する（プールから取り出したボールの再利用時にも使う）"""
         if paddle_x is not None:
             # パドルの上にボールを配置
             self.x = paddle_x + PADDLE_WIDTH // 2 - BALL_SIZE // 2
@@ -17,13 +22,16 @@ class Ball:
         self.current_speed = ball_speed
         
         # ベクトルを使用した速度管理
-        initial_angle = random.uniform(-math.pi/4, math.pi/4)  # -45度から45度の範囲
+        # 乱数はゲームごとの乱数生成器を使う（指定がなければrandomモジュール）
+        rng = rng or random
+        initial_angle = rng.uniform(-math.pi/4, math.pi/4)  # -45度から45度の範囲
         self.velocity_x = self.current_speed * math.sin(initial_angle)
         self.velocity_y = -self.current_speed * math.cos(initial_angle)  # 上向きに発射
         
         self.size = BALL_SIZE
         self.stuck_to_paddle = True  # ボールがパドルに固定されているかどうか
         self.power_ball = False  # パワーボール状態かどうか
+        self.previous_position = None  # 描画の補間用の更新前の位置
     
     def move(self, paddle=None):
         if self.stuck_to_paddle and paddle:
@@ -52,76 +60,79 @@ class Ball:
         # 現在の速度ベクトルを新しい速度で正規化
         self.normalize_velocity()
     
-    def bounce_wall(self):
-        # 左右の壁との衝突判定と位置修正
-        if self.x <= 0:
-            self.x = 0  # 左の壁にめり込まないよう位置を修正
-            self.velocity_x = abs(self.velocity_x)  # 右向きに修正
-        elif self.x >= SCREEN_WIDTH - self.size:
-            self.x = SCREEN_WIDTH - self.size  # 右の壁にめり込まないよう位置を修正
-            self.velocity_x = -abs(self.velocity_x)  # 左向きに修正
-        
-        # 上の壁との衝突判定と位置修正
-        if self.y <= GAME_AREA_Y:  # セーフエリアを考慮した上壁判定
-            self.y = GAME_AREA_Y  # 上の壁にめり込まないよう位置を修正
-            self.velocity_y = abs(self.velocity_y)  # 下向きに修正
-        
-        # 速度を正規化して一定の速度を保つ
-        self.normalize_velocity()
+    def reflect(self, normal_x, normal_y):
+        # 衝突面の法線の向きに速度を反転（法線が0の軸はそのまま）
+        if normal_x:
+            self.velocity_x = abs(self.velocity_x) * normal_x
+        if normal_y:
+            self.velocity_y = abs(self.velocity_y) * normal_y
     
-    def bounce_paddle(self, paddle):
-        if self.stuck_to_paddle:
-            return False
-            
-        ball_rect = self.get_rect()
-        paddle_rect = paddle.get_rect()
+    def reflect_paddle(self, paddle):
+        # パドルのどの位置で跳ね返るかによって角度を変える
+        hit_pos = (self.x + self.size/2 - paddle.x) / paddle.width  # paddle.widthを使用
+        hit_pos = max(0, min(1, hit_pos))  # 0-1の範囲に制限
+        
+        # 反射角度を計算（-60度から60度の範囲）
+        angle = (hit_pos - 0.5) * (2 * math.pi/3)  # -π/3 から π/3
         
-        if ball_rect.colliderect(paddle_rect):
-            # パドルのどの位置で跳ね返るかによって角度を変える
-            hit_pos = (self.x + self.size/2 - paddle.x) / paddle.width  # paddle.widthを使用
-            hit_pos = max(0, min(1, hit_pos))  # 0-1の範囲に制限
-            
-            # 反射角度を計算（-60度から60度の範囲）
-            angle = (hit_pos - 0.5) * (2 * math.pi/3)  # -π/3 から π/3
-            
-            # 新しい速度ベクトルを計算
-            self.velocity_x = self.current_speed * math.sin(angle)
-            self.velocity_y = -self.current_speed * math.cos(angle)  # 常に上向き
-            
-            return True
-        return False
+        # 新しい速度ベクトルを計算
+        self.velocity_x = self.current_speed * math.sin(angle)
+        self.velocity_y = -self.current_speed * math.cos(angle)  # 常に上向き
     
     def get_rect(self):
         return pygame.Rect(self.x, self.y, self.size, self.size)
     
+    def get_draw_rect(self):
+        """描画で塗りつぶされる領域（縁取りを含む）を取得"""
+        return pygame.Rect(int(self.x) - 2, int(self.y) - 2, self.size + 4, self.size + 4)
+    
+    def get_sprite(self):
+        """通常またはパワーボールの描画済みの画像を取得"""
+        sprite = BALL_SPRITES.get(self.power_ball)
+        if sprite is None:
+            sprite = BALL_SPRITES[self.power_ball] = create_ball_sprite(self.power_ball)
+        return sprite
+    
+    def get_sprite_position(self):
+        """画像を描く左上の座標（縁取りの円がボールの中心に来る位置）"""
+        offset = self.size // 2 + 1
+        return int(self.x + self.size//2) - offset, int(self.y + self.size//2) - offset
+    
     def draw(self, screen):
-        center_x = int(self.x + self.size//2)
-        center_y = int(self.y + self.size//2)
-        radius = self.size//2
-        
-        # 立体的なボールの描画
-        # 濃いグレーの縁取り
-        pygame.draw.circle(screen, (50, 50, 50), (center_x, center_y), radius + 1)
-        
-        # パワーボール状態の場合はオレンジ色に
-        if self.power_ball:
-            # メインのボール（オレンジ）
-            pygame.draw.circle(screen, ORANGE, (center_x, center_y), radius)
-            # ハイライト（黄色）
-            highlight_offset = radius // 3
-            pygame.draw.circle(screen, YELLOW, (center_x - highlight_offset, center_y - highlight_offset), radius // 3)
-            # 影の効果（暗いオレンジ）
-            shadow_offset = radius // 4
-            pygame.draw.circle(screen, (150, 100, 0), (center_x + shadow_offset, center_y + shadow_offset), radius // 4)
-        else:
-            # メインのボール（明るいグレー）
-            pygame.draw.circle(screen, (220, 220, 220), (center_x, center_y), radius)
-            # ハイライト（白い小さな円）
-            highlight_offset = radius // 3
-            pygame.draw.circle(screen, WHITE, (center_x - highlight_offset, center_y - highlight_offset), radius // 3)
-            # 影の効果（暗いグレーの小さな円）
-            shadow_offset = radius // 4
-            pygame.draw.circle(screen, (150, 150, 150), (center_x + shadow_offset, center_y + shadow_offset), radius // 4)
+        screen.blit(self.get_sprite(), self.get_sprite_position())
     
     def is_out_of_bounds(self):
         return self.y > SCREEN_HEIGHT
+
+
+# 通常とパワーボールの見た目を1回だけ描いて共有する（パワーボール状態 -> サーフェス）
+BALL_SPRITES = {}
+
+
+def create_ball_sprite(power_ball):
+    """ボールの見た目（縁取り・本体・ハイライト・影）を透明な画像に描く"""
+    radius = BALL_SIZE // 2
+    offset = radius + 1
+    sprite = pygame.Surface((offset * 2 + 1, offset * 2 + 1), pygame.SRCALPHA)
+    center_x = center_y = offset
+    
+    # 立体的なボールの描画
+    # 濃いグレーの縁取り
+    pygame.draw.circle(sprite, (50, 50, 50), (center_x, center_y), radius + 1)
+    
+    # パワーボール状態の場合はオレンジ色に
+    if power_ball:
+        main_color, highlight_color, shadow_color = ORANGE, YELLOW, (150, 100, 0)
+    else:
+        main_color, highlight_color, shadow_color = (220, 220, 220), WHITE, (150, 150, 150)
+    # メインのボール
+    pygame.draw.circle(sprite, main_color, (center_x, center_y), radius)
+    # ハイライト
+    highlight_offset = radius // 3
+    pygame.draw.circle(sprite, highlight_color, (center_x - highlight_offset, center_y - highlight_offset), radius // 3)
+    # 影の効果
+    shadow_offset = radius // 4
+    pygame.draw.circle(sprite, shadow_color, (center_x + shadow_offset, center_y + shadow_offset), radius // 4)
+    
+    # 画面が作成済みなら画面のピクセル形式に変換しておく
+    return convert_for_display(sprite)
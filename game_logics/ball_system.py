@@ -0,0 +1,185 @@
+from constants.constants import *
+
+try:
+    import numpy as np
+except ImportError:
+    # NumPyがない場合はボールを1個ずつ移動する
+    np = None
+
+_logged_vectorized = None  # 最後に表示したボールの移動方法
+
+
+def log_ball_path(vectorized):
+    """ボールの移動方法を表示する（プロセスごとに最初と、変わった時だけ）"""
+    global _logged_vectorized
+    if _logged_vectorized == vectorized:
+        return
+    _logged_vectorized = vectorized
+    if vectorized:
+        print("ボールの移動: 多数のボールをNumPyでまとめて計算します")
+    elif np is None:
+        print("ボールの移動: NumPyがないためボールを1個ずつ計算します（pip install numpy で高速になります）")
+    else:
+        print("ボールの移動: ボールを1個ずつ計算します（VECTORIZED_BALLS が無効）")
+
+
+class BallSystem:
+    """発射済みのボールをまとめて移動させる
+
+    ボールが多い時は位置と速度をNumPyの配列に集め、1回分の移動範囲に
+    パドルもブロックもないボール（壁にしか当たらないボール）の移動・壁での反射を
+    全ボール分まとめて計算する。パドルやブロックに当たる可能性のあるボールは
+    Game.move_ball で1個ずつ処理する。
+    計算の順序と式は Game.move_ball と同じにしてあるため、どちらで処理しても
+    結果は完全に一致する（リプレイがNumPyの有無に関係なく再現できる）。
+    """
+
+    def __init__(self, game, vectorized=VECTORIZED_BALLS, min_balls=VECTORIZED_BALL_MIN):
+        self.game = game
+        self.vectorized = vectorized and np is not None
+        log_ball_path(self.vectorized)
+        self.min_balls = min_balls
+        self._block_counts = None  # 残りブロック数の累積和（(行+1)×(列+1)）
+        self._block_counts_key = None  # 累積和を作った時のブロック群と版
+
+    def move(self, balls):
+        """発射済みのボールを1回分移動させる（リストの順に処理した場合と同じ結果になる）
+
+        ボール同士は当たらないため、他のボールに影響するのはブロックの破壊による
+        速度の上昇（全ボールの速度の正規化）だけである。
+        """
+        if not self.vectorized or len(balls) < self.min_balls:
+            for ball in balls:
+                self.game.move_ball(ball)
+            return
+
+        pending = balls
+        while pending:
+            # 壁にしか当たらないボールは他のボールの処理の影響を受けないため先にまとめて移動する
+            simple = self.find_wall_only_balls(pending).tolist()
+            simple_indices = [i for i, is_simple in enumerate(simple) if is_simple]
+            saved = {i: (pending[i].x, pending[i].y, pending[i].velocity_x, pending[i].velocity_y)
+                     for i in simple_indices}
+            if simple_indices:
+                self.move_wall_only([pending[i] for i in simple_indices])
+
+            # 残りのボールを順に1個ずつ移動する
+            speed = self.game.current_ball_speed
+            changed_at = None
+            for i, is_simple in enumerate(simple):
+                if not is_simple:
+                    self.game.move_ball(pending[i])
+                    if self.game.current_ball_speed != speed:
+                        changed_at = i
+                        break
+            if changed_at is None:
+                break
+
+            # ブロックの破壊で速度が上がった場合、後ろのボールは速度の上昇を先に受けるはずなので
+            # 移動前の状態に戻して速度を合わせ、移動範囲を判定し直す
+            for i in simple_indices:
+                if i > changed_at:
+                    ball = pending[i]
+                    ball.x, ball.y, ball.velocity_x, ball.velocity_y = saved[i]
+                    ball.normalize_velocity()
+            pending = pending[changed_at + 1:]
+
+    def get_block_counts(self):
+        """残りブロックの有無の累積和を取得（ブロックの有無が変わった時だけ作り直す）"""
+        field = self.game.block_field
+        key = (id(field), field.version)
+        if self._block_counts_key != key:
+            alive = (np.frombuffer(field.max_durability, dtype=np.int16) > 0) & \
+                    (np.frombuffer(field.destroyed, dtype=np.uint8) == 0)
+            counts = np.zeros((field.rows + 1, field.cols + 1), dtype=np.int32)
+            counts[1:, 1:] = alive.reshape(field.rows, field.cols).cumsum(axis=0).cumsum(axis=1)
+            self._block_counts = counts
+            self._block_counts_key = key
+        return self._block_counts
+
+    def find_wall_only_balls(self, balls):
+        """1回分の移動でパドルにもブロックにも届かないボールを判定する
+
+        反射しても各軸の移動量は速度の成分の大きさを超えないため、
+        ボールの周囲を速度の分だけ広げた範囲にパドルもブロックもなければ、
+        途中で何回反射しても壁にしか当たらない。
+        """
+        field = self.game.block_field
+        size = BALL_SIZE
+        x = np.array([ball.x for ball in balls])
+        y = np.array([ball.y for ball in balls])
+        reach_x = np.abs([ball.velocity_x for ball in balls]) + 1
+        reach_y = np.abs([ball.velocity_y for ball in balls]) + 1
+        left = x - reach_x
+        right = x + size + reach_x
+        top = y - reach_y
+        bottom = y + size + reach_y
+
+        paddle = self.game.paddle.get_rect()
+        near_paddle = ((left <= paddle.right) & (right >= paddle.left) &
+                       (top <= paddle.bottom) & (bottom >= paddle.top))
+
+        # 範囲が重なるマスの残りブロック数を累積和から求める
+        counts = self.get_block_counts()
+        first_col = np.clip(np.floor(left / BLOCK_SIZE), 0, field.cols).astype(np.intp)
+        last_col = np.clip(np.floor(right / BLOCK_SIZE) + 1, 0, field.cols).astype(np.intp)
+        first_row = np.clip(np.floor((top - GAME_AREA_Y) / BLOCK_SIZE), 0, field.rows).astype(np.intp)
+        last_row = np.clip(np.floor((bottom - GAME_AREA_Y) / BLOCK_SIZE) + 1, 0, field.rows).astype(np.intp)
+        blocks = (counts[last_row, last_col] - counts[first_row, last_col]
+                  - counts[last_row, first_col] + counts[first_row, first_col])
+        return ~near_paddle & (blocks == 0)
+
+    def move_wall_only(self, balls):
+        """壁にしか当たらないボールをまとめて移動させる（Game.move_ball と同じ計算）"""
+        size = BALL_SIZE
+        x = np.array([ball.x for ball in balls])
+        y = np.array([ball.y for ball in balls])
+        velocity_x = np.array([ball.velocity_x for ball in balls])
+        velocity_y = np.array([ball.velocity_y for ball in balls])
+        remaining = np.ones(len(balls))
+        active = np.ones(len(balls), dtype=bool)  # まだ移動が残っているボール
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for _ in range(BALL_MAX_BOUNCES):
+                dx = velocity_x * remaining
+                dy = velocity_y * remaining
+
+                # 左右の壁（find_wall_hit と同じ判定）
+                time_x = np.where(dx < 0, np.maximum(0.0, (0 - x) / dx),
+                                  np.where(dx > 0, np.maximum(0.0, (SCREEN_WIDTH - size - x) / dx), np.inf))
+                hit_x = time_x <= 1
+                normal_x = np.where(dx < 0, 1, -1)
+                # 上の壁（同時に当たった場合は両方向に反射）
+                time_y = np.where(dy < 0, np.maximum(0.0, (GAME_AREA_Y - y) / dy), np.inf)
+                hit_y = time_y <= 1
+                use_y = hit_y & (~hit_x | (time_y < time_x))
+                corner = hit_y & hit_x & (time_y == time_x)
+
+                hit = (hit_x | hit_y) & active
+                travel = np.where(hit, np.where(use_y, time_y, time_x), 1.0)
+                x = np.where(active, x + dx * travel, x)
+                y = np.where(active, y + dy * travel, y)
+                remaining = np.where(hit, remaining * (1.0 - travel), remaining)
+                active = hit
+                if not active.any():
+                    break
+
+                # 反射と速度の正規化は反射したボールだけ Ball のメソッドで行う
+                for i in np.flatnonzero(hit).tolist():
+                    ball = balls[i]
+                    ball.velocity_x = float(velocity_x[i])
+                    ball.velocity_y = float(velocity_y[i])
+                    if use_y[i]:
+                        ball.reflect(0, 1)
+                    else:
+                        ball.reflect(int(normal_x[i]), 1 if corner[i] else 0)
+                    ball.normalize_velocity()
+                    velocity_x[i] = ball.velocity_x
+                    velocity_y[i] = ball.velocity_y
+
+        for ball, new_x, new_y, new_velocity_x, new_velocity_y in zip(
+                balls, x.tolist(), y.tolist(), velocity_x.tolist(), velocity_y.tolist()):
+            ball.x = new_x
+            ball.y = new_y
+            ball.velocity_x = new_velocity_x
+            ball.velocity_y = new_velocity_y
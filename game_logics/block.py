@@ -1,71 +1,209 @@
 import pygame
+from array import array
 from constants.constants import *
+from text_cache import text_cache
 
-class Block:
-    def __init__(self, x, y, durability, foreground_surface, background_surface):
-        self.x = x
-        self.y = y
-        self.durability = durability  # ブロックの耐久性（破壊に必要なヒット数）
-        self.max_durability = durability  # 初期耐久性を保存
-        self.destroyed = False
+class BlockField:
+    """ステージ上のブロックを（行, 列）で管理する配列ベースのブロック群
+
+    耐久性・初期耐久性・破壊フラグを行優先のフラットな配列で保持し、
+    残りブロック数はカウンタで管理する。ブロックの位置はマス目から求める。
+    """
+
+    def __init__(self, rows, cols, foreground_surface, background_surface):
+        self.rows = rows
+        self.cols = cols
+        size = rows * cols
+        self.durability = array('h', [0]) * size  # ブロックの耐久性
+        self.max_durability = array('h', [0]) * size  # 初期耐久性（0はブロックなし）
+        self.destroyed = bytearray(size)  # 破壊フラグ
+        self.remaining = 0  # 残りブロック数
+        self.version = 0  # ブロックの有無が変わるたびに増える（残りブロックの配置を使うキャッシュの確認用）
+        self.changed_indices = []  # 前回取得以降にヒットされたブロックの番号（描画レイヤーの更新用）
+        self._column_bottoms = None  # 列ごとの一番下の残りブロックの下端
+        self._column_bottoms_version = None
         self.foreground_surface = foreground_surface
         self.background_surface = background_surface
-        
-        # フォントの設定（耐久性表示用）
-        try:
-            self.font = pygame.font.Font("PixelMplus12-Regular.ttf", 18)
-        except (pygame.error, FileNotFoundError):
-            self.font = pygame.font.Font(None, 18)
-    
-    def get_rect(self):
-        return pygame.Rect(self.x, self.y, BLOCK_SIZE, BLOCK_SIZE)
-    
-    def hit(self):
+
+    @classmethod
+    def from_layout(cls, block_layout, foreground_surface, background_surface, strength_adjustment=0):
+        """ブロック配置からブロック群を作成"""
+        rows = len(block_layout)
+        cols = max((len(row) for row in block_layout), default=0)
+        field = cls(rows, cols, foreground_surface, background_surface)
+        for row in range(rows):
+            for col in range(len(block_layout[row])):
+                durability = block_layout[row][col]
+                # 0（透明）の場合はブロックを配置しない
+                if durability != 0:
+                    # 難易度設定に基づいてブロック強度を調整（最小値は1に制限）
+                    field.place(row, col, max(1, durability + strength_adjustment))
+        return field
+
+    @staticmethod
+    def get_font():
+        """耐久性表示用のフォントを取得"""
+        return text_cache.get_font(18)
+
+    @staticmethod
+    def get_durability_color(durability):
+        """耐久性に応じた文字色を取得"""
+        if durability >= 5:
+            return RED
+        elif durability >= 3:
+            return ORANGE
+        return YELLOW
+
+    def preload_durability_texts(self):
+        """耐久性表示（2～9）の縁取り文字を事前に描画しておく"""
+        font = self.get_font()
+        for durability in range(2, 10):
+            text_cache.render_outlined(font, str(durability), self.get_durability_color(durability), BLACK)
+
+    def place(self, row, col, durability):
+        """指定したマスにブロックを配置"""
+        index = row * self.cols + col
+        if self.is_alive(index):
+            self.remaining -= 1
+        self.durability[index] = durability
+        self.max_durability[index] = durability
+        self.destroyed[index] = 0
+        self.remaining += 1
+        self.version += 1
+
+    def is_alive(self, index):
+        """ブロックが存在し、破壊されていないか判定"""
+        return self.max_durability[index] > 0 and not self.destroyed[index]
+
+    def is_alive_at(self, row, col):
+        """（行, 列）のブロックが残っているか判定"""
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return self.is_alive(row * self.cols + col)
+        return False
+
+    def position(self, index):
+        """ブロックの左上座標を取得"""
+        row, col = divmod(index, self.cols)
+        return col * BLOCK_SIZE, row * BLOCK_SIZE + GAME_AREA_Y
+
+    def center(self, index):
+        """ブロックの中心座標を取得"""
+        x, y = self.position(index)
+        return x + BLOCK_SIZE // 2, y + BLOCK_SIZE // 2
+
+    def get_rect(self, index):
+        x, y = self.position(index)
+        return pygame.Rect(x, y, BLOCK_SIZE, BLOCK_SIZE)
+
+    def query(self, rect):
+        """矩形が重なるマス（1～4マス）にある残りブロックの番号を行優先の順で取得"""
+        # 矩形の右端・下端は含まないため1ピクセル手前のマスまでを対象にする
+        first_col = max(0, rect.left // BLOCK_SIZE)
+        last_col = min(self.cols - 1, (rect.right - 1) // BLOCK_SIZE)
+        first_row = max(0, (rect.top - GAME_AREA_Y) // BLOCK_SIZE)
+        last_row = min(self.rows - 1, (rect.bottom - 1 - GAME_AREA_Y) // BLOCK_SIZE)
+
+        indices = []
+        for row in range(first_row, last_row + 1):
+            for index in range(row * self.cols + first_col, row * self.cols + last_col + 1):
+                if self.max_durability[index] > 0 and not self.destroyed[index]:
+                    indices.append(index)
+        return indices
+
+    def column_bottoms(self):
+        """列ごとに一番下の残りブロックの下端のY座標を取得（ブロックがない列は0）
+
+        ブロックの有無が変わった時だけ計算し直す（hit での破壊はその列だけ更新する）。
+        """
+        if self._column_bottoms_version != self.version:
+            self._column_bottoms = [self.column_bottom(col) for col in range(self.cols)]
+            self._column_bottoms_version = self.version
+        return self._column_bottoms
+
+    def column_bottom(self, col):
+        """列の一番下の残りブロックの下端のY座標（ブロックがなければ0）"""
+        for row in range(self.rows - 1, -1, -1):
+            index = row * self.cols + col
+            if self.max_durability[index] > 0 and not self.destroyed[index]:
+                return (row + 1) * BLOCK_SIZE + GAME_AREA_Y
+        return 0
+
+    def hit(self, index, damage=1):
         """ブロックがヒットされた時の処理"""
-        if not self.destroyed:
-            self.durability -= 1
-            if self.durability <= 0:
-                self.destroyed = True
+        if self.is_alive(index):
+            self.changed_indices.append(index)
+            self.durability[index] -= damage
+            if self.durability[index] <= 0:
+                self.destroyed[index] = 1
+                self.remaining -= 1
+                if self._column_bottoms_version == self.version:
+                    # 計算済みの列ごとの下端は破壊したブロックの列だけ更新する
+                    col = index % self.cols
+                    self._column_bottoms[col] = self.column_bottom(col)
+                    self._column_bottoms_version += 1
+                self.version += 1
                 return True  # ブロックが破壊された
         return False  # ブロックはまだ残っている
-    
-    def draw(self, screen):
-        if not self.destroyed:
-            rect = self.get_rect()
-            
-            # ブロックがある場合：前景画像の該当部分を表示
-            fg_section = self.foreground_surface.subsurface(rect)
-            screen.blit(fg_section, (self.x, self.y))
-            
-            # ブロックの境界を薄く縁取り
-            pygame.draw.rect(screen, (80, 80, 80), rect, 1)
-            
-            # 耐久性が2以上の場合は数字を表示
-            if self.durability >= 2:
-                # 耐久性に応じて色を変える
-                if self.durability >= 5:
-                    text_color = RED
-                elif self.durability >= 3:
-                    text_color = ORANGE
-                else:
-                    text_color = YELLOW
-                
-                text = self.font.render(str(self.durability), True, text_color)
-                text_rect = text.get_rect(center=(self.x + BLOCK_SIZE//2, self.y + BLOCK_SIZE//2))
-                
-                # 文字の背景に黒い縁取りを追加（視認性向上）
-                outline_color = BLACK
-                for dx, dy in [(-1,-1), (-1,1), (1,-1), (1,1), (-1,0), (1,0), (0,-1), (0,1)]:
-                    outline_text = self.font.render(str(self.durability), True, outline_color)
-                    screen.blit(outline_text, (text_rect.x + dx, text_rect.y + dy))
-                
-                screen.blit(text, text_rect)
-    
-    def draw_paused(self, screen):
-        """ポーズ中の描画（耐久度表示なし、枠線なし）"""
-        if not self.destroyed:
-            rect = self.get_rect()
-            
-            # ブロックがある場合：前景画像の該当部分のみを表示
-            fg_section = self.foreground_surface.subsurface(rect)
-            screen.blit(fg_section, (self.x, self.y))
+
+    def destroy_all(self):
+        """残りのブロックをすべて破壊する"""
+        for index in range(len(self.destroyed)):
+            if self.max_durability[index] > 0:
+                if not self.destroyed[index]:
+                    self.changed_indices.append(index)
+                self.destroyed[index] = 1
+        self.remaining = 0
+        self.version += 1
+
+    def remaining_count(self):
+        """残りブロック数を取得"""
+        return self.remaining
+
+    def all_destroyed(self):
+        """すべてのブロックが破壊されたか判定"""
+        return self.remaining == 0
+
+    def pop_changed_indices(self):
+        """前回取得以降に見た目が変わったブロックの番号を取得してリセット"""
+        changed = self.changed_indices
+        self.changed_indices = []
+        return changed
+
+    def get_state(self):
+        """耐久性と破壊フラグを取得（リプレイのキーフレーム用）"""
+        return list(self.durability), list(self.destroyed)
+
+    def set_state(self, durability, destroyed):
+        """get_state で取得した耐久性と破壊フラグに戻す（配置は同じステージであること）"""
+        self.durability = array('h', durability)
+        self.destroyed = bytearray(destroyed)
+        self.remaining = len(self.live_indices())
+        self.changed_indices = []
+        self.version += 1
+
+    def live_indices(self):
+        """残りブロックの番号を行優先の順で取得"""
+        return [index for index in range(len(self.destroyed))
+                if self.max_durability[index] > 0 and not self.destroyed[index]]
+
+    def draw_tile(self, screen, index):
+        """ブロックの前景画像部分を描画"""
+        rect = self.get_rect(index)
+
+        # ブロックがある場合：前景画像の該当部分を表示
+        fg_section = self.foreground_surface.subsurface(rect)
+        screen.blit(fg_section, rect.topleft)
+
+    def draw_decoration(self, screen, index):
+        """ブロックの縁取りと耐久性表示を描画"""
+        rect = self.get_rect(index)
+
+        # ブロックの境界を薄く縁取り
+        pygame.draw.rect(screen, (80, 80, 80), rect, 1)
+
+        # 耐久性が2以上の場合は数字を表示
+        durability = self.durability[index]
+        if durability >= 2:
+            # 耐久性に応じた色で、黒い縁取りを付けて描画（視認性向上）
+            text_color = self.get_durability_color(durability)
+            text_cache.draw_outlined(screen, self.get_font(), str(durability), text_color, BLACK, rect.center)
@@ -0,0 +1,211 @@
+import math
+import pygame
+from constants.constants import *
+
+# 衝突した相手の種類
+HIT_WALL = "wall"
+HIT_PADDLE = "paddle"
+HIT_BLOCK = "block"
+
+
+class SweptHit:
+    """移動中の最初の衝突（移動量に対する衝突時刻0～1と衝突面の法線）"""
+
+    __slots__ = ("time", "normal_x", "normal_y", "kind", "block_index")
+
+    def __init__(self, time, normal_x, normal_y, kind, block_index=None):
+        self.time = time
+        self.normal_x = normal_x
+        self.normal_y = normal_y
+        self.kind = kind
+        self.block_index = block_index
+
+
+def sweep_aabb(x, y, width, height, dx, dy, left, top, right, bottom):
+    """移動する矩形と静止した矩形の衝突時刻と法線を求める（Swept AABB）
+
+    (x, y, width, height) の矩形が (dx, dy) だけ移動する間に
+    (left, top)-(right, bottom) の矩形に入り込む時刻を返す。
+    時刻は移動量に対する割合（0～1）で、衝突しない場合は None を返す。
+    開始時点ですでに重なっている場合（パドルの拡大やパワーボールの終了でブロックの
+    中に残った場合など）は、めり込みの浅い軸の面で時刻0に衝突したものとする
+    （その面から出ていく向きに動いている場合は None）。
+    戻り値は (時刻, x方向の時刻, y方向の時刻, 法線x, 法線y)。
+    """
+    # 相手を自分の大きさだけ広げ、左上の点の移動として判定する
+    left -= width
+    top -= height
+
+    if dx > 0:
+        entry_x = (left - x) / dx
+        exit_x = (right - x) / dx
+    elif dx < 0:
+        entry_x = (right - x) / dx
+        exit_x = (left - x) / dx
+    elif left < x < right:
+        entry_x, exit_x = -math.inf, math.inf
+    else:
+        return None
+
+    if dy > 0:
+        entry_y = (top - y) / dy
+        exit_y = (bottom - y) / dy
+    elif dy < 0:
+        entry_y = (bottom - y) / dy
+        exit_y = (top - y) / dy
+    elif top < y < bottom:
+        entry_y, exit_y = -math.inf, math.inf
+    else:
+        return None
+
+    entry = max(entry_x, entry_y)
+    exit_time = min(exit_x, exit_y)
+    # 角をかすめるだけの場合・範囲外は衝突なし
+    if entry >= exit_time or entry > 1 or exit_time <= 0:
+        return None
+
+    if entry < 0:
+        # 開始時点で重なっている：動いている軸のうちめり込みの浅い面から押し出す
+        best = None
+        if dx:
+            normal_x = -1 if x - left < right - x else 1
+            best = (min(x - left, right - x), normal_x, 0, dx)
+        if dy:
+            normal_y = -1 if y - top < bottom - y else 1
+            depth = min(y - top, bottom - y)
+            if best is None or depth < best[0]:
+                best = (depth, 0, normal_y, dy)
+        _, normal_x, normal_y, speed = best
+        if speed * (normal_x + normal_y) > 0:
+            return None
+        return 0.0, entry_x, entry_y, normal_x, normal_y
+
+    # 後から重なった軸の面で衝突している
+    if entry_x > entry_y:
+        return entry, entry_x, entry_y, (-1 if dx > 0 else 1), 0
+    return entry, entry_x, entry_y, 0, (-1 if dy > 0 else 1)
+
+
+def swept_bounds(x, y, width, height, dx, dy):
+    """移動範囲全体を覆う矩形を取得（ブロックの絞り込み用）"""
+    left = math.floor(min(x, x + dx))
+    top = math.floor(min(y, y + dy))
+    right = math.ceil(max(x, x + dx) + width)
+    bottom = math.ceil(max(y, y + dy) + height)
+    return pygame.Rect(left, top, right - left, bottom - top)
+
+
+def find_wall_hit(x, y, size, dx, dy):
+    """左右と上の壁との最初の衝突を求める（下は開いている）"""
+    hit = None
+    if dx < 0:
+        t = max(0.0, (0 - x) / dx)
+        if t <= 1:
+            hit = SweptHit(t, 1, 0, HIT_WALL)
+    elif dx > 0:
+        t = max(0.0, (SCREEN_WIDTH - size - x) / dx)
+        if t <= 1:
+            hit = SweptHit(t, -1, 0, HIT_WALL)
+
+    if dy < 0:
+        t = max(0.0, (GAME_AREA_Y - y) / dy)
+        if t <= 1:
+            if hit is None or t < hit.time:
+                hit = SweptHit(t, 0, 1, HIT_WALL)
+            elif t == hit.time:
+                # 角に同時に当たった場合は両方向に反射
+                hit.normal_y = 1
+    return hit
+
+
+def find_paddle_hit(x, y, size, dx, dy, paddle_rect):
+    """パドルとの衝突を求める"""
+    # パドルが横から動いてきて重なった場合は下向きに動いていればその場で跳ね返す
+    # （上向きなら跳ね返した後なのでそのまま抜けさせる）
+    if (x < paddle_rect.right and x + size > paddle_rect.left
+            and y < paddle_rect.bottom and y + size > paddle_rect.top):
+        return SweptHit(0.0, 0, -1, HIT_PADDLE) if dy > 0 else None
+
+    result = sweep_aabb(x, y, size, size, dx, dy,
+                        paddle_rect.left, paddle_rect.top, paddle_rect.right, paddle_rect.bottom)
+    if result is None:
+        return None
+    t, _, _, normal_x, normal_y = result
+    return SweptHit(t, normal_x, normal_y, HIT_PADDLE)
+
+
+def find_block_hit(x, y, size, dx, dy, block_field):
+    """最初に当たるブロックを求める
+
+    隣のブロックと接している面（ブロック同士の継ぎ目）には当たらないため、
+    その場合はもう一方の軸の面で当たったものとする。
+    """
+    best = None
+    for index in block_field.query(swept_bounds(x, y, size, size, dx, dy)):
+        bx, by = block_field.position(index)
+        result = sweep_aabb(x, y, size, size, dx, dy, bx, by, bx + BLOCK_SIZE, by + BLOCK_SIZE)
+        if result is None:
+            continue
+        t, entry_x, entry_y, normal_x, normal_y = result
+        if best is not None and t >= best.time:
+            continue
+
+        row, col = divmod(index, block_field.cols)
+        if normal_x and block_field.is_alive_at(row, col + normal_x) and dy and entry_y >= 0:
+            normal_x, normal_y = 0, (-1 if dy > 0 else 1)
+        elif normal_y and block_field.is_alive_at(row + normal_y, col) and dx and entry_x >= 0:
+            normal_x, normal_y = (-1 if dx > 0 else 1), 0
+        best = SweptHit(t, normal_x, normal_y, HIT_BLOCK, index)
+    return best
+
+
+def find_blocks_on_path(x, y, size, dx, dy, block_field):
+    """移動中に重なるブロックを、重なり始める順に取得（貫通するボール用）"""
+    hits = []
+    for index in block_field.query(swept_bounds(x, y, size, size, dx, dy)):
+        bx, by = block_field.position(index)
+        if x < bx + BLOCK_SIZE and x + size > bx and y < by + BLOCK_SIZE and y + size > by:
+            # 開始時点で重なっている
+            hits.append((0.0, index))
+            continue
+        result = sweep_aabb(x, y, size, size, dx, dy, bx, by, bx + BLOCK_SIZE, by + BLOCK_SIZE)
+        if result is not None:
+            hits.append((result[0], index))
+    hits.sort()
+    return [index for _, index in hits]
+
+
+def find_bullet_hit(left, top, size, block_field):
+    """上に進む弾（左上 (left, top)、一辺 size）が重なったブロックを求める（重ならなければ None）
+
+    弾は真上にしか進まないため、自分の列の一番下のブロックより下にいる間は
+    ブロックと重なることはない。その場合は矩形を作らずに判定を終える。
+    """
+    bottoms = block_field.column_bottoms()
+    first_col = max(0, left // BLOCK_SIZE)
+    last_col = min(block_field.cols - 1, (left + size - 1) // BLOCK_SIZE)
+    if first_col > last_col or top >= max(bottoms[first_col:last_col + 1]):
+        return None
+    indices = block_field.query(pygame.Rect(left, top, size, size))
+    return indices[0] if indices else None
+
+
+def find_wall_or_paddle_hit(x, y, size, dx, dy, paddle_rect):
+    """壁とパドルのうち最初に当たるものを求める（当たらなければ None）"""
+    best = find_wall_hit(x, y, size, dx, dy)
+
+    hit = find_paddle_hit(x, y, size, dx, dy, paddle_rect)
+    if hit is not None and (best is None or hit.time < best.time):
+        best = hit
+    return best
+
+
+def find_ball_hit(x, y, size, dx, dy, paddle_rect, block_field, pass_through_blocks=False):
+    """壁・パドル・ブロックのうち最初に当たるものを求める（当たらなければ None）"""
+    best = find_wall_or_paddle_hit(x, y, size, dx, dy, paddle_rect)
+
+    if not pass_through_blocks:
+        hit = find_block_hit(x, y, size, dx, dy, block_field)
+        if hit is not None and (best is None or hit.time < best.time):
+            best = hit
+    return best
@@ -0,0 +1,75 @@
+import pygame
+from constants.constants import *
+
+class DirtyRectRenderer:
+    """変化した領域だけを書き戻して画面更新する描画モード
+
+    背景と残りブロックを合成したプレイフィールドのレイヤーから、毎フレーム
+    前回スプライトを描いた領域とヒットされたブロックの領域だけを復元して
+    pygame.display.update(rects) で転送する。
+    """
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.screen_rect = screen.get_rect()
+        # セーフエリア（境界線やはみ出した文字を含めて最上段のブロックまで）
+        self.hud_rect = pygame.Rect(0, 0, SCREEN_WIDTH, GAME_AREA_Y + BLOCK_SIZE)
+        self.playfield = None
+        self.previous_rects = []  # 前フレームでスプライトを描画した領域
+        self.needs_full_redraw = True
+
+    def invalidate(self):
+        """次のフレームで画面全体を描き直す"""
+        self.needs_full_redraw = True
+
+    def draw(self, playfield, changed_rects, draw_under, draw_over, draw_hud):
+        """1フレーム分を描画する
+
+        changed_rects: プレイフィールドで描き直されたブロックの領域
+        draw_under: ブロックより下に描くもの（パドル・ボール）を描画し、描画した領域のリストを返す関数
+        draw_over: ブロックより上に描くものを描画し、描画した領域のリストを返す関数
+        draw_hud: セーフエリアを描画する関数
+        """
+        scene = playfield.get_layer()
+        full_redraw = self.needs_full_redraw or playfield is not self.playfield
+        if full_redraw:
+            self.playfield = playfield
+            self.screen.blit(scene, (0, 0))
+            dirty_rects = [self.screen_rect]
+            self.needs_full_redraw = False
+        else:
+            # ヒットされたブロックのマスと前フレームのスプライト領域をレイヤーから復元
+            dirty_rects = list(changed_rects)
+            dirty_rects.extend(self.previous_rects)
+            for rect in dirty_rects:
+                self.screen.blit(scene, rect.topleft, rect)
+
+            # セーフエリアは毎フレーム描き直す
+            self.screen.blit(scene, self.hud_rect.topleft, self.hud_rect)
+            dirty_rects.append(self.hud_rect)
+
+        draw_hud()
+        # セーフエリアの表示と重なるブロックを上から描き直す
+        playfield.redraw_blocks_under_hud(self.screen)
+
+        # スプライトを描画し、描画した領域を次フレーム用に記録
+        current_rects = []
+        for rect in draw_under():
+            rect = rect.clip(self.screen_rect)
+            if rect.width > 0 and rect.height > 0:
+                current_rects.append(rect)
+
+        # 下に描いたスプライトと重なるブロックを上から描き直す（全画面描画と同じ重なり順にする）
+        playfield.redraw_blocks_over(self.screen, current_rects)
+
+        for rect in draw_over():
+            rect = rect.clip(self.screen_rect)
+            if rect.width > 0 and rect.height > 0:
+                current_rects.append(rect)
+        self.previous_rects = current_rects
+
+        if full_redraw:
+            pygame.display.flip()
+        else:
+            dirty_rects.extend(current_rects)
+            pygame.display.update(dirty_rects)
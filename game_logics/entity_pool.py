@@ -0,0 +1,56 @@
+from constants.constants import *
+
+
+class EntityPool:
+    """使い終わったボールを取っておき、次の生成で使い回す
+
+    アイテムと弾丸は EntityWorld の配列で管理するため、ここで扱うのは Ball だけである。
+    factory はオブジェクトのクラスで、取り出したオブジェクトは
+    reset() にコンストラクタと同じ引数を渡して作成時と同じ状態にする。
+    取っておく数は capacity までで、それを超えた分は捨てる。
+    """
+
+    def __init__(self, factory, capacity=ENTITY_POOL_SIZE):
+        self.factory = factory
+        self.capacity = capacity
+        self.free = []  # 使い回せるオブジェクト
+
+    def acquire(self, *args):
+        """オブジェクトを取得する（空きがなければ新しく作る）"""
+        if self.free:
+            entity = self.free.pop()
+            entity.reset(*args)
+            return entity
+        return self.factory(*args)
+
+    def release(self, entity):
+        """使い終わったオブジェクトを戻す"""
+        if len(self.free) < self.capacity:
+            self.free.append(entity)
+
+    def release_all(self, entities):
+        """リスト内のオブジェクトをすべて戻してリストを空にする"""
+        for entity in entities:
+            self.release(entity)
+        entities.clear()
+
+
+def swap_remove(entities, index):
+    """リストの index 番目を末尾の要素で置き換えて削除する（順序は保たない）"""
+    last = entities.pop()
+    if index < len(entities):
+        entities[index] = last
+
+
+def remove_where(entities, should_remove, pool=None):
+    """条件に合うオブジェクトをリストをコピーせずに削除し、pool に戻す"""
+    index = 0
+    while index < len(entities):
+        entity = entities[index]
+        if should_remove(entity):
+            # 末尾の要素が入ってくるため、同じ位置をもう一度調べる
+            swap_remove(entities, index)
+            if pool is not None:
+                pool.release(entity)
+        else:
+            index += 1
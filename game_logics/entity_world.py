@@ -0,0 +1,255 @@
+import math
+import pygame
+from constants.constants import *
+from asset_manager import asset_manager, convert_for_display
+from text_cache import text_cache
+from game_logics.collision import find_bullet_hit
+from game_logics.entity_pool import swap_remove
+
+# エンティティの種類
+ENTITY_ITEM = 0
+ENTITY_BULLET = 1
+ENTITY_KINDS = (ENTITY_ITEM, ENTITY_BULLET)
+
+# アイテムタイプごとの色と効果
+ITEM_DATA = {
+    "wide_paddle": {"color": GREEN, "symbol": "W", "image": "game_resources/item_wide.png"},
+    "multi_ball": {"color": RED, "symbol": "M", "image": "game_resources/item_multi.png"},
+    "slow_ball": {"color": GREEN, "symbol": "S", "image": "game_resources/item_slow.png"},
+    "extra_life": {"color": BLUE, "symbol": "B", "image": "game_resources/item_extra.png"},
+    "bonus_score": {"color": PURPLE, "symbol": "P", "image": "game_resources/item_point.png"},
+    "power_ball": {"color": ORANGE, "symbol": "F", "image": "game_resources/item_power.png"},
+    "paddle_shot": {"color": CYAN, "symbol": "A", "image": "game_resources/item_shot.png"},
+    "laser": {"color": YELLOW, "symbol": "L", "image": "game_resources/item_laser.png"}
+}
+
+BULLET_SPRITE = "bullet"  # 弾丸の画像の名前（アイテムはアイテムタイプが画像の名前）
+BULLET_IMAGE = "game_resources/bullet.png"
+
+
+class EntityWorld:
+    """落下するアイテムと上に進む弾丸を成分ごとの配列で管理する
+
+    エンティティは配列の番号で、位置・更新前の位置・速度・大きさ・画像・寿命
+    （画面内にいられるYの範囲）の成分を同じ番号の要素に持つ。
+    生きているエンティティの番号は種類ごとのリスト live に持ち、各システム
+    （移動・寿命・衝突・描画）はそのリストを回って配列を直接読み書きする。
+    消えたエンティティの番号は free に積んで次の生成で使い回す。
+    アイテムは取り除く時に末尾と入れ替え、弾丸はブロックに当たる順序を
+    変えないように発射順のまま詰める。
+    """
+
+    def __init__(self, capacity=ENTITY_CAPACITY):
+        # 成分はリストで持つ（要素の読み書きのたびに数値オブジェクトを作らないように）
+        self.capacity = 0
+        self.x = []
+        self.y = []
+        self.previous_x = []  # 更新前の位置（描画の補間用）
+        self.previous_y = []
+        self.velocity_x = []
+        self.velocity_y = []
+        self.size = []
+        self.min_y = []  # Yがこの範囲から出たら消える
+        self.max_y = []
+        self.alive = bytearray()
+        self.sprite = []  # 画像の名前（アイテムタイプまたは BULLET_SPRITE）
+        self.free = []
+        self.live = tuple([] for _ in ENTITY_KINDS)  # 種類ごとの生きているエンティティ（生成順）
+        self.limits = {ENTITY_BULLET: MAX_BULLETS}  # 種類ごとの同時に存在できる最大数
+        self.sprites = {}  # 画像の名前 -> サーフェス（最初の描画時に作る）
+        self.grow(capacity)
+
+    def grow(self, count):
+        """配列を count 個分広げる"""
+        start = self.capacity
+        self.capacity += count
+        for component in (self.x, self.y, self.previous_x, self.previous_y,
+                          self.velocity_x, self.velocity_y, self.size, self.min_y, self.max_y):
+            component.extend([0] * count)
+        self.alive.extend(bytearray(count))
+        self.sprite.extend([None] * count)
+        self.free.extend(range(self.capacity - 1, start - 1, -1))
+
+    def spawn(self, kind, x, y, velocity_y, size, sprite, min_y=-math.inf, max_y=math.inf):
+        """エンティティを作成して番号を返す（最大数に達している場合はNone）"""
+        live = self.live[kind]
+        if len(live) >= self.limits.get(kind, self.capacity + 1):
+            return None
+        if not self.free:
+            self.grow(self.capacity)
+        entity = self.free.pop()
+        # 作成した更新では補間せずに現在位置に描画する
+        self.x[entity] = self.previous_x[entity] = x
+        self.y[entity] = self.previous_y[entity] = y
+        self.velocity_x[entity] = 0
+        self.velocity_y[entity] = velocity_y
+        self.size[entity] = size
+        self.min_y[entity] = min_y
+        self.max_y[entity] = max_y
+        self.alive[entity] = 1
+        self.sprite[entity] = sprite
+        live.append(entity)
+        return entity
+
+    def spawn_item(self, x, y, item_type):
+        """ブロックの位置から落下するアイテムを作成"""
+        return self.spawn(ENTITY_ITEM, x, y, ITEM_FALL_SPEED, ITEM_SIZE, item_type, max_y=SCREEN_HEIGHT)
+
+    def spawn_bullet(self, x, y):
+        """パドルから上に進む弾丸を作成"""
+        return self.spawn(ENTITY_BULLET, x, y, -BULLET_SPEED, BULLET_SIZE, BULLET_SPRITE, min_y=GAME_AREA_Y)
+
+    def count(self, kind):
+        return len(self.live[kind])
+
+    def clear(self, kind=None):
+        """エンティティを消す（種類を省略した場合はすべて）"""
+        for live in (self.live if kind is None else (self.live[kind],)):
+            for entity in live:
+                self.alive[entity] = 0
+                self.free.append(entity)
+            live.clear()
+
+    def remove_dead(self, kind):
+        """消えたエンティティを種類のリストから取り除き、番号を空きに戻す"""
+        live = self.live[kind]
+        alive = self.alive
+        if kind == ENTITY_BULLET:
+            count = 0
+            for entity in live:
+                if alive[entity]:
+                    live[count] = entity
+                    count += 1
+                else:
+                    self.free.append(entity)
+            del live[count:]
+        else:
+            index = 0
+            while index < len(live):
+                entity = live[index]
+                if alive[entity]:
+                    index += 1
+                else:
+                    swap_remove(live, index)
+                    self.free.append(entity)
+
+    # --- システム ---
+
+    def store_previous_positions(self):
+        """更新前の位置を記録する（全エンティティ分をまとめてコピー）"""
+        self.previous_x[:] = self.x
+        self.previous_y[:] = self.y
+
+    def move(self, kind):
+        """移動と寿命のシステム：速度の分だけ進め、画面外に出たものを消す"""
+        x, y = self.x, self.y
+        velocity_x, velocity_y = self.velocity_x, self.velocity_y
+        min_y, max_y, alive = self.min_y, self.max_y, self.alive
+        dead = False
+        for entity in self.live[kind]:
+            x[entity] += velocity_x[entity]
+            new_y = y[entity] = y[entity] + velocity_y[entity]
+            if new_y < min_y[entity] or new_y > max_y[entity]:
+                alive[entity] = 0
+                dead = True
+        if dead:
+            self.remove_dead(kind)
+
+    def collect_items(self, paddle_rect):
+        """パドルとの衝突のシステム：パドルに触れたアイテムを消してアイテムタイプを順に返す
+
+        矩形は中心と大きさから求める（pygame.Rect と同じく小数は切り捨て）。
+        """
+        collected = []
+        x, y, size = self.x, self.y, self.size
+        paddle_left, paddle_top = paddle_rect.left, paddle_rect.top
+        paddle_right, paddle_bottom = paddle_rect.right, paddle_rect.bottom
+        for entity in self.live[ENTITY_ITEM]:
+            width = size[entity]
+            left = int(x[entity] - width // 2)
+            top = int(y[entity] - width // 2)
+            if (left < paddle_right and paddle_left < left + width and
+                    top < paddle_bottom and paddle_top < top + width):
+                self.alive[entity] = 0
+                collected.append(self.sprite[entity])
+        if collected:
+            self.remove_dead(ENTITY_ITEM)
+        return collected
+
+    def hit_blocks(self, block_field, on_hit):
+        """ブロックとの衝突のシステム：弾丸ごとに自分の列のブロックを調べ、当たった弾丸を消す
+
+        当たったブロックの番号で on_hit を発射順に呼ぶ。
+        """
+        x, y, size = self.x, self.y, self.size
+        hit = False
+        for entity in self.live[ENTITY_BULLET]:
+            width = size[entity]
+            block_index = find_bullet_hit(int(x[entity] - width // 2), int(y[entity] - width // 2), width, block_field)
+            if block_index is not None:
+                self.alive[entity] = 0
+                hit = True
+                on_hit(block_index)
+        if hit:
+            self.remove_dead(ENTITY_BULLET)
+
+    def get_sprite(self, name):
+        """画像の名前からサーフェスを取得（画像がない場合は従来の図形を描いた画像を作る）"""
+        sprite = self.sprites.get(name)
+        if sprite is None:
+            sprite = self.sprites[name] = create_sprite(name)
+        return sprite
+
+    def draw(self, screen, alpha=1.0):
+        """描画のシステム：更新前の位置との間を alpha で補間して描画し、描いた領域のリストを返す
+
+        全エンティティの画像と位置を並べて Surface.blits でまとめて描く。
+        """
+        blit_sequence = []
+        rects = []
+        x, y = self.x, self.y
+        previous_x, previous_y = self.previous_x, self.previous_y
+        for kind in ENTITY_KINDS:
+            for entity in self.live[kind]:
+                sprite = self.get_sprite(self.sprite[entity])
+                width, height = sprite.get_size()
+                draw_x = previous_x[entity] + (x[entity] - previous_x[entity]) * alpha
+                draw_y = previous_y[entity] + (y[entity] - previous_y[entity]) * alpha
+                left = int(draw_x) - width // 2
+                top = int(draw_y) - height // 2
+                blit_sequence.append((sprite, (left, top)))
+                rects.append(pygame.Rect(left - 2, top - 2, width + 4, height + 4))
+        screen.blits(blit_sequence, False)
+        return rects
+
+    def get_state(self, kind):
+        """種類ごとのエンティティの位置と画像の名前を生成順に取得（スナップショット用）"""
+        return [[self.x[entity], self.y[entity], self.sprite[entity]] for entity in self.live[kind]]
+
+
+def create_sprite(name):
+    """エンティティの画像を作成（画像ファイルがない場合は図形で描く）"""
+    if name == BULLET_SPRITE:
+        size = BULLET_SIZE
+        image = asset_manager.get_image(BULLET_IMAGE, (size, size))
+        if image is not None:
+            return image
+        sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+        center = (size // 2, size // 2)
+        pygame.draw.circle(sprite, CYAN, center, size // 2)
+        pygame.draw.circle(sprite, DARKGRAY, center, size // 2, 1)
+        return convert_for_display(sprite)
+
+    data = ITEM_DATA[name]
+    size = ITEM_SIZE
+    image = asset_manager.get_image(data["image"], (size, size))
+    if image is not None:
+        return image
+    # アイテムの背景（円）とシンボル
+    sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+    center = (size // 2, size // 2)
+    pygame.draw.circle(sprite, data["color"], center, size // 2)
+    pygame.draw.circle(sprite, WHITE, center, size // 2, 2)
+    text = text_cache.render(text_cache.get_font(20), data["symbol"], WHITE)
+    sprite.blit(text, text.get_rect(center=center))
+    return convert_for_display(sprite)
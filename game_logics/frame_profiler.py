@@ -0,0 +1,218 @@
+import json
+import os
+import platform
+import time
+from array import array
+import pygame
+from constants.constants import *
+from text_cache import text_cache
+
+# オーバーレイに表示する処理の順序と表示名
+PHASES = [
+    ("events", "events"),
+    ("update", "update"),
+    ("update.balls", "u.balls"),
+    ("update.blocks", "u.blocks"),
+    ("update.bullets", "u.bullets"),
+    ("update.bullet_hits", "u.b.hits"),
+    ("update.items", "u.items"),
+    ("draw", "draw"),
+    ("draw.background", "d.bg"),
+    ("draw.blocks", "d.blocks"),
+    ("draw.hud", "d.hud"),
+    ("draw.flip", "d.flip"),
+    ("frame", "frame"),
+]
+
+OVERLAY_REFRESH_FRAMES = 30  # オーバーレイの数値を更新する間隔（フレーム数）
+
+
+class ProfileSection:
+    """with 文で囲んだ処理の時間を測る（同じ処理の中で入れ子にした分は数えない）"""
+
+    __slots__ = ("profiler", "name", "parent", "start", "depth")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.parent = name.rpartition(".")[0]  # update.balls なら update
+        self.start = 0.0
+        self.depth = 0
+
+    def __enter__(self):
+        if self.depth == 0:
+            self.start = time.perf_counter()
+            self.profiler.active.append(self)
+        self.depth += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        self.depth -= 1
+        if self.depth == 0:
+            elapsed = time.perf_counter() - self.start
+            profiler = self.profiler
+            profiler.active.pop()
+            profiler.add(self.name, elapsed)
+            # 同じ階層の処理の中で行った場合はその処理の時間から除く
+            if self.parent and profiler.active and profiler.active[-1].parent == self.parent:
+                profiler.add(profiler.active[-1].name, -elapsed)
+        return False
+
+
+class NullSection:
+    """計測しない時の何もしない with 文"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NULL_SECTION = NullSection()
+
+
+class FrameProfiler:
+    """処理ごとの時間をフレーム単位で集計し、直近のフレームの分布を保持する
+
+    1フレームの間に同じ処理を何度行っても（1フレームに複数回の更新など）
+    合計をそのフレームの時間とする。入れ子の処理（update の中の update.balls など）
+    は親の時間にも含まれるが、同じ階層の処理の中で行った処理（update.balls の中の
+    update.blocks など）はその処理の時間から除くため、同じ階層の処理の時間は重ならない。
+    update.blocks はボールとブロックの衝突判定と、ボールや弾がブロックに当たった後の
+    処理（耐久性・スコア・アイテム出現）の時間で、update.balls と update.bullet_hits には含まれない。
+    直近 history_size フレーム分をリングバッファに記録し、50/95/99パーセンタイルを求める。
+    """
+
+    def __init__(self, enabled=True, history_size=PROFILE_HISTORY):
+        self.enabled = enabled
+        self.visible = False
+        self.history_size = history_size
+        self.history = {}  # 処理名 -> 1フレームごとの時間（秒）のリングバッファ
+        self.frame_index = 0  # 次に書き込む位置
+        self.frame_count = 0  # 記録したフレーム数
+        self.current = {}  # 処理名 -> このフレームの合計時間
+        self.sections = {}  # 処理名 -> 使い回す ProfileSection
+        self.active = []  # 計測中の ProfileSection（外側から順）
+        self.frame_start = None
+        self.overlay = None  # 描画済みのオーバーレイ
+        self.overlay_age = 0
+
+    def section(self, name):
+        """処理の時間を測る with 文を取得（計測していない時は何もしない）"""
+        if not self.enabled:
+            return NULL_SECTION
+        section = self.sections.get(name)
+        if section is None:
+            section = self.sections[name] = ProfileSection(self, name)
+        return section
+
+    def add(self, name, seconds):
+        self.current[name] = self.current.get(name, 0.0) + seconds
+
+    def begin_frame(self):
+        if self.enabled:
+            self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """このフレームの処理時間をリングバッファに書き込む"""
+        if not self.enabled or self.frame_start is None:
+            return
+        self.add("frame", time.perf_counter() - self.frame_start)
+        self.frame_start = None
+
+        index = self.frame_index
+        for name in self.current:
+            if name not in self.history:
+                # 途中から計測を始めた処理は、それまでのフレームを0とする
+                self.history[name] = array('d', [0.0]) * self.history_size
+        for name, samples in self.history.items():
+            samples[index] = self.current.get(name, 0.0)
+        self.current.clear()
+        self.frame_index = (index + 1) % self.history_size
+        self.frame_count += 1
+        self.overlay_age += 1
+
+    def toggle_overlay(self):
+        """オーバーレイの表示を切り替える（計測していなければ計測を始める）"""
+        self.visible = not self.visible
+        if self.visible:
+            self.enabled = True
+            self.overlay = None
+
+    def percentiles(self, name):
+        """直近のフレームでの処理時間の50/95/99パーセンタイル（ミリ秒）"""
+        samples = self.history.get(name)
+        count = min(self.frame_count, self.history_size)
+        if samples is None or count == 0:
+            return None
+        ordered = sorted(samples[:count])
+        return tuple(ordered[min(count - 1, int(ratio * count))] * 1000 for ratio in (0.5, 0.95, 0.99))
+
+    def summary(self):
+        """処理ごとの集計結果を辞書で取得（ミリ秒）"""
+        count = min(self.frame_count, self.history_size)
+        result = {}
+        for name, samples in self.history.items():
+            values = samples[:count]
+            p50, p95, p99 = self.percentiles(name)
+            result[name] = {
+                "p50": round(p50, 3),
+                "p95": round(p95, 3),
+                "p99": round(p99, 3),
+                "mean": round(sum(values) / count * 1000, 3),
+                "max": round(max(values) * 1000, 3),
+            }
+        return result
+
+    def draw_overlay(self, screen):
+        """セーフエリアに処理ごとの 50/95/99パーセンタイルを表示"""
+        if not self.visible:
+            return
+        if self.overlay is None or self.overlay_age >= OVERLAY_REFRESH_FRAMES:
+            self.overlay = self.render_overlay()
+            self.overlay_age = 0
+        screen.blit(self.overlay, (0, 0))
+
+    def render_overlay(self):
+        surface = pygame.Surface((SCREEN_WIDTH, SAFE_AREA_HEIGHT))
+        surface.fill((20, 20, 20))
+        font = text_cache.get_font(12)
+        column_width = SCREEN_WIDTH // 3
+        rows = (len(PHASES) + 2) // 3
+        line_height = (SAFE_AREA_HEIGHT - 4) // rows
+        for i, (name, label) in enumerate(PHASES):
+            values = self.percentiles(name)
+            if values is None:
+                text = f"{label:<10}    -"
+            else:
+                text = f"{label:<10}{values[0]:5.1f}/{values[1]:5.1f}/{values[2]:5.1f}"
+            color = YELLOW if name == "frame" else WHITE
+            # 値は更新のたびに変わるため共有キャッシュを使わずに描画する
+            text_surface = font.render(text, True, color)
+            surface.blit(text_surface, (6 + (i // rows) * column_width, 2 + (i % rows) * line_height))
+        return surface
+
+    def dump(self, directory=PROFILE_DIR, label=""):
+        """集計結果をファイルに書き出してパスを返す（記録がなければNone）"""
+        if self.frame_count == 0:
+            return None
+        data = {
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "machine": platform.node(),
+            "platform": platform.platform(),
+            "label": label,
+            "frames": min(self.frame_count, self.history_size),
+            "phases_ms": self.summary(),
+        }
+        path = os.path.join(directory, f"profile_{time.strftime('%Y%m%d_%H%M%S')}.json")
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            print(f"プロファイル結果の保存に失敗しました: {e}")
+            return None
+        return path
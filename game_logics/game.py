@@ -3,23 +3,62 @@ import sys
 import random
 import math
 import json
-import csv
 import os
+import itertools
 from constants.block_colors import BLOCK_COLORS
 from constants.constants import *
+from text_cache import text_cache
+from asset_manager import asset_manager
 from game_logics.paddle import Paddle
 from game_logics.ball import Ball
-from game_logics.bullet import Bullet
-from game_logics.item import Item
-from game_logics.block import Block
+from game_logics.ball_system import BallSystem
+from game_logics.entity_pool import EntityPool, remove_where
+from game_logics.entity_world import EntityWorld, ENTITY_ITEM, ENTITY_BULLET
+from game_logics.block import BlockField
+from game_logics.dirty_renderer import DirtyRectRenderer
+from game_logics.playfield import Playfield
+from game_logics.layout_cache import stage_layout_cache
+from game_logics.collision import find_wall_or_paddle_hit, find_block_hit, find_blocks_on_path, HIT_PADDLE, HIT_BLOCK
+from game_logics.input_source import PygameInputSource
+from game_logics.replay import ReplayRecorder
+from game_logics.game_random import GameRandom
+from game_logics.frame_profiler import FrameProfiler
 from save_manager import SaveManager
 
 class Game:
     def __init__(self, game_config):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        # ヘッドレスモード（ウィンドウ・画像・描画なしでゲームロジックだけを実行する）
+        self.headless = game_config.get('headless', False)
+        
+        # 入力元（指定がなければマウスとキーボード）
+        self.input_source = game_config.get('input_source') or PygameInputSource()
+        
+        # ゲームごとの乱数（シードが同じなら同じ入力で同じ展開になる）
+        self.seed = game_config.get('seed')
+        if self.seed is None:
+            self.seed = random.randrange(2**32)
+        self.rng = GameRandom(self.seed)
+        
+        if self.headless:
+            self.screen = None
+        else:
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            
+            # パドル・ボール・アイテム・弾の画像を事前に読み込む（2回目以降は読み込み済み）
+            asset_manager.preload()
 
         self.clock = pygame.time.Clock()
         
+        # 描画の上限フレームレート（ゲーム設定で指定がなければ定数の設定を使用）
+        self.render_fps = game_config.get('render_fps', RENDER_FPS)
+        
+        # 差分描画モード（ゲーム設定で指定がなければ定数の設定を使用）
+        self.dirty_rect_rendering = game_config.get('dirty_rect_rendering', DIRTY_RECT_RENDERING) and not self.headless
+        self.dirty_renderer = DirtyRectRenderer(self.screen) if self.dirty_rect_rendering else None
+        
+        # 処理ごとの時間の計測（ゲーム設定で指定がなければ定数の設定を使用、ヘッドレスモードでは計測しない）
+        self.profiler = FrameProfiler(game_config.get('profile', FRAME_PROFILING) and not self.headless)
+        
         # ゲーム設定（キャラクター情報と難易度設定を含む）
         self.selected_chara = game_config['chara']
         self.difficulty_key = game_config['difficulty']
@@ -30,7 +69,7 @@ class Game:
         
         # 選択されたキャラクターのステージデータを読み込み
         self.stage_data = self.save_manager.load_stage_data(self.selected_chara["folder"])
-        self.current_stage_index = 0
+        self.current_stage_index = game_config.get('stage_index', 0)  # 開始ステージ（指定がなければ最初から）
         self.current_stage_config = None
         
         # 現在のステージ設定を初期化
@@ -51,40 +90,49 @@ class Game:
         self.combo_count = 0  # 連続破壊カウント
         self.combo_display_timer = 0  # コンボ表示用タイマー（30フレーム = 0.5秒）
         
-        # 前景画像の読み込み
-        self.foreground = self.load_foreground_image()
+        # 前景・背景画像（ヘッドレスモードでは読み込まない）
+        self.foreground = None
+        self.background = None
+        if not self.headless:
+            # 前景画像の読み込み
+            self.foreground = self.load_foreground_image()
         
-        # 背景画像の読み込み
-        try:
-            background_path = f"{self.current_stage_config['folder']}/{self.current_stage_config['background']}"
-            if self.current_stage_config['background']:  # 背景画像のファイル名が指定されている場合
-                self.background = pygame.image.load(background_path)
-                self.background = pygame.transform.scale(self.background, (SCREEN_WIDTH, SCREEN_HEIGHT))
-            else:
-                # 背景画像が指定されていない場合はデフォルト背景を試す
-                raise FileNotFoundError("No background specified")
-        except (pygame.error, FileNotFoundError):
-            print(f"背景画像が見つかりません。元の背景を使用します。")
+            # 背景画像の読み込み
             try:
-                self.background = pygame.image.load("back.png")
-                self.background = pygame.transform.scale(self.background, (SCREEN_WIDTH, SCREEN_HEIGHT))
+                background_path = f"{self.current_stage_config['folder']}/{self.current_stage_config['background']}"
+                if self.current_stage_config['background']:  # 背景画像のファイル名が指定されている場合
+                    self.background = pygame.image.load(background_path)
+                    self.background = pygame.transform.scale(self.background, (SCREEN_WIDTH, SCREEN_HEIGHT))
+                else:
+                    # 背景画像が指定されていない場合はデフォルト背景を試す
+                    raise FileNotFoundError("No background specified")
             except (pygame.error, FileNotFoundError):
-                self.background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-                self.background.fill(BLACK)
+                self.log(f"背景画像が見つかりません。元の背景を使用します。")
+                try:
+                    self.background = pygame.image.load("back.png")
+                    self.background = pygame.transform.scale(self.background, (SCREEN_WIDTH, SCREEN_HEIGHT))
+                except (pygame.error, FileNotFoundError):
+                    self.background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+                    self.background.fill(BLACK)
         
         self.paddle = Paddle()
-        self.balls = [Ball(self.paddle.x, self.current_ball_speed)]  # ボールを配列で管理
-        self.blocks = []
-        self.items = []  # アイテムのリスト
+        self.ball_pool = EntityPool(Ball)  # 落ちたボールは作り直さずに使い回す
+        self.balls = [self.ball_pool.acquire(self.paddle.x, self.current_ball_speed, self.rng)]  # ボールを配列で管理
+        self.ball_system = BallSystem(self)  # 発射済みのボールの移動（多い時はまとめて計算）
+        self.block_field = None  # ステージのブロック群（create_blocksで作成）
+        self.entities = EntityWorld()  # アイテムと弾丸（成分ごとの配列で管理）
+        self.entity_alpha = 1.0  # アイテムと弾丸を描画する時の補間の割合
         self.score = 0
         self.last_item_score = 0  # 最後にアイテムを出現させたスコア
+        self.item_pickups = {}  # 取得したアイテムの種類ごとの個数（集計用）
         
         # アイテム効果の状態管理
         self.paddle_wide_timer = 0
         self.ball_slow_timer = 0
         self.power_ball_timer = 0  # パワーボール効果のタイマー
         self.paddle_shot_count = 0  # パドルショットの残り回数
-        self.bullets = []  # パドルショットの弾丸リスト
+        self.laser_timer = 0  # レーザー効果のタイマー
+        self.laser_cooldown = 0  # レーザーの次の発射までの更新回数
         self.original_paddle_width = PADDLE_WIDTH
         
         # アイテム効果の待機リスト（ボール打ち出し前に取得したアイテム）
@@ -93,22 +141,25 @@ class Game:
         # ゲーム状態管理
         self.game_state = "playing"  # "playing", "paused", "game_over", "stage_clear", "game_clear", "special_reward"
         self.stage_clear_timer = 0  # ステージクリア表示用タイマー
-        self.start_time = pygame.time.get_ticks()  # ゲーム開始時刻
-        self.end_time = None  # ゲーム終了時刻
+        self.play_ticks = 0  # ステージのプレイ時間（ゲーム中に更新した回数、ポーズ中は数えない）
         self.show_special_reward = False  # 特別報酬表示フラグ
         self.current_bonus_type = "bonus"  # 現在表示中のボーナス種類 ("bonus" or "bonus2")
-        self.pause_start_time = None  # ポーズ開始時刻
-        self.total_pause_time = 0  # 総ポーズ時間
         
-        # フォントの設定
-        try:
-            self.font = pygame.font.Font("PixelMplus12-Regular.ttf", 24)
-            self.small_font = pygame.font.Font("PixelMplus12-Regular.ttf", 18)
-        except (pygame.error, FileNotFoundError):
-            self.font = pygame.font.Font(None, 24)
-            self.small_font = pygame.font.Font(None, 18)
+        # フォントの設定（ヘッドレスモードでは描画しないため読み込まない）
+        if self.headless:
+            self.font = None
+            self.small_font = None
+        else:
+            self.font = text_cache.get_font(24)
+            self.small_font = text_cache.get_font(18)
         
         self.create_blocks()
+        
+        # リプレイの記録（ゲーム設定で指定がなければ定数の設定を使用）
+        if game_config.get('record_replay', RECORD_REPLAY):
+            self.replay_recorder = ReplayRecorder(self, game_config, game_config.get('replay_dir', REPLAY_DIR))
+        else:
+            self.replay_recorder = None
     
     def get_speed_percentage(self):
         """現在のボールスピードを0-100%で表示するためのパーセンテージを計算"""
@@ -133,53 +184,66 @@ class Game:
         
         # 制限時間を過ぎているかチェック
         if self.game_state == "playing":
-            current_time = pygame.time.get_ticks()
-            play_time_seconds = (current_time - self.start_time) / 1000
+            play_time_seconds = self.get_play_time_seconds()
             if play_time_seconds <= self.current_stage_config["target_time"]:
                 return False
         
         # 残りブロック数をチェック
-        remaining_blocks = sum(1 for block in self.blocks if not block.destroyed)
+        remaining_blocks = self.block_field.remaining_count()
         if remaining_blocks > 5:
             return False
         
         return True
     
+    def get_play_time_seconds(self):
+        """ステージのプレイ時間（秒）を取得"""
+        return self.play_ticks / LOGIC_FPS
+    
     def update_window_title(self):
         """ウィンドウタイトルを現在のキャラクター名とステージ、難易度で更新"""
+        if self.headless:
+            return
         title = f"{self.selected_chara['name']} - Stage {self.current_stage} ({self.difficulty_settings['name']})"
         pygame.display.set_caption(title)
     
+    def get_stage_csv_path(self):
+        """現在のステージのブロック配置ファイルのパスを取得"""
+        return f"{self.current_stage_config['folder']}/{self.current_stage_config['definition']}.csv"
+    
     def create_blocks(self):
-        # CSVファイルからブロック配置を読み込み
-        csv_path = f"{self.current_stage_config['folder']}/{self.current_stage_config['definition']}.csv"
-        block_layout = self.load_block_layout_from_csv(csv_path)
-        
-        # ブロック配置ファイルから配置情報を読み込んで配置
-        for row in range(len(block_layout)):
-            for col in range(len(block_layout[row])):
-                durability = block_layout[row][col]
-                # 0（透明）の場合はブロックを配置しない
-                if durability != 0:
-                    # 難易度設定に基づいてブロック強度を調整
-                    adjusted_durability = durability + self.difficulty_settings['block_strength_adjustment']
-                    # 最小値は1に制限
-                    adjusted_durability = max(1, adjusted_durability)
-                    
-                    x = col * BLOCK_SIZE
-                    y = row * BLOCK_SIZE + GAME_AREA_Y  # セーフエリア分をオフセット
-                    self.blocks.append(Block(x, y, adjusted_durability, self.foreground, self.background))
+        # CSVファイルからブロック配置を読み込み（描画でも使うため保持しておく）
+        self.block_layout = self.load_block_layout_from_csv(self.get_stage_csv_path())
+        
+        # ブロック配置ファイルから配置情報を読み込んで配置（難易度設定に基づいてブロック強度を調整）
+        self.block_field = BlockField.from_layout(
+            self.block_layout,
+            self.foreground,
+            self.background,
+            self.difficulty_settings['block_strength_adjustment']
+        )
+        
+        # 背景と残りブロックを合成した描画レイヤーを作成（ヘッドレスモードでは描画しないため作らない）
+        self.playfield = None if self.headless else Playfield(self.background, self.block_field)
+    
+    def log(self, message):
+        """メッセージを表示（ヘッドレスモードでは表示しない）"""
+        if not self.headless:
+            print(message)
     
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 return False
             elif event.type == pygame.KEYDOWN:
+                # F3キーで処理時間のオーバーレイを切り替え（ゲームの状態に関係なく使える）
+                if event.key == pygame.K_F3:
+                    self.profiler.toggle_overlay()
+                
                 # Escキーの処理
-                if event.key == pygame.K_ESCAPE:
+                elif event.key == pygame.K_ESCAPE:
                     if self.game_state == "playing":
                         # ゲーム中の場合はポーズ
-                        self.pause_game()
+                        self.perform_action("pause")
                     elif self.game_state == "paused":
                         # ポーズ中の場合はステージセレクトに戻る
                         return "back_to_select"
@@ -190,121 +254,159 @@ class Game:
                 # ポーズ中のキー処理
                 elif self.game_state == "paused":
                     # Esc以外のキーでゲーム再開
-                    self.resume_game()
+                    self.perform_action("resume")
                 
                 # ゲーム中の他のキー処理
                 elif self.game_state == "playing":
                     # Oキーで緊急ステージクリア（Easy/Normal、制限時間超過、残りブロック5個以下の場合）
                     if event.key == pygame.K_o:
-                        if self.can_emergency_clear():
-                            # 残りブロックを全て破壊
-                            for block in self.blocks:
-                                if not block.destroyed:
-                                    block.destroyed = True
-                            print("緊急ステージクリア発動！")
+                        self.perform_action("emergency_clear")
                     # テスト用チート機能（削除予定）
                     elif event.key == pygame.K_F1:  # F1キーでテスト用チート発動
-                        # 全ブロックを破壊
-                        for block in self.blocks:
-                            block.destroyed = True
-                        # スコアを100000に設定
-                        self.score = 100000
-                        print("チート発動: 全ブロック破壊 & スコア100000設定")
+                        self.perform_action("cheat_score")
                     elif event.key == pygame.K_F2:  # F2キーでテスト用チート発動
-                        # 全ブロックを破壊
-                        for block in self.blocks:
-                            block.destroyed = True
-                        print("チート発動: 全ブロック破壊")
+                        self.perform_action("cheat_clear")
                         
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:  # 左クリック
-                    if self.game_state == "paused":
-                        # ポーズ中の左クリックでゲーム再開
-                        self.resume_game()
-                    elif self.game_state == "playing":
-                        # パドルショットがある場合は弾を発射
-                        if self.paddle_shot_count > 0:
-                            self.fire_paddle_shot()
-                        else:
-                            # パドルショットがない場合はボールを解放
-                            for ball in self.balls:
-                                if ball.stuck_to_paddle:
-                                    ball.release()
-                            
-                            # ボール打ち出し時に待機中のアイテム効果を発動
-                            for item_type in self.pending_item_effects:
-                                self.activate_item_effect(item_type)
-                            self.pending_item_effects.clear()
-                    elif self.game_state == "game_over":
-                        # ゲームオーバー時：Extremeの場合は最初から、それ以外はステージをリトライ
-                        if self.difficulty_settings['name'] == "Extreme":
-                            self.reset_game()
-                        else:
-                            self.retry_stage()
-                    elif self.game_state == "stage_clear":
-                        # ステージクリア時：目標スコア以上でボーナス画像があり、難易度設定でボーナス画像が有効なら特別報酬、そうでなければ次のステージに進む
-                        if (self.score >= self.current_stage_config["target_score"] and 
-                            self.current_stage_config["bonus"] and 
-                            self.difficulty_settings['get_bonus_image']):
-                            self.show_special_reward_screen()
-                        else:
-                            self.next_stage()
-                    elif self.game_state == "game_clear":
-                        # ゲームクリア時：目標スコア以上でボーナス画像があり、難易度設定でボーナス画像が有効なら特別報酬、そうでなければキャラクター選択画面に戻る
-                        if (self.score >= self.current_stage_config["target_score"] and 
-                            self.current_stage_config["bonus"] and 
-                            self.difficulty_settings['get_bonus_image']):
-                            self.show_special_reward_screen()
-                        else:
-                            return "back_to_select"
-                    elif self.game_state == "special_reward":
-                        # 特別報酬画面：次のボーナス画像があるかチェック
-                        if self.can_show_next_bonus():
-                            # bonus2を表示
-                            self.show_next_bonus()
-                        else:
-                            # 次のボーナス画像がない場合：最終ステージならキャラクター選択画面に戻る、そうでなければ次のステージに進む
-                            if self.current_stage_index + 1 < len(self.stage_data):
-                                self.next_stage()
-                            else:
-                                return "back_to_select"
+                    result = self.perform_action("click")
+                    if result == "back_to_select":
+                        return result
         
+        return True
+    
+    def perform_action(self, action):
+        """キー・クリックによるゲーム状態の変化を実行する
+
+        リプレイで同じ順序に再現できるよう、ゲームの進行に影響する操作は
+        すべてここを通し、記録中であれば次の更新の前の操作として記録する。
+        """
+        if self.replay_recorder:
+            self.replay_recorder.record_action(action)
+        
+        if action == "pause":
+            self.pause_game()
+        elif action == "resume":
+            self.resume_game()
+        elif action == "emergency_clear":
+            if self.can_emergency_clear():
+                # 残りブロックを全て破壊
+                self.block_field.destroy_all()
+                self.log("緊急ステージクリア発動！")
+        elif action == "cheat_score":
+            # 全ブロックを破壊
+            self.block_field.destroy_all()
+            # スコアを100000に設定
+            self.score = 100000
+            self.log("チート発動: 全ブロック破壊 & スコア100000設定")
+        elif action == "cheat_clear":
+            # 全ブロックを破壊
+            self.block_field.destroy_all()
+            self.log("チート発動: 全ブロック破壊")
+        elif action == "click":
+            return self.handle_click()
+        return True
+    
+    def handle_click(self):
+        """左クリック時の処理（ゲームの状態ごと）"""
+        if self.game_state == "paused":
+            # ポーズ中の左クリックでゲーム再開
+            self.resume_game()
+        elif self.game_state == "playing":
+            # パドルショットがある場合は弾を発射、なければボールを発射
+            self.launch_or_shoot()
+        elif self.game_state == "game_over":
+            # ゲームオーバー時：Extremeの場合は最初から、それ以外はステージをリトライ
+            if self.difficulty_settings['name'] == "Extreme":
+                self.reset_game()
+            else:
+                self.retry_stage()
+        elif self.game_state == "stage_clear":
+            # ステージクリア時：目標スコア以上でボーナス画像があり、難易度設定でボーナス画像が有効なら特別報酬、そうでなければ次のステージに進む
+            if (self.score >= self.current_stage_config["target_score"] and 
+                self.current_stage_config["bonus"] and 
+                self.difficulty_settings['get_bonus_image']):
+                self.show_special_reward_screen()
+            else:
+                self.next_stage()
+        elif self.game_state == "game_clear":
+            # ゲームクリア時：目標スコア以上でボーナス画像があり、難易度設定でボーナス画像が有効なら特別報酬、そうでなければキャラクター選択画面に戻る
+            if (self.score >= self.current_stage_config["target_score"] and 
+                self.current_stage_config["bonus"] and 
+                self.difficulty_settings['get_bonus_image']):
+                self.show_special_reward_screen()
+            else:
+                return "back_to_select"
+        elif self.game_state == "special_reward":
+            # 特別報酬画面：次のボーナス画像があるかチェック
+            if self.can_show_next_bonus():
+                # bonus2を表示
+                self.show_next_bonus()
+            else:
+                # 次のボーナス画像がない場合：最終ステージならキャラクター選択画面に戻る、そうでなければ次のステージに進む
+                if self.current_stage_index + 1 < len(self.stage_data):
+                    self.next_stage()
+                else:
+                    return "back_to_select"
+        return True
+    
+    def handle_input(self):
+        """入力元の操作をゲームに反映（ゲームロジックの更新ごとに呼ぶ）"""
+        player_input = self.input_source.read(self)
+        if self.replay_recorder:
+            self.replay_recorder.record_input(player_input)
+        self.apply_input(player_input)
+    
+    def apply_input(self, player_input):
+        """パドル操作・パドルショット・ボール発射の入力を反映"""
         # ゲーム中のみパドル操作を受け付ける
         if self.game_state == "playing":
             # マウスの位置でパドルを操作
-            mouse_x, mouse_y = pygame.mouse.get_pos()
-            self.paddle.move_to_mouse(mouse_x)
+            if player_input.paddle_x is not None:
+                self.paddle.move_to_mouse(player_input.paddle_x)
             
             # キーボードでの操作も維持
-            keys = pygame.key.get_pressed()
-            if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+            if player_input.left:
                 self.paddle.move("left")
-            if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+            if player_input.right:
                 self.paddle.move("right")
             
-            # スペースキーでパドルショット発射
-            if keys[pygame.K_SPACE] and self.paddle_shot_count > 0:
+            # スペースキーでパドルショット発射（レーザー中は押している間連射）
+            if player_input.shoot and self.paddle_shot_count > 0:
                 self.fire_paddle_shot()
-        
-        return True
+            elif player_input.shoot and self.laser_timer > 0:
+                self.fire_laser()
+            
+            # 左クリック相当の操作
+            if player_input.click:
+                self.launch_or_shoot()
+    
+    def launch_or_shoot(self):
+        """ゲーム中の左クリック：パドルショットがあれば弾を発射、なければボールを発射"""
+        if self.paddle_shot_count > 0:
+            self.fire_paddle_shot()
+        else:
+            # パドルショットがない場合はボールを解放
+            for ball in self.balls:
+                if ball.stuck_to_paddle:
+                    ball.release()
+            
+            # ボール打ち出し時に待機中のアイテム効果を発動
+            for item_type in self.pending_item_effects:
+                self.activate_item_effect(item_type)
+            self.pending_item_effects.clear()
     
     def pause_game(self):
         """ゲームをポーズする"""
         if self.game_state == "playing":
             self.game_state = "paused"
-            self.pause_start_time = pygame.time.get_ticks()
-            print("ゲームをポーズしました")
+            self.log("ゲームをポーズしました")
     
     def resume_game(self):
         """ゲームを再開する"""
         if self.game_state == "paused":
             self.game_state = "playing"
-            # ポーズ時間を累積
-            if self.pause_start_time:
-                pause_duration = pygame.time.get_ticks() - self.pause_start_time
-                self.total_pause_time += pause_duration
-                self.pause_start_time = None
-            print("ゲームを再開しました")
+            self.log("ゲームを再開しました")
     
     def update(self):
         # ポーズ中は更新処理をスキップ
@@ -321,10 +423,16 @@ class Game:
         # ゲーム中のみ更新処理を実行
         if self.game_state != "playing":
             return
+        
+        self.play_ticks += 1
+        
+        # 描画の補間用に更新前の位置を記録
+        self.store_previous_positions()
             
-        # 全てのボールを更新
+        # パドルに固定されたボールを移動（発射済みのボールは衝突判定と合わせて移動）
         for ball in self.balls:
-            ball.move(self.paddle)
+            if ball.stuck_to_paddle:
+                ball.move(self.paddle)
         
         # アイテム効果のタイマー更新
         self.update_item_effects()
@@ -334,134 +442,24 @@ class Game:
             self.combo_display_timer -= 1
         
         # アイテムの更新
-        for item in self.items[:]:  # コピーを作成してループ
-            item.update()
-            if not item.active:
-                self.items.remove(item)
+        with self.profiler.section("update.items"):
+            self.entities.move(ENTITY_ITEM)
         
         # 弾丸の更新
-        for bullet in self.bullets[:]:  # コピーを作成してループ
-            bullet.update()
-            if not bullet.active:
-                self.bullets.remove(bullet)
+        with self.profiler.section("update.bullets"):
+            self.entities.move(ENTITY_BULLET)
         
-        # 各ボールの物理演算
-        balls_to_remove = []
-        for ball in self.balls:
-            if not ball.stuck_to_paddle:
-                ball.bounce_wall()
-                
-                # パドルとの衝突判定
-                if ball.bounce_paddle(self.paddle):
-                    # パドルで跳ね返した時にコンボをリセット
-                    self.combo_count = 0
-                    self.combo_display_timer = 0
-                
-                # ブロックとの衝突判定
-                ball_rect = ball.get_rect()
-                for block in self.blocks:
-                    if not block.destroyed and ball_rect.colliderect(block.get_rect()):
-                        # パワーボール状態の場合は耐久度を2削る
-                        if ball.power_ball:
-                            block.durability -= 2
-                            if block.durability <= 0:
-                                block.destroyed = True
-                                block_destroyed = True
-                            else:
-                                block_destroyed = False
-                            
-                            # パワーボールは貫通するので反射しない
-                            
-                        else:
-                            # 通常のボール：ブロックにヒット
-                            block_destroyed = block.hit()
-                            
-                            # ブロックとの衝突方向を判定して適切に反射
-                            block_rect = block.get_rect()
-                            ball_center_x = ball.x + ball.size / 2
-                            ball_center_y = ball.y + ball.size / 2
-                            block_center_x = block_rect.centerx
-                            block_center_y = block_rect.centery
-                            
-                            # 衝突面を判定
-                            dx = ball_center_x - block_center_x
-                            dy = ball_center_y - block_center_y
-                            
-                            if abs(dx) > abs(dy):
-                                # 左右の面で衝突
-                                ball.velocity_x = -ball.velocity_x
-                            else:
-                                # 上下の面で衝突
-                                ball.velocity_y = -ball.velocity_y
-                            
-                            # 速度を正規化
-                            ball.normalize_velocity()
-                        
-                        # ブロックにヒットした場合はコンボを更新
-                        self.combo_count += 1
-                        self.combo_display_timer = 30  # 0.5秒間表示（60fps × 0.5秒）
-                        
-                        # ブロックが破壊された場合のスコア計算
-                        if block_destroyed:
-                            score_gained = self.calculate_score(is_power_ball=ball.power_ball)
-                            self.score += self.apply_score_adjustment(score_gained)
-                            self.blocks_destroyed += 1
-                            
-                            # アイテム出現判定
-                            self.check_item_spawn(block.x + BLOCK_SIZE//2, block.y + BLOCK_SIZE//2)
-                            
-                            # ブロック破壊数に応じて速度を上昇
-                            self.check_speed_increase()
-                        else:
-                            # ブロックが破壊されなかった場合は(10-残り耐久度)点を素点として計算
-                            base_damage_score = 10 - block.durability
-                            score_gained = self.calculate_score(base_damage_score, is_power_ball=ball.power_ball)
-                            self.score += self.apply_score_adjustment(score_gained)
-                        
-                        # 通常のボールの場合のみ反射処理のためbreak
-                        if not ball.power_ball:
-                            break
-                
-                # ボールが画面下に落ちた場合
-                if ball.is_out_of_bounds():
-                    balls_to_remove.append(ball)
-        
-        # 弾丸とブロックの衝突判定
-        for bullet in self.bullets[:]:
-            if bullet.active:
-                bullet_rect = bullet.get_rect()
-                for block in self.blocks:
-                    if not block.destroyed and bullet_rect.colliderect(block.get_rect()):
-                        # ブロックにヒット
-                        block_destroyed = block.hit()
-                        bullet.active = False
-                        
-                        # ブロックにヒットした場合はコンボを更新
-                        self.combo_count += 1
-                        self.combo_display_timer = 30  # 0.5秒間表示（60fps × 0.5秒）
-                        
-                        # ブロックが破壊された場合のスコア計算
-                        if block_destroyed:
-                            score_gained = self.calculate_score()
-                            self.score += self.apply_score_adjustment(score_gained)
-                            self.blocks_destroyed += 1
-                            
-                            # アイテム出現判定
-                            self.check_item_spawn(block.x + BLOCK_SIZE//2, block.y + BLOCK_SIZE//2)
-                            
-                            # ブロック破壊数に応じて速度を上昇
-                            self.check_speed_increase()
-                        else:
-                            # ブロックが破壊されなかった場合は(10-残り耐久度)点を素点として計算
-                            base_damage_score = 10 - block.durability
-                            score_gained = self.calculate_score(base_damage_score)
-                            self.score += self.apply_score_adjustment(score_gained)
-                        
-                        break
+        # 各ボールの物理演算（移動中の壁・パドル・ブロックとの衝突を順に処理）
+        with self.profiler.section("update.balls"):
+            free_balls = [ball for ball in self.balls if not ball.stuck_to_paddle]
+            self.ball_system.move(free_balls)
+        
+        # 弾丸とブロックの衝突判定（弾丸の列のブロックだけを調べる）
+        with self.profiler.section("update.bullet_hits"):
+            self.entities.hit_blocks(self.block_field, self.hit_block)
         
         # 画面外に落ちたボールを削除
-        for ball in balls_to_remove:
-            self.balls.remove(ball)
+        remove_where(self.balls, Ball.is_out_of_bounds, self.ball_pool)
         
         # 全てのボールが落ちた場合
         if not self.balls:
@@ -481,10 +479,11 @@ class Game:
                 self.game_over()
         
         # アイテムとパドルの衝突判定
-        self.check_item_collision()
+        with self.profiler.section("update.items"):
+            self.check_item_collision()
         
         # すべてのブロックが破壊された場合
-        if all(block.destroyed for block in self.blocks):
+        if self.block_field.all_destroyed():
             # 最終ステージかどうかを判定
             if self.current_stage_index + 1 < len(self.stage_data):
                 # 最終ステージではない場合
@@ -493,6 +492,80 @@ class Game:
                 # 最終ステージの場合
                 self.game_clear()
     
+    def move_ball(self, ball):
+        """ボールを1回分移動させ、途中で当たった壁・パドル・ブロックで反射させる
+
+        最初に当たる相手までの時刻を求めて衝突位置まで進め、反射後に残りの
+        移動を続ける（1回の更新で複数回反射できる）。
+        """
+        remaining = 1.0  # 残りの移動量（1回分の速度に対する割合）
+        paddle_rect = self.paddle.get_rect()
+        pierced_indices = set()  # パワーボールが今回の更新で削ったブロック
+        for _ in range(BALL_MAX_BOUNCES):
+            dx = ball.velocity_x * remaining
+            dy = ball.velocity_y * remaining
+            hit = find_wall_or_paddle_hit(ball.x, ball.y, ball.size, dx, dy, paddle_rect)
+            
+            # ブロックとの衝突判定は処理時間を update.blocks として別に計測する
+            with self.profiler.section("update.blocks"):
+                if not ball.power_ball:
+                    block_hit = find_block_hit(ball.x, ball.y, ball.size, dx, dy, self.block_field)
+                    if block_hit is not None and (hit is None or block_hit.time < hit.time):
+                        hit = block_hit
+                travel = hit.time if hit else 1.0
+                
+                # パワーボールは通り道のブロックをすべて削りながら貫通する
+                if ball.power_ball:
+                    for block_index in find_blocks_on_path(ball.x, ball.y, ball.size, dx * travel, dy * travel, self.block_field):
+                        if block_index not in pierced_indices:
+                            pierced_indices.add(block_index)
+                            self.hit_block(block_index, damage=2, is_power_ball=True)
+            
+            ball.x += dx * travel
+            ball.y += dy * travel
+            if hit is None:
+                break
+            remaining *= 1.0 - travel
+            
+            if hit.kind == HIT_PADDLE:
+                ball.reflect_paddle(self.paddle)
+                # パドルで跳ね返した時にコンボをリセット
+                self.combo_count = 0
+                self.combo_display_timer = 0
+            else:
+                ball.reflect(hit.normal_x, hit.normal_y)
+                if hit.kind == HIT_BLOCK:
+                    self.hit_block(hit.block_index)
+            
+            # 速度を正規化して一定の速度を保つ
+            ball.normalize_velocity()
+    
+    def hit_block(self, block_index, damage=1, is_power_ball=False):
+        """ボールや弾がブロックに当たった時の処理（耐久度・コンボ・スコア・アイテム）"""
+        with self.profiler.section("update.blocks"):
+            block_destroyed = self.block_field.hit(block_index, damage)
+            
+            # ブロックにヒットした場合はコンボを更新
+            self.combo_count += 1
+            self.combo_display_timer = 30  # 0.5秒間表示（60fps × 0.5秒）
+            
+            # ブロックが破壊された場合のスコア計算
+            if block_destroyed:
+                score_gained = self.calculate_score(is_power_ball=is_power_ball)
+                self.score += self.apply_score_adjustment(score_gained)
+                self.blocks_destroyed += 1
+            
+                # アイテム出現判定
+                self.check_item_spawn(*self.block_field.center(block_index))
+            
+                # ブロック破壊数に応じて速度を上昇
+                self.check_speed_increase()
+            else:
+                # ブロックが破壊されなかった場合は(10-残り耐久度)点を素点として計算
+                base_damage_score = 10 - self.block_field.durability[block_index]
+                score_gained = self.calculate_score(base_damage_score, is_power_ball=is_power_ball)
+                self.score += self.apply_score_adjustment(score_gained)
+    
     def check_item_spawn(self, x, y):
         # スコア100点ごとにアイテムを出現させる
         if self.score - self.last_item_score >= ITEM_SCORE_THRESHOLD:
@@ -501,19 +574,15 @@ class Game:
             # 難易度設定に基づいてアイテムタイプを選択
             available_items = self.difficulty_settings['items_enable']
             if available_items:  # 利用可能なアイテムがある場合のみ
-                item_type = random.choice(available_items)
+                item_type = self.rng.choice(available_items)
                 
                 # アイテムを作成
-                item = Item(x, y, item_type)
-                self.items.append(item)
+                self.entities.spawn_item(x, y, item_type)
     
     def check_item_collision(self):
-        paddle_rect = self.paddle.get_rect()
-        for item in self.items[:]:
-            if item.active and item.get_rect().colliderect(paddle_rect):
-                self.activate_item_effect(item.item_type)
-                item.active = False
-                self.items.remove(item)
+        for item_type in self.entities.collect_items(self.paddle.get_rect()):
+            self.item_pickups[item_type] = self.item_pickups.get(item_type, 0) + 1
+            self.activate_item_effect(item_type)
     
     def activate_item_effect(self, item_type):
         # ボールが固定されている場合は効果を待機リストに追加
@@ -527,17 +596,20 @@ class Game:
             self.paddle_wide_timer = 600  # 60fps × 10秒
             
         elif item_type == "multi_ball":
-            # マルチボール効果：新しいボールを追加
-            if len(self.balls) < 5:  # 最大5個まで
-                new_ball = Ball(self.paddle.x, self.current_ball_speed)
-                new_ball.stuck_to_paddle = False  # 即座に動き出す
-                # 異なる角度で発射
-                angle = random.uniform(-math.pi/3, math.pi/3)
-                new_ball.velocity_x = new_ball.current_speed * math.sin(angle)
-                new_ball.velocity_y = -new_ball.current_speed * math.cos(angle)
-                self.balls.append(new_ball)
-            # すでに5個以上ボールがある場合、ライフ+1（HardやExtremeでは行わない）
-            elif self.difficulty_settings['name'] == "Easy" or self.difficulty_settings['name'] != "Normal":
+            # マルチボール効果：新しいボールを追加（難易度設定の最大数まで、通常は1個ずつ最大5個）
+            max_balls = self.difficulty_settings.get('max_balls', MAX_BALLS)
+            if len(self.balls) < max_balls:
+                add_count = min(self.difficulty_settings.get('multi_ball_count', 1), max_balls - len(self.balls))
+                for _ in range(add_count):
+                    new_ball = self.ball_pool.acquire(self.paddle.x, self.current_ball_speed, self.rng)
+                    new_ball.stuck_to_paddle = False  # 即座に動き出す
+                    # 異なる角度で発射
+                    angle = self.rng.uniform(-math.pi/3, math.pi/3)
+                    new_ball.velocity_x = new_ball.current_speed * math.sin(angle)
+                    new_ball.velocity_y = -new_ball.current_speed * math.cos(angle)
+                    self.balls.append(new_ball)
+            # すでに最大数のボールがある場合、難易度設定で指定があればライフ+1
+            elif self.difficulty_settings.get('extra_life_at_ball_cap', False):
                 self.lives += 1
             
         elif item_type == "slow_ball":
@@ -566,6 +638,11 @@ class Game:
         elif item_type == "paddle_shot":
             # パドルショット効果：6回分の弾丸を追加（最大6発まで）
             self.paddle_shot_count = min(self.paddle_shot_count + 6, 6)
+            
+        elif item_type == "laser":
+            # レーザー効果：スペースキーを押している間、パドルの両端から連射、5秒間
+            self.laser_timer = LASER_DURATION
+            self.laser_cooldown = 0
     
     def update_item_effects(self):
         # パドル拡大効果のタイマー
@@ -589,6 +666,12 @@ class Game:
                 # 全ボールのパワーボール効果を解除
                 for ball in self.balls:
                     ball.power_ball = False
+        
+        # レーザー効果のタイマー
+        if self.laser_cooldown > 0:
+            self.laser_cooldown -= 1
+        if self.laser_timer > 0:
+            self.laser_timer -= 1
     
     def reset_item_effects(self):
         """ミス時にすべてのアイテム効果をリセットする"""
@@ -607,9 +690,11 @@ class Game:
         for ball in self.balls:
             ball.power_ball = False
         
-        # パドルショット効果のリセット
+        # パドルショット・レーザー効果のリセット
         self.paddle_shot_count = 0
-        self.bullets = []
+        self.laser_timer = 0
+        self.laser_cooldown = 0
+        self.entities.clear(ENTITY_BULLET)
         
         # 待機中のアイテム効果もリセット
         self.pending_item_effects.clear()
@@ -617,13 +702,19 @@ class Game:
     def fire_paddle_shot(self):
         """パドルから弾丸を発射する"""
         if self.paddle_shot_count > 0:
-            # マウスのX座標から弾丸を発射
-            mouse_x, mouse_y = pygame.mouse.get_pos()
-            bullet_x = mouse_x
+            # パドルの中央から弾丸を発射（マウス操作時はマウスのX座標と同じ位置）
+            bullet_x = self.paddle.x + self.paddle.width // 2
             bullet_y = self.paddle.y
-            bullet = Bullet(bullet_x, bullet_y)
-            self.bullets.append(bullet)
-            self.paddle_shot_count -= 1
+            # 弾丸の空きがない場合は発射しない（残り回数も減らさない）
+            if self.entities.spawn_bullet(bullet_x, bullet_y) is not None:
+                self.paddle_shot_count -= 1
+    
+    def fire_laser(self):
+        """レーザー効果中にパドルの両端から弾丸を発射する（発射間隔ごと）"""
+        if self.laser_timer > 0 and self.laser_cooldown == 0:
+            self.entities.spawn_bullet(self.paddle.x + BULLET_SIZE, self.paddle.y)
+            self.entities.spawn_bullet(self.paddle.x + self.paddle.width - BULLET_SIZE, self.paddle.y)
+            self.laser_cooldown = LASER_FIRE_INTERVAL
     
     def calculate_score(self, base_score=10, is_power_ball=False):
         # 基本スコア（引数で指定可能、デフォルトは10）
@@ -660,23 +751,23 @@ class Game:
                 else:
                     ball.current_speed = new_speed
                 ball.normalize_velocity()
-            print(f"ボール速度が上昇しました！ 現在の速度: {self.current_ball_speed}")
+            self.log(f"ボール速度が上昇しました！ 現在の速度: {self.current_ball_speed}")
     
     def reset_ball(self):
-        self.balls = [Ball(self.paddle.x, self.current_ball_speed)]
+        """ボールをパドルの上の1個だけにする"""
+        self.ball_pool.release_all(self.balls)
+        self.balls.append(self.ball_pool.acquire(self.paddle.x, self.current_ball_speed, self.rng))
     
     def game_over(self):
         self.game_state = "game_over"
-        self.end_time = pygame.time.get_ticks()
         
         # セーブデータを更新（ハイスコア更新も含む）
         self.update_save_data()
         
-        print(f"ゲームオーバー！ スコア: {self.score}")
+        self.log(f"ゲームオーバー！ スコア: {self.score}")
     
     def game_clear(self):
         self.game_state = "game_clear"
-        self.end_time = pygame.time.get_ticks()
         
         # クリア時のボーナススコア計算
         bonus_score = self.calculate_clear_bonus()
@@ -686,7 +777,7 @@ class Game:
         # セーブデータを更新
         self.update_save_data()
         
-        print(f"ゲームクリア！ 最終スコア: {self.score}")
+        self.log(f"ゲームクリア！ 最終スコア: {self.score}")
     
     def show_special_reward_screen(self):
         """特別報酬画面を表示する"""
@@ -699,10 +790,12 @@ class Game:
         self.current_bonus_type = "bonus"
         self.load_bonus_image()
         
-        print("特別報酬画面を表示します！")
+        self.log("特別報酬画面を表示します！")
     
     def load_bonus_image(self):
-        """現在のボーナス種類に応じて画像を読み込む"""
+        """現在のボーナス種類に応じて画像を読み込む（ヘッドレスモードでは読み込まない）"""
+        if self.headless:
+            return
         try:
             bonus_key = self.current_bonus_type
             bonus_filename = self.current_stage_config.get(bonus_key, "")
@@ -711,13 +804,16 @@ class Game:
                 bonus_path = f"{self.current_stage_config['folder']}/{bonus_filename}"
                 self.background = pygame.image.load(bonus_path)
                 self.background = pygame.transform.scale(self.background, (SCREEN_WIDTH, SCREEN_HEIGHT))
-                print(f"{bonus_key}画像を読み込みました: {bonus_filename}")
+                self.log(f"{bonus_key}画像を読み込みました: {bonus_filename}")
             else:
                 raise pygame.error(f"{bonus_key}画像が設定されていません")
         except (pygame.error, FileNotFoundError) as e:
-            print(f"ボーナス画像の読み込みに失敗しました: {e}")
+            self.log(f"ボーナス画像の読み込みに失敗しました: {e}")
             self.background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
             self.background.fill(YELLOW)  # 黄色い背景をフォールバックとして使用
+        
+        # 背景が変わったため描画レイヤーを作り直す
+        self.playfield = Playfield(self.background, self.block_field)
     
     def can_show_next_bonus(self):
         """次のボーナス画像を表示できるかどうかを判定"""
@@ -745,7 +841,6 @@ class Game:
         """ステージクリア処理"""
         self.game_state = "stage_clear"
         self.stage_clear_timer = 180  # 3秒間（60fps × 3）
-        self.end_time = pygame.time.get_ticks()
         
         # ステージクリア時のボーナススコア計算
         bonus_score = self.calculate_clear_bonus()
@@ -755,7 +850,7 @@ class Game:
         # セーブデータを更新
         self.update_save_data()
         
-        print(f"ステージ{self.current_stage}クリア！")
+        self.log(f"ステージ{self.current_stage}クリア！")
     
     def next_stage(self):
         """次のステージに進む"""
@@ -764,7 +859,7 @@ class Game:
             self.current_stage_index += 1
         else:
             # 全ステージクリアの場合
-            print("全ステージクリア！")
+            self.log("全ステージクリア！")
             return
         
         # 新しいステージ設定を読み込み
@@ -774,31 +869,32 @@ class Game:
         # ウィンドウタイトルを更新
         self.update_window_title()
         
-        # ステージの画像を読み込み
-        try:
-            foreground_path = f"{self.current_stage_config['folder']}/{self.current_stage_config['foreground']}"
-            self.foreground = pygame.image.load(foreground_path)
-            self.foreground = pygame.transform.scale(self.foreground, (SCREEN_WIDTH, SCREEN_HEIGHT))
-        except (pygame.error, FileNotFoundError):
-            print(f"前景画像が見つかりません。白い前景を使用します。")
-            self.foreground = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            self.foreground.fill(WHITE)
+        # ステージの画像を読み込み（ヘッドレスモードでは読み込まない）
+        if not self.headless:
+            try:
+                foreground_path = f"{self.current_stage_config['folder']}/{self.current_stage_config['foreground']}"
+                self.foreground = pygame.image.load(foreground_path)
+                self.foreground = pygame.transform.scale(self.foreground, (SCREEN_WIDTH, SCREEN_HEIGHT))
+            except (pygame.error, FileNotFoundError):
+                self.log(f"前景画像が見つかりません。白い前景を使用します。")
+                self.foreground = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+                self.foreground.fill(WHITE)
         
-        try:
-            background_path = f"{self.current_stage_config['folder']}/{self.current_stage_config['background']}"
-            self.background = pygame.image.load(background_path)
-            self.background = pygame.transform.scale(self.background, (SCREEN_WIDTH, SCREEN_HEIGHT))
-        except (pygame.error, FileNotFoundError):
-            print(f"背景画像が見つかりません。")
-            self.background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            self.background.fill(BLACK)
+            try:
+                background_path = f"{self.current_stage_config['folder']}/{self.current_stage_config['background']}"
+                self.background = pygame.image.load(background_path)
+                self.background = pygame.transform.scale(self.background, (SCREEN_WIDTH, SCREEN_HEIGHT))
+            except (pygame.error, FileNotFoundError):
+                self.log(f"背景画像が見つかりません。")
+                self.background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+                self.background.fill(BLACK)
         
         # ゲーム状態をリセット（スコアと残りボールは引き継ぎ）
         self.paddle = Paddle()
-        self.items = []
+        self.entities.clear()
         self.blocks_destroyed = 0
         self.current_ball_speed = self.difficulty_settings['initial_ball_speed']
-        self.balls = [Ball(self.paddle.x, self.current_ball_speed)]
+        self.reset_ball()
         self.combo_count = 0
         self.combo_display_timer = 0
         
@@ -807,24 +903,22 @@ class Game:
         self.ball_slow_timer = 0
         self.power_ball_timer = 0
         self.paddle_shot_count = 0
-        self.bullets = []
+        self.laser_timer = 0
+        self.laser_cooldown = 0
         self.paddle.width = self.original_paddle_width
         self.pending_item_effects.clear()
         
         # ゲーム状態管理のリセット
         self.game_state = "playing"
         self.current_bonus_type = "bonus"  # ボーナス画像の種類をリセット
-        self.pause_start_time = None
-        self.total_pause_time = 0
         
         # 新しいステージ開始時にタイマーをリセット
-        self.start_time = pygame.time.get_ticks()
+        self.play_ticks = 0
         
         # ブロックを再作成
-        self.blocks = []
         self.create_blocks()
         
-        print(f"ステージ{self.current_stage}開始！")
+        self.log(f"ステージ{self.current_stage}開始！")
     
     def retry_stage(self):
         """現在のステージをリトライ"""
@@ -835,10 +929,10 @@ class Game:
         
         # その他は次のステージと同じ処理
         self.paddle = Paddle()
-        self.items = []
+        self.entities.clear()
         self.blocks_destroyed = 0
         self.current_ball_speed = self.difficulty_settings['initial_ball_speed']
-        self.balls = [Ball(self.paddle.x, self.current_ball_speed)]
+        self.reset_ball()
         self.combo_count = 0
         self.combo_display_timer = 0
         
@@ -847,23 +941,20 @@ class Game:
         self.ball_slow_timer = 0
         self.power_ball_timer = 0
         self.paddle_shot_count = 0
-        self.bullets = []
+        self.laser_timer = 0
+        self.laser_cooldown = 0
         self.paddle.width = self.original_paddle_width
         self.pending_item_effects.clear()
         
         # ゲーム状態管理のリセット
         self.game_state = "playing"
         self.current_bonus_type = "bonus"  # ボーナス画像の種類をリセット
-        self.start_time = pygame.time.get_ticks()
-        self.end_time = None
-        self.pause_start_time = None
-        self.total_pause_time = 0
+        self.play_ticks = 0
         
         # ブロックを再作成
-        self.blocks = []
         self.create_blocks()
         
-        print(f"ステージ{self.current_stage}リトライ！")
+        self.log(f"ステージ{self.current_stage}リトライ！")
     
     def reset_game(self):
         """ゲームを初期状態にリセットする（ステージ1から開始）"""
@@ -875,32 +966,33 @@ class Game:
         # ウィンドウタイトルを更新
         self.update_window_title()
         
-        # ステージ1の画像を読み込み
-        try:
-            foreground_path = f"{self.current_stage_config['folder']}/{self.current_stage_config['foreground']}"
-            self.foreground = pygame.image.load(foreground_path)
-            self.foreground = pygame.transform.scale(self.foreground, (SCREEN_WIDTH, SCREEN_HEIGHT))
-        except (pygame.error, FileNotFoundError):
-            print(f"前景画像が見つかりません。白い前景を使用します。")
-            self.foreground = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            self.foreground.fill(WHITE)
+        # ステージ1の画像を読み込み（ヘッドレスモードでは読み込まない）
+        if not self.headless:
+            try:
+                foreground_path = f"{self.current_stage_config['folder']}/{self.current_stage_config['foreground']}"
+                self.foreground = pygame.image.load(foreground_path)
+                self.foreground = pygame.transform.scale(self.foreground, (SCREEN_WIDTH, SCREEN_HEIGHT))
+            except (pygame.error, FileNotFoundError):
+                self.log(f"前景画像が見つかりません。白い前景を使用します。")
+                self.foreground = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+                self.foreground.fill(WHITE)
         
-        try:
-            background_path = f"{self.current_stage_config['folder']}/{self.current_stage_config['background']}"
-            self.background = pygame.image.load(background_path)
-            self.background = pygame.transform.scale(self.background, (SCREEN_WIDTH, SCREEN_HEIGHT))
-        except (pygame.error, FileNotFoundError):
-            print(f"背景画像が見つかりません。")
             try:
-                self.background = pygame.image.load("back.png")
+                background_path = f"{self.current_stage_config['folder']}/{self.current_stage_config['background']}"
+                self.background = pygame.image.load(background_path)
                 self.background = pygame.transform.scale(self.background, (SCREEN_WIDTH, SCREEN_HEIGHT))
             except (pygame.error, FileNotFoundError):
-                self.background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-                self.background.fill(BLACK)
+                self.log(f"背景画像が見つかりません。")
+                try:
+                    self.background = pygame.image.load("back.png")
+                    self.background = pygame.transform.scale(self.background, (SCREEN_WIDTH, SCREEN_HEIGHT))
+                except (pygame.error, FileNotFoundError):
+                    self.background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+                    self.background.fill(BLACK)
         
         # ゲームオブジェクトの初期化
         self.paddle = Paddle()
-        self.items = []
+        self.entities.clear()
         
         # スコアとゲーム状態のリセット
         self.score = 0
@@ -908,7 +1000,7 @@ class Game:
         self.lives = self.difficulty_settings['balls'] - 1
         self.blocks_destroyed = 0
         self.current_ball_speed = self.difficulty_settings['initial_ball_speed']
-        self.balls = [Ball(self.paddle.x, self.current_ball_speed)]
+        self.reset_ball()
         self.combo_count = 0
         self.combo_display_timer = 0
         
@@ -917,7 +1009,8 @@ class Game:
         self.ball_slow_timer = 0
         self.power_ball_timer = 0
         self.paddle_shot_count = 0
-        self.bullets = []
+        self.laser_timer = 0
+        self.laser_cooldown = 0
         self.original_paddle_width = PADDLE_WIDTH
         self.paddle.width = self.original_paddle_width
         self.pending_item_effects.clear()  # 待機中のアイテム効果もリセット
@@ -925,15 +1018,11 @@ class Game:
         # ゲーム状態管理のリセット
         self.game_state = "playing"
         self.stage_clear_timer = 0
-        self.start_time = pygame.time.get_ticks()
-        self.end_time = None
+        self.play_ticks = 0
         self.show_special_reward = False
         self.current_bonus_type = "bonus"  # ボーナス画像の種類をリセット
-        self.pause_start_time = None
-        self.total_pause_time = 0
         
         # ブロックを再作成
-        self.blocks = []
         self.create_blocks()
     
     def calculate_clear_bonus(self):
@@ -948,13 +1037,8 @@ class Game:
             life_bonus = self.lives * 500
         
         # 時間ボーナス（ゲーム時間が短いほど高得点）
-        if self.end_time:
-            # ポーズ時間を除いた実プレイ時間を計算
-            game_time_seconds = (self.end_time - self.start_time - self.total_pause_time) / 1000
-        else:
-            # end_timeが設定されていない場合のフォールバック
-            current_time = pygame.time.get_ticks()
-            game_time_seconds = (current_time - self.start_time - self.total_pause_time) / 1000
+        # ポーズ時間を除いたプレイ時間（クリア後は数えないため終了時点の時間）
+        game_time_seconds = self.get_play_time_seconds()
         # 各ステージの基準時間以内なら時間ボーナス、それ以上は0
         target_time = self.current_stage_config["target_time"]
         if game_time_seconds <= target_time:
@@ -965,68 +1049,127 @@ class Game:
             time_bonus = 0
         
         total_bonus = life_bonus + time_bonus
-        print(f"クリアボーナス: ライフボーナス={life_bonus}, 時間ボーナス={time_bonus} ({game_time_seconds} sec), 合計={total_bonus}")
+        self.log(f"クリアボーナス: ライフボーナス={life_bonus}, 時間ボーナス={time_bonus} ({game_time_seconds} sec), 合計={total_bonus}")
         return max(total_bonus, 0)
     
-    def draw(self):
-        # 背景画像を描画
-        self.screen.blit(self.background, (0, 0))
+    def get_moving_objects(self):
+        """位置を補間して描画するオブジェクトを取得（リストを作らずに順に返す）
+
+        アイテムと弾丸は EntityWorld が更新前の位置を持ち、描画時に補間する。
+        """
+        return itertools.chain((self.paddle,), self.balls)
+    
+    def store_previous_positions(self):
+        """更新前の位置を記録する"""
+        for obj in self.get_moving_objects():
+            obj.previous_position = (obj.x, obj.y)
+        self.entities.store_previous_positions()
+    
+    def interpolate_positions(self, alpha):
+        """前回の更新位置と現在位置の間に一時的に移動し、元の位置のリストを返す"""
+        saved_positions = []
+        for obj in self.get_moving_objects():
+            saved_positions.append((obj, obj.x, obj.y))
+            # 直前の更新で追加されたオブジェクトは現在位置のまま
+            previous = getattr(obj, "previous_position", None)
+            if previous is not None:
+                obj.x = previous[0] + (obj.x - previous[0]) * alpha
+                obj.y = previous[1] + (obj.y - previous[1]) * alpha
+        return saved_positions
+    
+    def draw(self, alpha=1.0):
+        """画面を描画する
+
+        alpha: 前回の更新から次の更新までの経過割合（0～1）。
+        ゲーム中は移動するオブジェクトをこの割合で補間した位置に描画する。
+        """
+        if self.headless:
+            return
+        if alpha < 1.0 and self.game_state == "playing":
+            saved_positions = self.interpolate_positions(alpha)
+            self.entity_alpha = alpha
+            try:
+                self.draw_frame()
+            finally:
+                # ゲームロジック上の位置に戻す
+                for obj, x, y in saved_positions:
+                    obj.x = x
+                    obj.y = y
+                self.entity_alpha = 1.0
+        else:
+            self.draw_frame()
+    
+    def draw_frame(self):
+        """現在の位置で画面を描画する"""
+        # ヒットされたブロックのマスを描画レイヤーに反映
+        with self.profiler.section("draw.blocks"):
+            changed_rects = self.playfield.sync()
+        
+        # 差分描画モードではゲーム中のみ変化した領域だけを描画
+        if self.dirty_renderer:
+            if self.game_state == "playing":
+                self.draw_dirty(changed_rects)
+                return
+            # ゲーム中以外は全画面を描画し、再開時に全体を描き直す
+            self.dirty_renderer.invalidate()
         
-        # CSVファイルからブロック配置を読み込み
-        csv_path = f"{self.current_stage_config['folder']}/{self.current_stage_config['definition']}.csv"
-        block_layout = self.load_block_layout_from_csv(csv_path)
+        # ゲームクリア時と特別報酬時とポーズ時以外はゲームオブジェクトを描画
+        show_objects = self.game_state not in ["stage_clear", "game_clear", "special_reward", "paused"]
         
-        # ブロックがある場所に前景画像の該当部分を描画
-        for row in range(len(block_layout)):
-            for col in range(len(block_layout[row])):
-                durability = block_layout[row][col]
-                if durability != 0:  # ブロックがある場所
-                    x = col * BLOCK_SIZE
-                    y = row * BLOCK_SIZE + GAME_AREA_Y
-                    rect = pygame.Rect(x, y, BLOCK_SIZE, BLOCK_SIZE)
-                    
-                    # 該当するブロックが破壊されているかチェック
-                    block_exists = False
-                    for block in self.blocks:
-                        if block.x == x and block.y == y and not block.destroyed:
-                            block_exists = True
-                            break
-                    
-                    # ブロックが存在する場合のみ前景画像を描画
-                    if block_exists:
-                        # 画像境界を超えないように矩形をクリップ
-                        clipped_rect = rect.clip(self.foreground.get_rect())
-                        if clipped_rect.width > 0 and clipped_rect.height > 0:
-                            fg_section = self.foreground.subsurface(clipped_rect)
-                            self.screen.blit(fg_section, (clipped_rect.x, clipped_rect.y))
+        # 背景と残りブロックを合成したレイヤーを描画（ゲーム中は縁取りと耐久性表示付き）
+        with self.profiler.section("draw.background"):
+            self.screen.blit(self.playfield.get_layer(decorated=show_objects), (0, 0))
         
         # セーフエリアの描画
-        self.draw_safe_area()
+        self.draw_hud()
         
-        # ゲームクリア時と特別報酬時とポーズ時以外はゲームオブジェクトを描画
-        if self.game_state not in ["stage_clear", "game_clear", "special_reward", "paused"]:
+        # ゲーム中とポーズ中はセーフエリアの表示と重なるブロックを上から描き直す
+        if show_objects or self.game_state == "paused":
+            with self.profiler.section("draw.blocks"):
+                self.playfield.redraw_blocks_under_hud(self.screen, decorated=show_objects)
+        
+        if show_objects:
             # ゲームオブジェクトの描画
-            self.paddle.draw(self.screen)
-            for ball in self.balls:
-                ball.draw(self.screen)
-            
-            # ブロックの描画（耐久性表示含む）
-            for block in self.blocks:
-                block.draw(self.screen)
+            ball_rects = self.draw_paddle_and_balls()
             
-            # アイテムの描画
-            for item in self.items:
-                item.draw(self.screen)
+            # ボールと重なるブロックはボールより上に描画
+            with self.profiler.section("draw.blocks"):
+                self.playfield.redraw_blocks_over(self.screen, ball_rects[1:])
             
-            # 弾丸の描画
-            for bullet in self.bullets:
-                bullet.draw(self.screen)
-        elif self.game_state == "paused":
-            # ポーズ中はブロックのみ描画（耐久度表示なし）
-            for block in self.blocks:
-                block.draw_paused(self.screen)
-        
-        pygame.display.flip()
+            # アイテムと弾丸の描画
+            self.draw_entities()
+        
+        with self.profiler.section("draw.flip"):
+            pygame.display.flip()
+    
+    def draw_dirty(self, changed_rects):
+        """差分描画モードでゲーム画面を描画"""
+        self.dirty_renderer.draw(
+            self.playfield,
+            changed_rects,
+            self.draw_paddle_and_balls,
+            self.draw_entities,
+            self.draw_hud
+        )
+    
+    def draw_paddle_and_balls(self):
+        """パドルとボールを描画して描画した領域のリスト（先頭がパドル）を返す
+
+        ボールは通常・パワーボールの描画済みの画像を Surface.blits でまとめて描く。
+        """
+        self.paddle.draw(self.screen)
+        self.screen.blits([(ball.get_sprite(), ball.get_sprite_position()) for ball in self.balls], False)
+        return [self.paddle.get_draw_rect(), *[ball.get_draw_rect() for ball in self.balls]]
+    
+    def draw_entities(self):
+        """アイテムと弾丸を描画して描画した領域のリストを返す"""
+        return self.entities.draw(self.screen, self.entity_alpha)
+    
+    def draw_hud(self):
+        """セーフエリアを描画（処理時間のオーバーレイ表示中はその上に重ねる）"""
+        with self.profiler.section("draw.hud"):
+            self.draw_safe_area()
+            self.profiler.draw_overlay(self.screen)
     
     def draw_safe_area(self):
         # セーフエリアの背景を描画（半透明の暗いグレー）
@@ -1041,17 +1184,17 @@ class Game:
         # 特別報酬画面では専用メッセージのみ表示
         if self.game_state == "special_reward":
             # 特別報酬画面のメッセージをセーフエリア内に表示
-            congratulations_text = self.font.render("Congratulations!!", True, YELLOW)
+            congratulations_text = text_cache.render(self.font, "Congratulations!!", YELLOW)
             congratulations_rect = congratulations_text.get_rect()
             self.screen.blit(congratulations_text, ((SCREEN_WIDTH - congratulations_rect.width) // 2, 15))
             
             # クリック待機メッセージ（次のボーナス画像があるかどうかで分岐）
             if self.can_show_next_bonus():
-                click_text = self.small_font.render("Click to Next Bonus", True, WHITE)
+                click_text = text_cache.render(self.small_font, "Click to Next Bonus", WHITE)
             elif self.current_stage_index + 1 < len(self.stage_data):
-                click_text = self.small_font.render("Click to Next Stage", True, WHITE)
+                click_text = text_cache.render(self.small_font, "Click to Next Stage", WHITE)
             else:
-                click_text = self.small_font.render("Click to Character Select", True, WHITE)
+                click_text = text_cache.render(self.small_font, "Click to Character Select", WHITE)
             click_rect = click_text.get_rect()
             self.screen.blit(click_text, ((SCREEN_WIDTH - click_rect.width) // 2, 40))
             return
@@ -1059,24 +1202,24 @@ class Game:
         # ポーズ画面では専用メッセージのみ表示
         if self.game_state == "paused":
             # ポーズメッセージをセーフエリア内に表示
-            pause_text = self.font.render("PAUSED", True, YELLOW)
+            pause_text = text_cache.render(self.font, "PAUSED", YELLOW)
             pause_rect = pause_text.get_rect()
             self.screen.blit(pause_text, ((SCREEN_WIDTH - pause_rect.width) // 2, 10))
             
             # 操作説明
-            resume_text = self.small_font.render("Press any key or click to resume", True, WHITE)
+            resume_text = text_cache.render(self.small_font, "Press any key or click to resume", WHITE)
             resume_rect = resume_text.get_rect()
             self.screen.blit(resume_text, ((SCREEN_WIDTH - resume_rect.width) // 2, 30))
             
-            exit_text = self.small_font.render("Press ESC to exit to stage select", True, WHITE)
+            exit_text = text_cache.render(self.small_font, "Press ESC to exit to stage select", WHITE)
             exit_rect = exit_text.get_rect()
             self.screen.blit(exit_text, ((SCREEN_WIDTH - exit_rect.width) // 2, 50))
             return
         
         # スコアとライフの表示（セーフエリア内）
-        score_text = self.font.render(f"SCORE: {self.score}", True, WHITE)
-        lives_text = self.font.render(f"BALL: {self.lives}", True, WHITE)
-        stage_text = self.small_font.render(f"{self.difficulty_settings['name']} STAGE: {self.current_stage}", True, WHITE)
+        score_text = text_cache.render(self.font, f"SCORE: {self.score}", WHITE)
+        lives_text = text_cache.render(self.font, f"BALL: {self.lives}", WHITE)
+        stage_text = text_cache.render(self.small_font, f"{self.difficulty_settings['name']} STAGE: {self.current_stage}", WHITE)
         
         # スコアを左側に表示
         self.screen.blit(score_text, (15, 15))
@@ -1090,12 +1233,11 @@ class Game:
         
         # プレイ時間を右下に表示（ゲーム中のみ）
         if self.game_state == "playing":
-            current_time = pygame.time.get_ticks()
-            # ポーズ時間を除いた実プレイ時間を計算
-            play_time_seconds = (current_time - self.start_time - self.total_pause_time) // 1000
+            # ポーズ時間を除いたプレイ時間
+            play_time_seconds = self.play_ticks // LOGIC_FPS
             minutes = play_time_seconds // 60
             seconds = play_time_seconds % 60
-            time_text = self.small_font.render(f"TIME: {minutes:02d}:{seconds:02d}", True, WHITE)
+            time_text = text_cache.render(self.small_font, f"TIME: {minutes:02d}:{seconds:02d}", WHITE)
             time_rect = time_text.get_rect()
             self.screen.blit(time_text, (SCREEN_WIDTH - time_rect.width - 15, 40))
         
@@ -1103,7 +1245,7 @@ class Game:
         if self.game_state == "playing":
             # ボールがパドルに固定されている場合は指示テキストを表示
             if any(ball.stuck_to_paddle for ball in self.balls):
-                instruction_text = self.font.render("CLICK TO SHOOT BALL !!", True, YELLOW)
+                instruction_text = text_cache.render(self.font, "CLICK TO SHOOT BALL !!", YELLOW)
                 instruction_rect = instruction_text.get_rect()
                 self.screen.blit(instruction_text, ((SCREEN_WIDTH - instruction_rect.width) // 2, 15))
             else:
@@ -1116,12 +1258,14 @@ class Game:
                     item_effects.append(f"POWER: {self.power_ball_timer//60}s")
                 if self.paddle_shot_count > 0:
                     item_effects.append(f"SHOT: {self.paddle_shot_count}")
+                if self.laser_timer > 0:
+                    item_effects.append(f"LASER: {self.laser_timer//60}s")
                 
                 if item_effects:
                     effect_text = " | ".join(item_effects)
-                    effect_surface = self.small_font.render(effect_text, True, CYAN)
+                    effect_surface = text_cache.render(self.small_font, effect_text, CYAN)
                 else:
-                    effect_surface = self.small_font.render("NO ITEM", True, WHITE)
+                    effect_surface = text_cache.render(self.small_font, "NO ITEM", WHITE)
                 
                 effect_rect = effect_surface.get_rect()
                 self.screen.blit(effect_surface, ((SCREEN_WIDTH - effect_rect.width) // 2, 15))
@@ -1130,18 +1274,18 @@ class Game:
         if self.game_state == "playing":
             # 緊急ステージクリアが可能な場合は優先して表示
             if self.can_emergency_clear():
-                emergency_text = self.small_font.render("Press 'O' to Stage Clear!", True, YELLOW)
+                emergency_text = text_cache.render(self.small_font, "Press 'O' to Stage Clear!", YELLOW)
                 emergency_rect = emergency_text.get_rect()
                 self.screen.blit(emergency_text, ((SCREEN_WIDTH - emergency_rect.width) // 2, 40))
             # コンボカウントを表示（コンボが2以上でタイマーが有効な場合のみ）
             elif self.combo_count >= 2 and self.combo_display_timer > 0:
-                combo_text = self.small_font.render(f"COMBO x{self.combo_count}", True, YELLOW)
+                combo_text = text_cache.render(self.small_font, f"COMBO x{self.combo_count}", YELLOW)
                 combo_rect = combo_text.get_rect()
                 self.screen.blit(combo_text, ((SCREEN_WIDTH - combo_rect.width) // 2, 40))
             else:
                 # コンボが表示されていないときは現在のボールスピードをゲージで表示
                 speed_percentage = self.get_speed_percentage()
-                speed_text = self.small_font.render(f"BALL SPEED: ", True, CYAN)
+                speed_text = text_cache.render(self.small_font, f"BALL SPEED: ", CYAN)
                 speed_rect = speed_text.get_rect()
                 speed_x = (SCREEN_WIDTH - speed_rect.width) // 2
                 self.screen.blit(speed_text, (speed_x, 40))
@@ -1175,85 +1319,229 @@ class Game:
         # ゲーム終了時のメッセージ表示
         elif self.game_state == "game_over":
             # ゲームオーバーメッセージ
-            game_over_text = self.font.render("GAME OVER", True, RED)
+            game_over_text = text_cache.render(self.font, "GAME OVER", RED)
             game_over_rect = game_over_text.get_rect()
             self.screen.blit(game_over_text, ((SCREEN_WIDTH - game_over_rect.width) // 2, 15))
             
             # リトライメッセージ
             if self.difficulty_settings["name"] == "Extreme":
-                retry_text = self.small_font.render("Click to Retry", True, WHITE)
+                retry_text = text_cache.render(self.small_font, "Click to Retry", WHITE)
             else:
-                retry_text = self.small_font.render("Click to Retry Stage", True, WHITE)
+                retry_text = text_cache.render(self.small_font, "Click to Retry Stage", WHITE)
             retry_rect = retry_text.get_rect()
             self.screen.blit(retry_text, ((SCREEN_WIDTH - retry_rect.width) // 2, 40))
         
         elif self.game_state == "stage_clear":
             # ステージクリアメッセージ
-            stage_clear_text = self.font.render(f"STAGE {self.current_stage} CLEAR!", True, YELLOW)
+            stage_clear_text = text_cache.render(self.font, f"STAGE {self.current_stage} CLEAR!", YELLOW)
             stage_clear_rect = stage_clear_text.get_rect()
             self.screen.blit(stage_clear_text, ((SCREEN_WIDTH - stage_clear_rect.width) // 2, 6))
             
             # ボーナススコア詳細を表示
             if hasattr(self, 'last_bonus_score'):
                 bonus_info = f"Bonus: {self.last_bonus_score}"
-                bonus_text = self.small_font.render(bonus_info, True, CYAN)
+                bonus_text = text_cache.render(self.small_font, bonus_info, CYAN)
                 bonus_rect = bonus_text.get_rect()
                 self.screen.blit(bonus_text, ((SCREEN_WIDTH - bonus_rect.width) // 2, 28))
             
             # 次のステージメッセージ
-            next_text = self.small_font.render("Going to next stage...", True, WHITE)
+            next_text = text_cache.render(self.small_font, "Going to next stage...", WHITE)
             next_rect = next_text.get_rect()
             self.screen.blit(next_text, ((SCREEN_WIDTH - next_rect.width) // 2, 43))
         
         elif self.game_state == "game_clear":
             # ゲームクリアメッセージ
-            you_win_text = self.font.render("YOU WIN", True, YELLOW)
+            you_win_text = text_cache.render(self.font, "YOU WIN", YELLOW)
             you_win_rect = you_win_text.get_rect()
             self.screen.blit(you_win_text, ((SCREEN_WIDTH - you_win_rect.width) // 2, 6))
             
             # ボーナススコア詳細を表示
             if hasattr(self, 'last_bonus_score'):
                 bonus_info = f"Bonus: {self.last_bonus_score}"
-                bonus_text = self.small_font.render(bonus_info, True, CYAN)
+                bonus_text = text_cache.render(self.small_font, bonus_info, CYAN)
                 bonus_rect = bonus_text.get_rect()
                 self.screen.blit(bonus_text, ((SCREEN_WIDTH - bonus_rect.width) // 2, 28))
                 
                 # クリック待機メッセージ（目標スコア以上でボーナス画像があれば特別メッセージ）
                 if self.score >= self.current_stage_config["target_score"] and self.current_stage_config["bonus"]:
-                    click_text = self.small_font.render("Click to NEXT", True, WHITE)
+                    click_text = text_cache.render(self.small_font, "Click to NEXT", WHITE)
                 else:
-                    click_text = self.small_font.render("Click to Character Select", True, WHITE)
+                    click_text = text_cache.render(self.small_font, "Click to Character Select", WHITE)
                 click_rect = click_text.get_rect()
                 self.screen.blit(click_text, ((SCREEN_WIDTH - click_rect.width) // 2, 43))
             else:
                 # クリック待機メッセージ
-                click_text = self.small_font.render("Click to Character Select", True, WHITE)
+                click_text = text_cache.render(self.small_font, "Click to Character Select", WHITE)
                 click_rect = click_text.get_rect()
                 self.screen.blit(click_text, ((SCREEN_WIDTH - click_rect.width) // 2, 40))
     
     def run(self):
+        # 固定間隔でゲームロジックを更新し、描画は表示側の速度で行う
+        step_ms = 1000 / LOGIC_FPS
+        accumulator = 0
+        self.clock.tick()
         while True:
-            event_result = self.handle_events()
-            if event_result == False:
-                break
-            elif event_result == "back_to_select":
-                # キャラクター選択画面に戻る
-                return "back_to_select"
+            self.profiler.begin_frame()
+            # フレーム中のセーブデータの更新はまとめてフレームの最後に1回だけ書き込む（書き込みは別スレッド）
+            with self.save_manager.batch():
+                with self.profiler.section("events"):
+                    event_result = self.handle_events()
+                if event_result == False:
+                    break
+                elif event_result == "back_to_select":
+                    # キャラクター選択画面に戻る
+                    self.save_replay()
+                    self.save_profile()
+                    return "back_to_select"
+                
+                # 経過時間分だけゲームロジックを更新（処理落ちが長い場合は上限で打ち切る）
+                accumulator += min(self.clock.get_time(), MAX_FRAME_TIME)
+                with self.profiler.section("update"):
+                    while accumulator >= step_ms:
+                        self.handle_input()
+                        self.update()
+                        accumulator -= step_ms
             
-            self.update()
-            self.draw()
-            self.clock.tick(60)
+            # 次の更新までの経過割合で位置を補間して描画
+            with self.profiler.section("draw"):
+                self.draw(accumulator / step_ms)
+            self.profiler.end_frame()
+            self.clock.tick(self.render_fps)
+        
+        self.save_replay()
+        self.save_profile()
         
         # ゲーム終了時の最終メッセージ
         if self.game_state == "game_over":
-            print(f"最終スコア: {self.score}")
+            self.log(f"最終スコア: {self.score}")
         elif self.game_state == "game_clear":
-            print(f"おめでとうございます！最終スコア: {self.score}")
+            self.log(f"おめでとうございます！最終スコア: {self.score}")
         elif self.game_state == "special_reward":
-            print(f"特別報酬獲得！最終スコア: {self.score}")
+            self.log(f"特別報酬獲得！最終スコア: {self.score}")
         
         return "exit"
     
+    def save_replay(self):
+        """記録中のリプレイを書き終えてファイルを閉じる"""
+        if self.replay_recorder:
+            path = self.replay_recorder.finish()
+            if path:
+                self.log(f"リプレイを保存しました: {path}")
+    
+    def save_profile(self):
+        """計測した処理時間をファイルに書き出す"""
+        label = f"{self.selected_chara['name']} {self.difficulty_key} stage {self.current_stage}"
+        path = self.profiler.dump(label=label)
+        if path:
+            self.log(f"処理時間の計測結果を保存しました: {path}")
+    
+    def run_headless(self, max_ticks=LOGIC_FPS * 60 * 30, stop_at_stage_clear=False):
+        """ウィンドウなしで入力元の操作に従い、できるだけ速くゲームを進める
+
+        ゲームオーバー・全ステージクリア・ボーナス画面のいずれか、または
+        max_ticks 回の更新で終了し、結果の辞書を返す。
+        stop_at_stage_clear を指定するとステージクリア時点で終了する。
+        """
+        running_states = ["playing", "paused"] if stop_at_stage_clear else ["playing", "stage_clear", "paused"]
+        ticks = 0
+        while ticks < max_ticks and self.game_state in running_states:
+            self.handle_input()
+            self.update()
+            ticks += 1
+        
+        return {
+            "state": self.game_state,
+            "score": self.score,
+            "stage": self.current_stage,
+            "stage_index": self.current_stage_index,
+            "lives": self.lives,
+            "ticks": ticks,
+            "play_time": self.get_play_time_seconds(),
+            "remaining_blocks": self.block_field.remaining_count(),
+            "item_pickups": dict(self.item_pickups),
+        }
+
+    def snapshot(self):
+        """ゲームの進行に関わる状態を辞書で取得（リプレイのキーフレーム用、JSONで保存できる値のみ）"""
+        durability, destroyed = self.block_field.get_state()
+        return {
+            "game_state": self.game_state,
+            "stage_index": self.current_stage_index,
+            "score": self.score,
+            "last_item_score": self.last_item_score,
+            "lives": self.lives,
+            "blocks_destroyed": self.blocks_destroyed,
+            "ball_speed": self.current_ball_speed,
+            "combo": [self.combo_count, self.combo_display_timer],
+            "stage_clear_timer": self.stage_clear_timer,
+            "play_ticks": self.play_ticks,
+            "paddle": [self.paddle.x, self.paddle.y, self.paddle.width],
+            "original_paddle_width": self.original_paddle_width,
+            "timers": [self.paddle_wide_timer, self.ball_slow_timer, self.power_ball_timer],
+            "paddle_shot_count": self.paddle_shot_count,
+            "laser": [self.laser_timer, self.laser_cooldown],
+            "pending_item_effects": list(self.pending_item_effects),
+            "bonus": [self.show_special_reward, self.current_bonus_type],
+            "item_pickups": dict(self.item_pickups),
+            "balls": [[ball.x, ball.y, ball.velocity_x, ball.velocity_y, ball.current_speed,
+                       ball.stuck_to_paddle, ball.power_ball] for ball in self.balls],
+            "items": self.entities.get_state(ENTITY_ITEM),
+            "bullets": [[x, y] for x, y, _ in self.entities.get_state(ENTITY_BULLET)],
+            "durability": durability,
+            "destroyed": destroyed,
+            "rng": self.rng.getstate(),
+        }
+
+    def restore_snapshot(self, snapshot):
+        """snapshot で取得した状態に戻す
+
+        ステージの画像は読み込み直さないため、ヘッドレスモードでの
+        リプレイの途中再生に使う。
+        """
+        self.current_stage_index = snapshot["stage_index"]
+        self.load_current_stage_config()
+        self.current_stage = self.current_stage_config["stage"]
+        self.create_blocks()
+        self.block_field.set_state(snapshot["durability"], snapshot["destroyed"])
+        if self.playfield is not None:
+            self.playfield = Playfield(self.background, self.block_field)
+
+        self.game_state = snapshot["game_state"]
+        self.score = snapshot["score"]
+        self.last_item_score = snapshot["last_item_score"]
+        self.lives = snapshot["lives"]
+        self.blocks_destroyed = snapshot["blocks_destroyed"]
+        self.current_ball_speed = snapshot["ball_speed"]
+        self.combo_count, self.combo_display_timer = snapshot["combo"]
+        self.stage_clear_timer = snapshot["stage_clear_timer"]
+        self.play_ticks = snapshot["play_ticks"]
+        self.paddle = Paddle()
+        self.paddle.x, self.paddle.y, self.paddle.width = snapshot["paddle"]
+        self.original_paddle_width = snapshot["original_paddle_width"]
+        self.paddle_wide_timer, self.ball_slow_timer, self.power_ball_timer = snapshot["timers"]
+        self.paddle_shot_count = snapshot["paddle_shot_count"]
+        self.laser_timer, self.laser_cooldown = snapshot.get("laser", [0, 0])
+        self.pending_item_effects = list(snapshot["pending_item_effects"])
+        self.show_special_reward, self.current_bonus_type = snapshot["bonus"]
+        self.item_pickups = dict(snapshot["item_pickups"])
+
+        self.ball_pool.release_all(self.balls)
+        for x, y, velocity_x, velocity_y, speed, stuck, power in snapshot["balls"]:
+            ball = self.ball_pool.acquire(None, speed, self.rng)
+            ball.x, ball.y = x, y
+            ball.velocity_x, ball.velocity_y = velocity_x, velocity_y
+            ball.stuck_to_paddle = stuck
+            ball.power_ball = power
+            self.balls.append(ball)
+        self.entities.clear()
+        for x, y, item_type in snapshot["items"]:
+            self.entities.spawn_item(x, y, item_type)
+        for x, y in snapshot["bullets"]:
+            self.entities.spawn_bullet(x, y)
+
+        # ボールの作成で使った乱数の状態も含めて戻す
+        self.rng.setstate(snapshot["rng"])
+
     def load_stage_data(self):
         """選択されたキャラクターのステージデータを読み込む（SaveManagerに移行済み）"""
         return self.save_manager.load_stage_data(self.selected_chara["folder"])
@@ -1289,7 +1577,7 @@ class Game:
                 # 前景画像が指定されていない場合は、色付きの前景を生成
                 return self.create_colored_foreground()
         except (pygame.error, FileNotFoundError):
-            print(f"前景画像が見つかりません。色付きの前景を使用します。")
+            self.log(f"前景画像が見つかりません。色付きの前景を使用します。")
             return self.create_colored_foreground()
     
     def create_colored_foreground(self):
@@ -1299,8 +1587,7 @@ class Game:
         foreground.fill(WHITE)  # 基本は白で塗りつぶし
         
         # CSVファイルからブロック配置を読み込み
-        csv_path = f"{self.current_stage_config['folder']}/{self.current_stage_config['definition']}.csv"
-        block_layout = self.load_block_layout_from_csv(csv_path)
+        block_layout = self.load_block_layout_from_csv(self.get_stage_csv_path())
         
         # stage.jsonにforeground_colorsが定義されている場合はそれを使用
         foreground_colors = self.current_stage_config.get('foreground_colors', {})
@@ -1332,22 +1619,8 @@ class Game:
         return foreground
     
     def load_block_layout_from_csv(self, csv_path):
-        """CSVファイルからブロック配置を読み込む"""
-        block_layout = []
-        try:
-            with open(csv_path, "r", encoding="utf-8") as f:
-                csv_reader = csv.reader(f)
-                for row in csv_reader:
-                    # 各要素を整数に変換（空白を除去）
-                    layout_row = [int(cell.strip()) for cell in row if cell.strip()]
-                    if layout_row:  # 空行でない場合のみ追加
-                        block_layout.append(layout_row)
-        except (FileNotFoundError, ValueError, csv.Error) as e:
-            print(f"CSVファイルの読み込みに失敗しました: {e}")
-            # デフォルトのブロック配置を返す（空の配置）
-            block_layout = [[0 for _ in range(21)] for _ in range(23)]
-        
-        return block_layout
+        """CSVファイルからブロック配置を読み込む（ステージ配置キャッシュを使用）"""
+        return stage_layout_cache.get_layout(csv_path)
     
     def load_save_data(self):
         """セーブデータを読み込む（SaveManagerに移行済み）"""
@@ -1364,7 +1637,9 @@ class Game:
         return self.save_manager.get_chara_save_key(self.selected_chara["folder"])
     
     def update_save_data(self):
-        """現在のプレイ結果でセーブデータを更新"""
+        """現在のプレイ結果でセーブデータを更新（ヘッドレスモードでは記録しない）"""
+        if self.headless:
+            return
         chara_folder = self.selected_chara["folder"]
         save_data = self.save_manager.get_chara_data(chara_folder)
         
@@ -1376,12 +1651,12 @@ class Game:
         
         if (is_final_clear or is_game_over) and self.score > save_data["hi_score"]:
             update_data["hi_score"] = self.score
-            print(f"ハイスコア更新！: {self.score}")
+            self.log(f"ハイスコア更新！: {self.score}")
         
         # 全ステージクリア判定
         if is_final_clear:
             update_data["clear"] = 1
-            print("全ステージクリア記録を更新しました")
+            self.log("全ステージクリア記録を更新しました")
         
         # データが更新される場合のみSaveManagerを呼び出し
         if update_data:
@@ -1397,12 +1672,13 @@ class Game:
             self.difficulty_settings['get_bonus_image']):
             
             # 既にボーナス画像2フラグ（2）が設定されている場合は維持、そうでなければボーナス画像1フラグ（1）を設定
-            bonus_index = self.current_stage - 1
-            if 0 <= bonus_index < len(save_data["bonus_flags"]) and save_data["bonus_flags"][bonus_index] != 2:
+            if self.save_manager.get_bonus_flag(chara_folder, self.current_stage) != 2:
                 self.save_manager.update_bonus_flag(chara_folder, self.current_stage, 1)
     
     def update_save_data_for_bonus2(self):
-        """ボーナス画像2表示時のセーブデータ更新"""
+        """ボーナス画像2表示時のセーブデータ更新（ヘッドレスモードでは記録しない）"""
+        if self.headless:
+            return
         chara_folder = self.selected_chara["folder"]
         
         # ボーナス画像2フラグ更新（目標スコア2以上でボーナス画像2があり、難易度設定でボーナス画像が有効なステージ）
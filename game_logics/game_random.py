@@ -0,0 +1,62 @@
+import random
+
+MASK64 = (1 << 64) - 1
+
+
+def splitmix64(value):
+    """シードの整数をよく混ぜた64ビットの値に変換"""
+    value = (value + 0x9E3779B97F4A7C15) & MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK64
+    return value ^ (value >> 31)
+
+
+class GameRandom(random.Random):
+    """状態が64ビットの整数1つだけの乱数生成器（xorshift64*）
+
+    random.Random と同じメソッド（uniform・choice など）が使える。
+    標準のメルセンヌ・ツイスタは状態が約2.5KBあるため、リプレイの
+    キーフレームに毎回保存すると大きくなりすぎる。こちらは状態を
+    getstate() の整数1つで保存・復元できる。
+    """
+
+    def __init__(self, seed=None):
+        self._state = 1
+        super().__init__(seed)
+
+    def seed(self, a=None, version=2):
+        if a is None:
+            a = random.SystemRandom().getrandbits(64)
+        elif not isinstance(a, int):
+            a = int.from_bytes(str(a).encode("utf-8"), "little")
+        # 状態が0だと同じ値しか出ないため避ける
+        self._state = splitmix64(a & MASK64) or 1
+        self.gauss_next = None
+
+    def getstate(self):
+        return self._state
+
+    def setstate(self, state):
+        self._state = state
+        self.gauss_next = None
+
+    def _next(self):
+        x = self._state
+        x ^= x >> 12
+        x ^= (x << 25) & MASK64
+        x ^= x >> 27
+        self._state = x
+        return (x * 0x2545F4914F6CDD1D) & MASK64
+
+    def random(self):
+        return (self._next() >> 11) * (1.0 / 9007199254740992.0)
+
+    def getrandbits(self, k):
+        if k <= 0:
+            return 0
+        result = 0
+        bits = 0
+        while bits < k:
+            result |= self._next() << bits
+            bits += 64
+        return result & ((1 << k) - 1)
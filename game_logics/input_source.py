@@ -0,0 +1,77 @@
+import pygame
+from constants.constants import *
+
+
+class PlayerInput:
+    """1回の更新で使うプレイヤーの入力"""
+
+    __slots__ = ("paddle_x", "left", "right", "shoot", "click")
+
+    def __init__(self, paddle_x=None, left=False, right=False, shoot=False, click=False):
+        self.paddle_x = paddle_x  # パドル中央を合わせるX座標（Noneは動かさない）
+        self.left = left  # 左移動キー
+        self.right = right  # 右移動キー
+        self.shoot = shoot  # パドルショット発射キー
+        self.click = click  # ボール発射・パドルショット（左クリック相当）
+
+
+# 何も操作しない入力
+NO_INPUT = PlayerInput()
+
+
+class PygameInputSource:
+    """マウスとキーボードの状態から入力を作る（ウィンドウ表示時用）
+
+    クリックはイベントキューで処理するため、ここでは扱わない。
+    """
+
+    def read(self, game):
+        mouse_x, _ = pygame.mouse.get_pos()
+        keys = pygame.key.get_pressed()
+        return PlayerInput(
+            paddle_x=mouse_x,
+            left=keys[pygame.K_LEFT] or keys[pygame.K_a],
+            right=keys[pygame.K_RIGHT] or keys[pygame.K_d],
+            shoot=keys[pygame.K_SPACE],
+        )
+
+
+class ScriptedInputSource:
+    """更新回数ごとに決められた入力を返す（ヘッドレス実行・テスト用）
+
+    script: 更新回数 -> PlayerInput の辞書。記載のない回は fallback の入力を使う。
+    """
+
+    def __init__(self, script=None, fallback=None):
+        self.script = script or {}
+        self.fallback = fallback
+        self.tick = 0
+
+    def read(self, game):
+        player_input = self.script.get(self.tick)
+        if player_input is None:
+            player_input = self.fallback.read(game) if self.fallback else NO_INPUT
+        self.tick += 1
+        return player_input
+
+
+class AutoPilotInputSource:
+    """一番下のボールの真下にパドルを動かし続ける自動操作
+
+    offset: ボール中心からパドル中心をずらす量（打ち返す角度が変わる）
+    """
+
+    def __init__(self, offset=0):
+        self.offset = offset
+
+    def read(self, game):
+        # パドルに固定されたボールがある・パドルショットが残っている場合は発射する
+        click = any(ball.stuck_to_paddle for ball in game.balls) or game.paddle_shot_count > 0
+        # レーザー効果中は押し続ける
+        shoot = game.laser_timer > 0
+        free_balls = [ball for ball in game.balls if not ball.stuck_to_paddle]
+        if not free_balls:
+            return PlayerInput(shoot=shoot, click=click)
+
+        lowest = max(free_balls, key=lambda ball: ball.y)
+        return PlayerInput(paddle_x=int(lowest.x + lowest.size / 2 + self.offset), shoot=shoot, click=click)
@@ -0,0 +1,66 @@
+import csv
+import os
+
+# ブロック配置ファイルが読めない場合のデフォルト（空の配置）
+DEFAULT_LAYOUT_COLS = 21
+DEFAULT_LAYOUT_ROWS = 23
+
+
+class StageLayoutCache:
+    """ステージのブロック配置（CSV）をパスと更新時刻で管理するキャッシュ"""
+
+    def __init__(self):
+        # パス -> (更新時刻, 配置) の辞書
+        self._layouts = {}
+
+    def get_layout(self, csv_path):
+        """ブロック配置を取得する（ファイルが更新されていなければ再解析しない）
+
+        配置は行ごとのタプルのタプルで返す。共有されるため変更できない。
+        """
+        key = os.path.normpath(csv_path)
+        try:
+            mtime = os.path.getmtime(key)
+        except OSError:
+            mtime = None
+
+        cached = self._layouts.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        layout = self._parse(key)
+        self._layouts[key] = (mtime, layout)
+        return layout
+
+    def get_editable_layout(self, csv_path):
+        """編集用にブロック配置のリストのコピーを取得する"""
+        return [list(row) for row in self.get_layout(csv_path)]
+
+    def invalidate(self, csv_path=None):
+        """キャッシュを破棄する（パス省略時はすべて）"""
+        if csv_path is None:
+            self._layouts.clear()
+        else:
+            self._layouts.pop(os.path.normpath(csv_path), None)
+
+    def _parse(self, csv_path):
+        """CSVファイルからブロック配置を読み込む"""
+        block_layout = []
+        try:
+            with open(csv_path, "r", encoding="utf-8") as f:
+                csv_reader = csv.reader(f)
+                for row in csv_reader:
+                    # 各要素を整数に変換（空白を除去）
+                    layout_row = tuple(int(cell.strip()) for cell in row if cell.strip())
+                    if layout_row:  # 空行でない場合のみ追加
+                        block_layout.append(layout_row)
+        except (FileNotFoundError, ValueError, csv.Error) as e:
+            print(f"CSVファイルの読み込みに失敗しました: {e}")
+            # デフォルトのブロック配置を返す（空の配置）
+            block_layout = [tuple(0 for _ in range(DEFAULT_LAYOUT_COLS)) for _ in range(DEFAULT_LAYOUT_ROWS)]
+
+        return tuple(block_layout)
+
+
+# プロセス全体で共有するキャッシュ
+stage_layout_cache = StageLayoutCache()
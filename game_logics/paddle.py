@@ -1,5 +1,6 @@
 import pygame
 from constants.constants import *
+from asset_manager import asset_manager
 
 class Paddle:
     def __init__(self):
@@ -9,15 +10,13 @@ class Paddle:
         self.height = PADDLE_HEIGHT
         self.speed = 8
         
-        # パドル画像の読み込み
-        self.images = {}
-        self.use_images = True
-        try:
-            self.images['left'] = pygame.image.load('game_resources/paddle_left.png')
-            self.images['center'] = pygame.image.load('game_resources/paddle_center.png')
-            self.images['right'] = pygame.image.load('game_resources/paddle_right.png')
-        except (pygame.error, FileNotFoundError):
-            self.use_images = False
+        # パドル画像の取得（読み込み済みの画像を共有）
+        self.images = {
+            'left': asset_manager.get_image('game_resources/paddle_left.png'),
+            'center': asset_manager.get_image('game_resources/paddle_center.png'),
+            'right': asset_manager.get_image('game_resources/paddle_right.png'),
+        }
+        self.use_images = all(image is not None for image in self.images.values())
     
     def move(self, direction):
         if direction == "left" and self.x > 0:
@@ -32,6 +31,10 @@ class Paddle:
     def get_rect(self):
         return pygame.Rect(self.x, self.y, self.width, self.height)  # widthとheightを使用
     
+    def get_draw_rect(self):
+        """描画で塗りつぶされる領域を取得"""
+        return self.get_rect()
+    
     def draw(self, screen):
         rect = self.get_rect()
         
@@ -0,0 +1,58 @@
+import pygame
+from constants.constants import *
+
+class Playfield:
+    """背景と残りブロックを合成した静的な描画レイヤー
+
+    ステージ開始時に一度だけ合成し、以降はヒットされたブロックのマス（32×32）
+    だけを描き直す。毎フレームの描画はレイヤーの転送1回で済む。
+    """
+
+    def __init__(self, background, block_field):
+        self.background = background
+        self.block_field = block_field
+
+        # 背景＋前景ブロック（ポーズ中・クリア画面用）
+        self.plain = background.copy()
+        # 背景＋前景ブロック＋縁取り・耐久性表示（ゲーム中用）
+        self.decorated = background.copy()
+        block_field.preload_durability_texts()
+
+        for index in block_field.live_indices():
+            block_field.draw_tile(self.plain, index)
+            block_field.draw_tile(self.decorated, index)
+            block_field.draw_decoration(self.decorated, index)
+
+        # 合成前のヒット記録は反映済みのため破棄
+        block_field.pop_changed_indices()
+
+    def sync(self):
+        """ヒットされたブロックのマスを描き直し、描き直した領域のリストを返す"""
+        rects = []
+        for index in self.block_field.pop_changed_indices():
+            rect = self.block_field.get_rect(index)
+            alive = self.block_field.is_alive(index)
+            self.plain.blit(self.background, rect.topleft, rect)
+            if alive:
+                self.block_field.draw_tile(self.plain, index)
+            self.decorated.blit(self.plain, rect.topleft, rect)
+            if alive:
+                self.block_field.draw_decoration(self.decorated, index)
+            rects.append(rect)
+        return rects
+
+    def get_layer(self, decorated=True):
+        """描画に使うレイヤーを取得"""
+        return self.decorated if decorated else self.plain
+
+    def redraw_blocks_under_hud(self, screen, decorated=True):
+        """セーフエリアの表示がはみ出す最上段のブロックを上から描き直す"""
+        self.redraw_blocks_over(screen, [pygame.Rect(0, 0, SCREEN_WIDTH, GAME_AREA_Y + BLOCK_SIZE)], decorated)
+
+    def redraw_blocks_over(self, screen, rects, decorated=True):
+        """指定領域と重なるブロックをレイヤーから描き直す（ブロックを上に重ねる）"""
+        layer = self.get_layer(decorated)
+        for rect in rects:
+            for index in self.block_field.query(rect):
+                area = rect.clip(self.block_field.get_rect(index))
+                screen.blit(layer, area.topleft, area)
@@ -0,0 +1,558 @@
+"""プレイのリプレイの記録・再生
+
+リプレイは次の形式のバイナリファイルに保存する（整数は可変長の varint）。
+
+    ヘッダー: b"BRPL" + 形式バージョン(1バイト) + varint長さ + JSON（シード・ゲーム設定・キーフレーム間隔）
+    チャンク: 4バイト長さ + zlib圧縮したデータ（キーフレーム間隔ごとに1つ）
+        varint 開始更新番号, varint 更新回数,
+        varint長さ + キーフレーム（チャンク開始時点のゲーム状態のJSON）,
+        varint 操作数 + (varint チャンク内の更新番号, 1バイト 操作コード) の並び,
+        入力の並び（下記）
+    フッター: varint長さ + 結果のJSON, 4バイト チャンク数, チャンク位置(8バイト)の並び
+    末尾: フッター位置(8バイト) + b"BRPE"
+
+入力は前の更新からのパドルXの差分と操作フラグを1つの varint にまとめ、
+同じ入力が続く場合は繰り返し回数を付けて1つにする。
+チャンクはキーフレーム間隔ごとに始まるため、任意の更新番号のチャンクの位置は
+フッターの位置の表から直接求められる。記録中に強制終了してフッターがない
+ファイルは、先頭からチャンクを順に読んで読める所まで再生する。
+"""
+import json
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+from constants.constants import *
+from game_logics.input_source import PlayerInput
+
+REPLAY_VERSION = 3
+REPLAY_EXTENSION = ".replay"
+
+HEADER_MAGIC = b"BRPL"
+TRAILER_MAGIC = b"BRPE"
+CHUNK_LENGTH = struct.Struct("<I")
+TRAILER = struct.Struct("<Q4s")
+
+# 入力のフラグ（ビット）
+FLAG_LEFT = 1
+FLAG_RIGHT = 2
+FLAG_SHOOT = 4
+FLAG_CLICK = 8
+
+# 操作名とファイル中のコード
+ACTIONS = ["pause", "resume", "emergency_clear", "cheat_score", "cheat_clear", "click"]
+ACTION_CODES = {action: code for code, action in enumerate(ACTIONS)}
+
+
+def pack_input(player_input):
+    """入力を (パドルX, フラグ) の組に変換"""
+    flags = 0
+    if player_input.left:
+        flags |= FLAG_LEFT
+    if player_input.right:
+        flags |= FLAG_RIGHT
+    if player_input.shoot:
+        flags |= FLAG_SHOOT
+    if player_input.click:
+        flags |= FLAG_CLICK
+    paddle_x = -1 if player_input.paddle_x is None else int(player_input.paddle_x)
+    return paddle_x, flags
+
+
+def unpack_input(paddle_x, flags):
+    """(パドルX, フラグ) の組から入力を作る"""
+    return PlayerInput(
+        paddle_x=None if paddle_x < 0 else paddle_x,
+        left=bool(flags & FLAG_LEFT),
+        right=bool(flags & FLAG_RIGHT),
+        shoot=bool(flags & FLAG_SHOOT),
+        click=bool(flags & FLAG_CLICK),
+    )
+
+
+def write_varint(buffer, value):
+    """0以上の整数を7ビットずつ可変長で書き込む"""
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def read_varint(data, pos):
+    """可変長の整数を読み込み (値, 次の位置) を返す"""
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def zigzag(value):
+    """符号付き整数を0以上の整数に変換（絶対値が小さいほど小さな値になる）"""
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def unzigzag(value):
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+def write_blob(buffer, data):
+    write_varint(buffer, len(data))
+    buffer += data
+
+
+def read_blob(data, pos):
+    length, pos = read_varint(data, pos)
+    return bytes(data[pos:pos + length]), pos + length
+
+
+class Replay:
+    """1回分のプレイの記録（乱数シード・ゲーム設定・更新ごとの入力・操作）
+
+    inputs: 更新ごとの (パドルX, フラグ)
+    actions: 更新番号 -> その更新の前に実行した操作名のリスト
+    """
+
+    def __init__(self, seed, game_config, inputs=None, actions=None, result=None):
+        self.seed = seed
+        self.game_config = game_config  # chara / difficulty / difficulty_settings / stage_index
+        self.inputs = inputs if inputs is not None else []
+        self.actions = actions if actions is not None else {}
+        self.result = result  # 記録終了時のスコアなど（検証用）
+
+    def tick_count(self):
+        return len(self.inputs)
+
+    @classmethod
+    def load(cls, path):
+        """リプレイをファイルから読み込む"""
+        with ReplayReader(path) as reader:
+            return reader.to_replay()
+
+
+class ReplayChunk:
+    """キーフレームと、そこから次のキーフレームまでの操作・入力"""
+
+    def __init__(self, start_tick, snapshot, actions, inputs):
+        self.start_tick = start_tick
+        self.snapshot = snapshot  # チャンク開始時点のゲーム状態（Game.snapshot）
+        self.actions = actions  # 更新番号 -> 操作名のリスト
+        self.inputs = inputs  # 更新ごとの (パドルX, フラグ)
+
+    def end_tick(self):
+        return self.start_tick + len(self.inputs)
+
+    @classmethod
+    def decode(cls, payload):
+        data = zlib.decompress(payload)
+        start_tick, pos = read_varint(data, 0)
+        tick_count, pos = read_varint(data, pos)
+        snapshot, pos = read_blob(data, pos)
+
+        actions = {}
+        action_count, pos = read_varint(data, pos)
+        for _ in range(action_count):
+            offset, pos = read_varint(data, pos)
+            actions.setdefault(start_tick + offset, []).append(ACTIONS[data[pos]])
+            pos += 1
+
+        inputs = []
+        paddle_x = -1
+        while len(inputs) < tick_count:
+            value, pos = read_varint(data, pos)
+            paddle_x += unzigzag(value >> 5)
+            flags = (value >> 1) & 0x0F
+            repeat = 0
+            if value & 1:
+                repeat, pos = read_varint(data, pos)
+            inputs.extend([(paddle_x, flags)] * (repeat + 1))
+        return cls(start_tick, json.loads(snapshot), actions, inputs)
+
+
+class ChunkBuilder:
+    """1つのチャンクの操作と入力を記録中に書き込んでいく"""
+
+    def __init__(self, start_tick, snapshot):
+        self.start_tick = start_tick
+        self.snapshot = snapshot
+        self.actions = bytearray()
+        self.action_count = 0
+        self.inputs = bytearray()
+        self.tick_count = 0
+        self.paddle_x = -1  # チャンクごとに差分の基準を戻す（チャンク単体で読めるように）
+        self.pending = None  # まだ書き込んでいない入力 [差分, フラグ, 繰り返し回数]
+
+    def add_action(self, tick, action):
+        write_varint(self.actions, tick - self.start_tick)
+        self.actions.append(ACTION_CODES[action])
+        self.action_count += 1
+
+    def add_input(self, paddle_x, flags):
+        delta = paddle_x - self.paddle_x
+        self.paddle_x = paddle_x
+        self.tick_count += 1
+        if self.pending is not None and delta == 0 and flags == self.pending[1]:
+            self.pending[2] += 1
+        else:
+            self.write_pending()
+            self.pending = [delta, flags, 0]
+
+    def write_pending(self):
+        if self.pending is None:
+            return
+        delta, flags, repeat = self.pending
+        write_varint(self.inputs, (zigzag(delta) << 5) | (flags << 1) | (1 if repeat else 0))
+        if repeat:
+            write_varint(self.inputs, repeat)
+        self.pending = None
+
+    def finish(self):
+        """チャンクを (圧縮前のヘッダー部分, 入力部分, キーフレーム) にまとめる"""
+        self.write_pending()
+        head = bytearray()
+        write_varint(head, self.start_tick)
+        write_varint(head, self.tick_count)
+        return head, self.action_count, bytes(self.actions), bytes(self.inputs), self.snapshot
+
+
+class ReplayWriter:
+    """リプレイファイルを記録しながら書き込む
+
+    ゲームの更新中は入力をメモリ上のチャンクに追加するだけで、
+    チャンクの圧縮とファイルへの書き込みは別スレッドで行う。
+    """
+
+    def __init__(self, path, seed, game_config, keyframe_interval=REPLAY_KEYFRAME_INTERVAL):
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(path, "wb")
+
+        header = bytearray(HEADER_MAGIC)
+        header.append(REPLAY_VERSION)
+        write_blob(header, json.dumps({
+            "seed": seed,
+            "game_config": game_config,
+            "keyframe_interval": keyframe_interval,
+        }, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        self.file.write(header)
+
+        self.chunk = None
+        self.chunk_offsets = []
+        self.error = None
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self.write_loop, name="replay-writer", daemon=True)
+        self.thread.start()
+
+    def start_chunk(self, tick, snapshot):
+        """キーフレームから新しいチャンクを始める（前のチャンクは書き込みに回す）"""
+        self.flush_chunk()
+        self.chunk = ChunkBuilder(tick, snapshot)
+
+    def add_action(self, tick, action):
+        self.chunk.add_action(tick, action)
+
+    def add_input(self, paddle_x, flags):
+        self.chunk.add_input(paddle_x, flags)
+
+    def flush_chunk(self):
+        if self.chunk is not None:
+            self.queue.put(("chunk", self.chunk.finish()))
+            self.chunk = None
+
+    def close(self, result):
+        """残りのチャンクとフッターを書き込んでファイルを閉じる"""
+        self.flush_chunk()
+        self.queue.put(("footer", result))
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def write_loop(self):
+        """書き込みスレッド：チャンクを圧縮して順に書き込む"""
+        while True:
+            kind, data = self.queue.get()
+            try:
+                if self.error is None:
+                    if kind == "chunk":
+                        self.write_chunk(*data)
+                    else:
+                        self.write_footer(data)
+            except OSError as e:
+                # 書き込みに失敗したらそれ以降は書き込まない（close で通知する）
+                self.error = e
+            if kind == "footer":
+                self.file.close()
+                return
+
+    def write_chunk(self, head, action_count, actions, inputs, snapshot):
+        payload = bytearray(head)
+        write_blob(payload, json.dumps(snapshot, separators=(",", ":")).encode("utf-8"))
+        write_varint(payload, action_count)
+        payload += actions
+        payload += inputs
+        compressed = zlib.compress(bytes(payload), 9)
+
+        self.chunk_offsets.append(self.file.tell())
+        self.file.write(CHUNK_LENGTH.pack(len(compressed)))
+        self.file.write(compressed)
+        # 強制終了してもここまでのチャンクは読めるようにする
+        self.file.flush()
+
+    def write_footer(self, result):
+        footer_offset = self.file.tell()
+        footer = bytearray()
+        write_blob(footer, json.dumps(result, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        footer += CHUNK_LENGTH.pack(len(self.chunk_offsets))
+        footer += struct.pack(f"<{len(self.chunk_offsets)}Q", *self.chunk_offsets)
+        footer += TRAILER.pack(footer_offset, TRAILER_MAGIC)
+        self.file.write(footer)
+
+
+class ReplayReader:
+    """リプレイファイルをメモリマップして読む
+
+    チャンクは必要になった時に展開するため、長いリプレイでも
+    途中の更新番号から再生を始めるのに全体を読む必要はない。
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self.read_header()
+            if not self.read_footer():
+                self.scan_chunks()
+        except (ValueError, IndexError, struct.error, zlib.error) as e:
+            self.data.close()
+            raise ValueError(f"リプレイファイルを読み込めません: {path}: {e}") from e
+        self.cached_chunk = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.data.close()
+
+    def read_header(self):
+        if self.data[:4] != HEADER_MAGIC:
+            raise ValueError("リプレイファイルではありません")
+        if self.data[4] != REPLAY_VERSION:
+            raise ValueError(f"対応していないリプレイ形式です: {self.data[4]}")
+        header, self.chunks_start = read_blob(self.data, 5)
+        header = json.loads(header)
+        self.seed = header["seed"]
+        self.game_config = header["game_config"]
+        self.keyframe_interval = header["keyframe_interval"]
+
+    def read_footer(self):
+        """フッターからチャンクの位置と結果を読む（フッターがなければFalse）"""
+        if len(self.data) < self.chunks_start + TRAILER.size:
+            return False
+        footer_offset, magic = TRAILER.unpack_from(self.data, len(self.data) - TRAILER.size)
+        if magic != TRAILER_MAGIC:
+            return False
+        result, pos = read_blob(self.data, footer_offset)
+        self.result = json.loads(result)
+        (count,) = CHUNK_LENGTH.unpack_from(self.data, pos)
+        self.chunk_offsets = list(struct.unpack_from(f"<{count}Q", self.data, pos + CHUNK_LENGTH.size))
+        return True
+
+    def scan_chunks(self):
+        """記録中に終了したファイル：先頭から完全に書き込まれたチャンクを探す"""
+        self.result = None
+        self.chunk_offsets = []
+        pos = self.chunks_start
+        while pos + CHUNK_LENGTH.size <= len(self.data):
+            (length,) = CHUNK_LENGTH.unpack_from(self.data, pos)
+            end = pos + CHUNK_LENGTH.size + length
+            if end > len(self.data):
+                break
+            try:
+                zlib.decompress(self.data[pos + CHUNK_LENGTH.size:end])
+            except zlib.error:
+                break
+            self.chunk_offsets.append(pos)
+            pos = end
+
+    def chunk_count(self):
+        return len(self.chunk_offsets)
+
+    def read_chunk(self, index):
+        """index 番目のチャンクを展開する（直前に読んだチャンクは再利用）"""
+        if self.cached_chunk is not None and self.cached_chunk[0] == index:
+            return self.cached_chunk[1]
+        pos = self.chunk_offsets[index]
+        (length,) = CHUNK_LENGTH.unpack_from(self.data, pos)
+        start = pos + CHUNK_LENGTH.size
+        chunk = ReplayChunk.decode(self.data[start:start + length])
+        self.cached_chunk = (index, chunk)
+        return chunk
+
+    def tick_count(self):
+        if not self.chunk_offsets:
+            return 0
+        return self.read_chunk(len(self.chunk_offsets) - 1).end_tick()
+
+    def chunk_index_at(self, tick):
+        """指定した更新番号を含むチャンクの番号（チャンクはキーフレーム間隔ごとに始まる）"""
+        return max(0, min(tick // self.keyframe_interval, len(self.chunk_offsets) - 1))
+
+    def game_at(self, tick, headless=True):
+        """指定した更新番号の直前の状態のゲームを作る
+
+        直前のキーフレームの状態に戻し、そこから指定の更新番号まで
+        記録した操作と入力で進める（進める回数はキーフレーム間隔未満）。
+        """
+        if not self.chunk_offsets:
+            raise ValueError("リプレイにチャンクがありません")
+        chunk = self.read_chunk(self.chunk_index_at(tick))
+        tick = min(tick, chunk.end_tick())
+
+        game = create_replay_game(self.seed, self.game_config, None, headless)
+        game.restore_snapshot(chunk.snapshot)
+        for current in range(chunk.start_tick, tick):
+            for action in chunk.actions.get(current, []):
+                game.perform_action(action)
+            game.apply_input(unpack_input(*chunk.inputs[current - chunk.start_tick]))
+            game.update()
+        return game
+
+    def to_replay(self):
+        """すべてのチャンクを展開して Replay にまとめる"""
+        inputs = []
+        actions = {}
+        for index in range(len(self.chunk_offsets)):
+            chunk = self.read_chunk(index)
+            inputs.extend(chunk.inputs)
+            for tick, names in chunk.actions.items():
+                actions.setdefault(tick, []).extend(names)
+        return Replay(self.seed, self.game_config, inputs, actions, self.result)
+
+
+class ReplayRecorder:
+    """ゲームの更新ごとの入力と操作をリプレイファイルに書き込む
+
+    キーフレーム間隔ごとに、その更新の前のゲームの状態をキーフレームとして保存する。
+    """
+
+    def __init__(self, game, game_config, directory=REPLAY_DIR, keyframe_interval=REPLAY_KEYFRAME_INTERVAL):
+        self.game = game
+        self.keyframe_interval = keyframe_interval
+        self.tick = 0
+        self.chunk_tick = None  # 記録中のチャンクの開始更新番号
+        self.path = None
+
+        config = {
+            "chara": game_config["chara"],
+            "difficulty": game_config["difficulty"],
+            "difficulty_settings": game_config["difficulty_settings"],
+            "stage_index": game_config.get("stage_index", 0),
+        }
+        chara_name = os.path.basename(os.path.normpath(config["chara"]["folder"]))
+        filename = f"{chara_name}_{config['difficulty']}_{time.strftime('%Y%m%d_%H%M%S')}{REPLAY_EXTENSION}"
+        try:
+            self.writer = ReplayWriter(os.path.join(directory, filename), game.seed, config, keyframe_interval)
+        except OSError as e:
+            print(f"リプレイファイルを作成できません: {e}")
+            self.writer = None
+
+    def begin_tick(self):
+        """キーフレーム間隔ごとの最初の記録で新しいチャンクを始める"""
+        if self.tick % self.keyframe_interval == 0 and self.chunk_tick != self.tick:
+            self.writer.start_chunk(self.tick, self.game.snapshot())
+            self.chunk_tick = self.tick
+
+    def record_action(self, action):
+        """次の更新の前に実行した操作を記録"""
+        if self.writer is None:
+            return
+        self.begin_tick()
+        self.writer.add_action(self.tick, action)
+
+    def record_input(self, player_input):
+        """1回の更新で使った入力を記録"""
+        if self.writer is None:
+            return
+        self.begin_tick()
+        self.writer.add_input(*pack_input(player_input))
+        self.tick += 1
+
+    def finish(self):
+        """記録を終了してファイルを閉じ、保存したパスを返す（2回目以降はNone）"""
+        if self.writer is None:
+            return None
+        writer = self.writer
+        self.writer = None
+        try:
+            writer.close({"state": self.game.game_state, "score": self.game.score, "ticks": self.tick})
+        except OSError as e:
+            print(f"リプレイの保存に失敗しました: {e}")
+            return None
+        return writer.path
+
+
+class ReplayInputSource:
+    """記録した入力を更新ごとに返す入力元"""
+
+    def __init__(self, replay):
+        self.replay = replay
+        self.tick = 0
+
+    def read(self, game):
+        if self.tick < len(self.replay.inputs):
+            player_input = unpack_input(*self.replay.inputs[self.tick])
+        else:
+            player_input = PlayerInput()
+        self.tick += 1
+        return player_input
+
+
+def create_replay_game(seed, game_config, input_source, headless=True):
+    """リプレイ再生用のゲームを作る（記録はしない）"""
+    from game_logics.game import Game
+
+    game_config = dict(game_config)
+    game_config["seed"] = seed
+    game_config["headless"] = headless
+    game_config["record_replay"] = False
+    game_config["input_source"] = input_source
+    return Game(game_config)
+
+
+def play_replay(replay, headless=True):
+    """リプレイを再生してゲームを返す（headless=Trueならウィンドウなし・描画なしで最速）"""
+    game = create_replay_game(replay.seed, replay.game_config, ReplayInputSource(replay), headless)
+
+    for tick in range(replay.tick_count()):
+        for action in replay.actions.get(tick, []):
+            game.perform_action(action)
+        game.handle_input()
+        game.update()
+        if not headless:
+            game.draw()
+    # 最後の更新の後に行った操作
+    for action in replay.actions.get(replay.tick_count(), []):
+        game.perform_action(action)
+    return game
+
+
+def verify_replay(replay):
+    """リプレイを再生し、記録時と同じ結果（状態とスコア）になるか確認する"""
+    game = play_replay(replay)
+    if replay.result is None:
+        return False
+    return game.game_state == replay.result["state"] and game.score == replay.result["score"]
@@ -0,0 +1,46 @@
+import os
+import pygame
+from background_loader import BackgroundLoader
+from constants.constants import ICON_CACHE_SIZE
+
+ICON_FILE = "icon.png"
+CLEAR_ICON_FILE = "icon_clear.png"  # クリア済みの場合に優先して使うアイコン
+
+
+def load_icon(folder, size, cleared):
+    """キャラクターのアイコンを読み込んで拡大縮小する（画像がない・読めない場合はNone）"""
+    paths = [os.path.join(folder, CLEAR_ICON_FILE)] if cleared else []
+    paths.append(os.path.join(folder, ICON_FILE))
+    for path in paths:
+        if os.path.exists(path):
+            try:
+                return pygame.transform.scale(pygame.image.load(path), size)
+            except (pygame.error, FileNotFoundError):
+                return None
+    return None
+
+
+class IconCache:
+    """拡大縮小済みのキャラクターアイコンを共有するキャッシュ
+
+    (フォルダ, サイズ, クリア済みか) をキーに、BackgroundLoader で先読みと保持を行う。
+    """
+
+    def __init__(self, max_entries=ICON_CACHE_SIZE):
+        self.loader = BackgroundLoader(lambda key: load_icon(*key), max_entries=max_entries, name="icon-loader")
+
+    def get_icon(self, folder, size, cleared=False):
+        """アイコンを取得（画像がない場合はNone）"""
+        return self.loader.get((folder, size, cleared))
+
+    def prefetch(self, folder, size, cleared=False):
+        """アイコンの読み込みを別スレッドに予約する（すぐに戻る）"""
+        self.loader.prefetch((folder, size, cleared))
+
+    def clear(self):
+        """キャッシュを破棄する"""
+        self.loader.clear()
+
+
+# プロセス全体で共有するキャッシュ
+icon_cache = IconCache()
@@ -5,6 +5,8 @@ import csv
 import os
 from constants.block_colors import BLOCK_COLORS
 from constants.constants import WHITE
+from game_logics.layout_cache import stage_layout_cache
+from config_repository import config_repository
 
 # 初期化
 pygame.init()
@@ -644,9 +646,7 @@ class LayoutViewer:
     def load_charas_data(self):
         """charas.jsonからキャラクターデータを読み込む"""
         try:
-            with open("settings/charas.json", "r", encoding="utf-8") as f:
-                data = json.load(f)
-            return data["charas"]
+            return config_repository.get_charas()
         except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
             print(f"charas.jsonの読み込みに失敗しました: {e}")
             # デフォルトデータを返す
@@ -661,10 +661,7 @@ class LayoutViewer:
             return []
         
         try:
-            stage_json_path = os.path.join(self.current_chara["folder"], "stage.json")
-            with open(stage_json_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            return data["stages"]
+            return config_repository.get_stages(self.current_chara["folder"])
         except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
             print(f"{self.current_chara['folder']}/stage.jsonの読み込みに失敗しました: {e}")
             # デフォルトのステージデータを返す
@@ -682,22 +679,8 @@ class LayoutViewer:
             ]
     
     def load_block_layout_from_csv(self, csv_path):
-        """CSVファイルからブロック配置を読み込む"""
-        block_layout = []
-        try:
-            with open(csv_path, "r", encoding="utf-8") as f:
-                csv_reader = csv.reader(f)
-                for row in csv_reader:
-                    # 各要素を整数に変換（空白を除去）
-                    layout_row = [int(cell.strip()) for cell in row if cell.strip()]
-                    if layout_row:  # 空行でない場合のみ追加
-                        block_layout.append(layout_row)
-        except (FileNotFoundError, ValueError, csv.Error) as e:
-            print(f"CSVファイルの読み込みに失敗しました: {e}")
-            # デフォルトのブロック配置を返す（空の配置）
-            block_layout = [[0 for _ in range(21)] for _ in range(23)]
-        
-        return block_layout
+        """CSVファイルからブロック配置を読み込む（編集用のコピーを返す）"""
+        return stage_layout_cache.get_editable_layout(csv_path)
     
     def load_foreground_image(self):
         """前景画像を読み込む。画像がない場合は、ブロック配置に基づいて色付きの前景を生成"""
@@ -721,7 +704,7 @@ class LayoutViewer:
         
         # CSVファイルからブロック配置を読み込み
         csv_path = os.path.join(self.current_chara["folder"], f"{self.current_stage_config['definition']}.csv")
-        block_layout = self.load_block_layout_from_csv(csv_path)
+        block_layout = stage_layout_cache.get_layout(csv_path)
         
         # stage.jsonにforeground_colorsが定義されている場合はそれを使用
         foreground_colors = self.current_stage_config.get('foreground_colors', {})
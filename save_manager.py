@@ -1,109 +1,60 @@
-import csv
+import contextlib
 import json
-import os
+from config_repository import config_repository
+from save_store import copy_record, save_store
 
 class SaveManager:
-    """セーブデータの読み込み・書き込みを管理するクラス"""
+    """セーブデータの読み込み・書き込みを管理するクラス
+
+    セーブデータ本体は全画面で共有する save_store（SQLite）にあり、
+    キャラクターのフォルダ名で必要なレコードだけを読み込む。
+    """
     
     def __init__(self):
-        self.save_file_path = "save/save.dat"
-        self.charas_file_path = "settings/charas.json"
-        self.save_data = self.load_save_data()
+        self.batch_depth = 0  # batch() の入れ子の深さ
+        self.changed = {}  # batch() の中で更新したまだ保存していないレコード（フォルダ名 -> レコード）
     
-    def load_save_data(self):
-        """セーブデータを読み込む"""
-        save_data = {}
-        try:
-            with open(self.save_file_path, "r", encoding="utf-8") as f:
-                csv_reader = csv.reader(f)
-                header = next(csv_reader)  # ヘッダー行をスキップ
-                
-                for i, row in enumerate(csv_reader):
-                    if len(row) >= 8:  # 最低限のデータがある場合
-                        chara_name = f"chara_{i}"  # インデックスでキャラクター名を識別
-                        save_data[chara_name] = {
-                            "clear": int(row[0]) if row[0] else 0,
-                            "hi_score": int(row[1]) if row[1] else 0,
-                            "bonus_flags": [int(row[j]) if row[j] else 0 for j in range(2, 8)]
-                        }
-                    else:
-                        # データが不足している場合はデフォルト値
-                        chara_name = f"chara_{i}"
-                        save_data[chara_name] = {
-                            "clear": 0,
-                            "hi_score": 0,
-                            "bonus_flags": [0, 0, 0, 0, 0, 0]
-                        }
-        except (FileNotFoundError, csv.Error) as e:
-            print(f"セーブデータの読み込みに失敗しました: {e}")
-            # charas.jsonからキャラクター数を取得してデフォルトデータを作成
-            try:
-                charas_data = self.load_charas_data()
-                max_charas = len(charas_data)
-            except:
-                max_charas = 6  # フォールバック値
-            
-            # デフォルトのセーブデータを作成
-            for i in range(max_charas):
-                chara_name = f"chara_{i}"
-                save_data[chara_name] = {
-                    "clear": 0,
-                    "hi_score": 0,
-                    "bonus_flags": [0, 0, 0, 0, 0, 0]
-                }
-        
-        return save_data
+    @property
+    def save_data(self):
+        """全キャラクターのセーブデータ（charas.jsonの記述順に chara_0, chara_1, ...）"""
+        return {f"chara_{i}": self.get_chara_data(chara["folder"])
+                for i, chara in enumerate(self.load_charas_data())}
     
     def save_game_data(self):
-        """ゲームデータをセーブファイルに書き込む"""
+        """更新したセーブデータを書き込む（書き込みは別スレッドで行う）
+
+        batch() の中では書き込まずに、batch() を抜ける時に1回だけ書き込む。
+        """
+        if self.batch_depth > 0:
+            return
+        changed = self.changed
+        self.changed = {}
+        for chara_folder, record in changed.items():
+            save_store.put(chara_folder, record)
+    
+    @contextlib.contextmanager
+    def batch(self):
+        """中で行った複数の更新をまとめて1回の書き込みにする"""
+        self.batch_depth += 1
         try:
-            # セーブディレクトリが存在しない場合は作成
-            os.makedirs("save", exist_ok=True)
-            
-            # charas.jsonからキャラクター数を取得
-            try:
-                charas_data = self.load_charas_data()
-                max_charas = len(charas_data)
-            except:
-                # charas.jsonが読み込めない場合は現在のsave_dataの数を使用
-                max_charas = max(len(self.save_data), 6)
-            
-            with open(self.save_file_path, "w", encoding="utf-8", newline="") as f:
-                csv_writer = csv.writer(f)
-                
-                # ヘッダー行を書き込み
-                csv_writer.writerow(["Clear", "HiScore", "Bonus1", "Bonus2", "Bonus3", "Bonus4", "Bonus5", "Bonus6"])
-                
-                # 各キャラクターのデータを書き込み
-                for i in range(max_charas):
-                    chara_name = f"chara_{i}"
-                    if chara_name in self.save_data:
-                        data = self.save_data[chara_name]
-                        row = [
-                            data["clear"],
-                            data["hi_score"],
-                            *data["bonus_flags"]
-                        ]
-                    else:
-                        # データが存在しない場合はデフォルト値
-                        row = [0, 0, 0, 0, 0, 0, 0, 0]
-                    csv_writer.writerow(row)
-                
-            print("セーブデータを保存しました")
-        except Exception as e:
-            print(f"セーブデータの保存に失敗しました: {e}")
+            yield self
+        finally:
+            self.batch_depth -= 1
+            if self.batch_depth == 0 and self.changed:
+                self.save_game_data()
+    
+    def flush(self):
+        """予約済みの書き込みが終わるまで待つ"""
+        self.save_game_data()
+        save_store.wait()
     
     def get_chara_save_key(self, chara_folder):
         """キャラクターのフォルダ名からセーブデータキーを取得"""
-        # charas.jsonから記述順を取得してマッピング
+        # charas.jsonの記述順に基づいてインデックスを取得
         try:
-            with open(self.charas_file_path, "r", encoding="utf-8") as f:
-                charas_data = json.load(f)
-            
-            # charas.jsonの記述順に基づいてインデックスを取得
-            for i, chara in enumerate(charas_data["charas"]):
-                if chara["folder"] == chara_folder:
-                    return f"chara_{i}"
+            chara_index = config_repository.get_chara_index(chara_folder)
+            if chara_index is not None:
+                return f"chara_{chara_index}"
             
             # 見つからない場合はデフォルト
             print(f"警告: {chara_folder}がcharas.jsonに見つかりません。デフォルト値を使用します。")
@@ -120,60 +71,61 @@ class SaveManager:
             return folder_mapping.get(chara_folder, "chara_0")
     
     def get_chara_data(self, chara_folder):
-        """指定されたキャラクターのセーブデータを取得"""
-        chara_key = self.get_chara_save_key(chara_folder)
-        
-        if chara_key not in self.save_data:
-            self.save_data[chara_key] = {
-                "clear": 0,
-                "hi_score": 0,
-                "bonus_flags": [0, 0, 0, 0, 0, 0]
-            }
-        
-        return self.save_data[chara_key]
+        """指定されたキャラクターのセーブデータのコピーを取得（変更は update_* で保存する）"""
+        record = self.changed.get(chara_folder)
+        if record is not None:
+            return copy_record(record)
+        return save_store.get(chara_folder)
+    
+    def get_record_for_update(self, chara_folder):
+        """更新するレコードを取得（batch() の中で更新済みならその続きから更新する）"""
+        record = self.changed.get(chara_folder)
+        if record is None:
+            record = save_store.get(chara_folder)
+        return record
     
     def update_chara_data(self, chara_folder, clear=None, hi_score=None, bonus_flags=None):
         """指定されたキャラクターのセーブデータを更新"""
-        chara_key = self.get_chara_save_key(chara_folder)
-        
-        if chara_key not in self.save_data:
-            self.save_data[chara_key] = {
-                "clear": 0,
-                "hi_score": 0,
-                "bonus_flags": [0, 0, 0, 0, 0, 0]
-            }
+        record = self.get_record_for_update(chara_folder)
         
         # 指定された項目のみ更新
         if clear is not None:
-            self.save_data[chara_key]["clear"] = clear
+            record["clear"] = clear
         
         if hi_score is not None:
-            self.save_data[chara_key]["hi_score"] = hi_score
+            record["hi_score"] = hi_score
         
         if bonus_flags is not None:
-            self.save_data[chara_key]["bonus_flags"] = bonus_flags[:]  # コピーを作成
+            record["bonus_flags"] = bonus_flags[:]  # コピーを作成
         
         # セーブファイルに書き込み
+        self.changed[chara_folder] = record
         self.save_game_data()
     
+    def get_bonus_flag(self, chara_folder, stage_number):
+        """指定されたキャラクターの特定ステージのボーナスフラグを取得（記録がない場合は0）"""
+        bonus_flags = self.get_chara_data(chara_folder)["bonus_flags"]
+        bonus_index = stage_number - 1
+        if 0 <= bonus_index < len(bonus_flags):
+            return bonus_flags[bonus_index]
+        return 0
+    
     def update_bonus_flag(self, chara_folder, stage_number, flag_value):
         """指定されたキャラクターの特定ステージのボーナスフラグを更新"""
-        chara_key = self.get_chara_save_key(chara_folder)
-        
-        if chara_key not in self.save_data:
-            self.save_data[chara_key] = {
-                "clear": 0,
-                "hi_score": 0,
-                "bonus_flags": [0, 0, 0, 0, 0, 0]
-            }
+        record = self.get_record_for_update(chara_folder)
         
         # ステージ番号からボーナスフラグのインデックスを計算（stage1=index0, stage2=index1...）
         bonus_index = stage_number - 1
-        if 0 <= bonus_index < len(self.save_data[chara_key]["bonus_flags"]):
-            self.save_data[chara_key]["bonus_flags"][bonus_index] = flag_value
+        if bonus_index >= 0:
+            # ステージ数に合わせてフラグを増やす
+            bonus_flags = record["bonus_flags"]
+            if bonus_index >= len(bonus_flags):
+                bonus_flags.extend([0] * (bonus_index + 1 - len(bonus_flags)))
+            bonus_flags[bonus_index] = flag_value
             print(f"ステージ{stage_number}のボーナス画像フラグを更新しました: {flag_value}")
             
             # セーブファイルに書き込み
+            self.changed[chara_folder] = record
             self.save_game_data()
             return True
         
@@ -181,42 +133,13 @@ class SaveManager:
     
     def reload_save_data(self):
         """セーブデータを再読み込み"""
-        self.save_data = self.load_save_data()
+        save_store.invalidate()
     
     def reset_all_save_data(self):
         """すべてのセーブデータを初期化"""
         try:
-            # セーブディレクトリが存在しない場合は作成
-            os.makedirs("save", exist_ok=True)
-            
-            # charas.jsonからキャラクター数を取得
-            try:
-                charas_data = self.load_charas_data()
-                max_charas = len(charas_data)
-            except:
-                max_charas = 6  # フォールバック値
-            
-            # save.datファイルを初期化
-            with open(self.save_file_path, "w", encoding="utf-8", newline="") as f:
-                csv_writer = csv.writer(f)
-                
-                # ヘッダー行を書き込み
-                csv_writer.writerow(["Clear", "HiScore", "Bonus1", "Bonus2", "Bonus3", "Bonus4", "Bonus5", "Bonus6"])
-                
-                # 各キャラクターのデータを0で初期化
-                for i in range(max_charas):
-                    csv_writer.writerow([0, 0, 0, 0, 0, 0, 0, 0])
-            
-            # メモリ上のセーブデータも初期化
-            self.save_data = {}
-            for i in range(max_charas):
-                chara_name = f"chara_{i}"
-                self.save_data[chara_name] = {
-                    "clear": 0,
-                    "hi_score": 0,
-                    "bonus_flags": [0, 0, 0, 0, 0, 0]
-                }
-            
+            self.changed = {}
+            save_store.clear()
             print("セーブデータを初期化しました")
             return True
         except Exception as e:
@@ -226,9 +149,7 @@ class SaveManager:
     def load_charas_data(self):
         """charas.jsonからキャラクターデータを読み込む"""
         try:
-            with open(self.charas_file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            return data["charas"]
+            return config_repository.get_charas()
         except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
             print(f"charas.jsonの読み込みに失敗しました: {e}")
             raise SystemExit(f"必須ファイル charas.json の読み込みに失敗しました: {e}")
@@ -236,10 +157,7 @@ class SaveManager:
     def load_stage_data(self, chara_folder):
         """指定されたキャラクターのステージデータを読み込む"""
         try:
-            stage_json_path = os.path.join(chara_folder, "stage.json")
-            with open(stage_json_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            return data["stages"]
+            return config_repository.get_stages(chara_folder)
         except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
             print(f"{chara_folder}/stage.jsonの読み込みに失敗しました: {e}")
             raise SystemExit(f"必須ファイル {chara_folder}/stage.json の読み込みに失敗しました: {e}")
@@ -247,9 +165,7 @@ class SaveManager:
     def load_difficulty_data(self):
         """難易度データを読み込む"""
         try:
-            with open("settings/game_difficulty.json", "r", encoding="utf-8") as f:
-                data = json.load(f)
-            return data["difficulties"]
+            return config_repository.get_difficulties()
         except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
             print(f"難易度設定ファイルの読み込みに失敗しました: {e}")
             # デフォルト設定を返す
@@ -298,48 +214,20 @@ class SaveManager:
         return True
     
     def check_and_extend_save_data(self, verbose=False):
-        """save.datのレコード数をcharas.jsonのキャラクター数に合わせる"""
+        """セーブデータのレコード数とcharas.jsonのキャラクター数を確認する
+
+        セーブデータはフォルダ名で管理し、記録のないキャラクターは初期値で扱うため
+        レコードを追加する必要はない（互換性のため残している）。
+        """
         try:
-            charas_data = self.load_charas_data()
-            charas_count = len(charas_data)
-            
-            # 現在のsave.datのレコード数を取得
-            current_save_count = len(self.save_data)
-            
+            charas_count = len(self.load_charas_data())
             if verbose:
                 print(f"charas.jsonのキャラクター数: {charas_count}")
-                print(f"save.datの現在のレコード数: {current_save_count}")
-            
-            if charas_count > current_save_count:
-                if verbose:
-                    print(f"save.datのレコード数が不足しています。{charas_count - current_save_count}レコード追加します。")
-                
-                # 不足分のレコードを追加
-                for i in range(current_save_count, charas_count):
-                    chara_name = f"chara_{i}"
-                    self.save_data[chara_name] = {
-                        "clear": 0,
-                        "hi_score": 0,
-                        "bonus_flags": [0, 0, 0, 0, 0, 0]
-                    }
-                
-                # save.datファイルを更新
-                self.save_game_data()
-                if verbose:
-                    print("save.datを更新しました。")
-                return True
-            elif charas_count < current_save_count:
-                if verbose:
-                    print("save.datのレコード数の方が多いですが、削除は行いません。")
-                return False
-            else:
-                if verbose:
-                    print("save.datのレコード数は適切です。")
-                return False
-                
+                print(f"セーブデータのレコード数: {save_store.count()}")
+            return False
         except Exception as e:
             if verbose:
-                print(f"save.datの拡張処理でエラーが発生しました: {e}")
+                print(f"セーブデータの確認でエラーが発生しました: {e}")
             return False
 
 if __name__ == "__main__":
@@ -349,7 +237,7 @@ if __name__ == "__main__":
     # SaveManagerのインスタンスを作成
     save_manager = SaveManager()
     
-    # save.datとcharas.jsonの項目数をチェックして必要に応じて拡張（詳細出力有効）
+    # セーブデータとcharas.jsonの項目数をチェック（詳細出力有効）
     save_manager.check_and_extend_save_data(verbose=True)
     
     print("=== 診断完了 ===")
@@ -0,0 +1,230 @@
+import atexit
+import csv
+import json
+import os
+import sqlite3
+import threading
+from config_repository import config_repository
+
+SAVE_DB_PATH = "save/save.db"
+LEGACY_SAVE_PATH = "save/save.dat"  # 以前のCSV形式のセーブファイル（移行元）
+DEFAULT_BONUS_COUNT = 6
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS charas (
+    id INTEGER PRIMARY KEY,
+    folder TEXT UNIQUE,
+    slot INTEGER,
+    clear INTEGER NOT NULL DEFAULT 0,
+    hi_score INTEGER NOT NULL DEFAULT 0,
+    bonus_flags TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+UPSERT_RECORD = """
+INSERT INTO charas (folder, clear, hi_score, bonus_flags) VALUES (?, ?, ?, ?)
+ON CONFLICT(folder) DO UPDATE SET
+    clear = excluded.clear, hi_score = excluded.hi_score, bonus_flags = excluded.bonus_flags
+"""
+
+
+def default_record():
+    """セーブデータがないキャラクターの初期値"""
+    return {
+        "clear": 0,
+        "hi_score": 0,
+        "bonus_flags": [0] * DEFAULT_BONUS_COUNT
+    }
+
+
+def copy_record(record):
+    """レコードのコピーを作成（ボーナスフラグのリストも複製する）"""
+    return {
+        "clear": record["clear"],
+        "hi_score": record["hi_score"],
+        "bonus_flags": list(record["bonus_flags"])
+    }
+
+
+def encode_bonus_flags(bonus_flags):
+    return ",".join(str(flag) for flag in bonus_flags)
+
+
+def decode_bonus_flags(text):
+    return [int(flag) for flag in text.split(",")] if text else []
+
+
+class SaveStore:
+    """キャラクターごとのセーブデータをSQLiteに保存する
+
+    レコードはキャラクターのフォルダ名（一意インデックス付き）で1件ずつ読むため、
+    キャラクターが増えても起動時に全件を読む必要はない。読んだレコードはキャッシュし、
+    get() はそのコピーを返す。更新は put() でキャッシュに反映してから書き込みスレッドに渡す。書き込み待ちの更新は
+    フォルダごとに最新の1つだけを持ち、まとめて1つのトランザクションで書き込む。
+    """
+
+    def __init__(self, path=SAVE_DB_PATH, legacy_path=LEGACY_SAVE_PATH):
+        self.path = path
+        self.legacy_path = legacy_path
+        self.connection = None  # 読み込み用の接続（初回アクセス時に開く）
+        self.records = {}  # フォルダ名 -> レコード
+        self.pending = {}  # フォルダ名 -> 書き込み待ちのレコード
+        self.writing = False
+        self.clear_requested = False
+        self.condition = threading.Condition()
+        self.thread = None
+
+    def connect(self):
+        """データベースに接続する（読み込み中も書き込めるようにWALモードにする）"""
+        connection = sqlite3.connect(self.path, timeout=10)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(SCHEMA)
+        return connection
+
+    def open(self):
+        """データベースを開く（初回は以前のCSVのセーブファイルを移行する）"""
+        if self.connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.connection = self.connect()
+            self.migrate_legacy()
+        return self.connection
+
+    def migrate_legacy(self):
+        """CSVのセーブファイルの全行をデータベースに移す（移行済みなら何もしない）
+
+        行番号は charas.json の記述順でフォルダ名に対応付ける。対応するキャラクターの
+        ない行も行番号（slot）付きで残し、ボーナスフラグは列の数だけそのまま移す。
+        """
+        connection = self.connection
+        if connection.execute("SELECT 1 FROM meta WHERE key = 'legacy_migrated'").fetchone():
+            return
+        try:
+            with open(self.legacy_path, "r", encoding="utf-8") as f:
+                rows = list(csv.reader(f))[1:]  # ヘッダー行をスキップ
+        except FileNotFoundError:
+            rows = []
+        except (OSError, csv.Error) as e:
+            # 読めない場合は移行済みにせず次回もう一度試す
+            print(f"セーブデータの移行に失敗しました: {e}")
+            return
+
+        folders = []
+        if rows:
+            try:
+                folders = [chara["folder"] for chara in config_repository.get_charas()]
+            except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
+                # 行とキャラクターを対応付けられないため移行済みにせず次回もう一度試す
+                print(f"セーブデータの移行に失敗しました（charas.jsonを読み込めません）: {e}")
+                return
+
+        values = []
+        for slot, row in enumerate(rows):
+            folder = folders[slot] if slot < len(folders) else None
+            numbers = [int(value) if value else 0 for value in row]
+            numbers += [0] * (2 - len(numbers))
+            values.append((folder, slot, numbers[0], numbers[1], encode_bonus_flags(numbers[2:])))
+
+        # 移行の途中で落ちても中途半端な状態が残らないように1つのトランザクションで行う
+        with connection:
+            connection.executemany(
+                "INSERT OR IGNORE INTO charas (folder, slot, clear, hi_score, bonus_flags) VALUES (?, ?, ?, ?, ?)",
+                values)
+            connection.execute("INSERT INTO meta (key, value) VALUES ('legacy_migrated', ?)", (str(len(values)),))
+        if values:
+            print(f"セーブデータを移行しました: {len(values)}件")
+
+    def get(self, folder):
+        """キャラクターのレコードのコピーを取得（ない場合は初期値、変更は put() で保存する）"""
+        record = self.records.get(folder)
+        if record is None:
+            row = self.open().execute(
+                "SELECT clear, hi_score, bonus_flags FROM charas WHERE folder = ?", (folder,)).fetchone()
+            if row is None:
+                record = default_record()
+            else:
+                record = {
+                    "clear": row[0],
+                    "hi_score": row[1],
+                    "bonus_flags": decode_bonus_flags(row[2])
+                }
+            self.records[folder] = record
+        return copy_record(record)
+
+    def put(self, folder, record):
+        """レコードを更新して書き込みを予約する（すぐに戻る）"""
+        record = copy_record(record)
+        self.records[folder] = record
+        with self.condition:
+            self.pending[folder] = (record["clear"], record["hi_score"], encode_bonus_flags(record["bonus_flags"]))
+            self.start_writer()
+            self.condition.notify_all()
+
+    def clear(self):
+        """すべてのレコードを削除する（削除し終わるまで待つ）"""
+        self.open()
+        with self.condition:
+            self.pending.clear()
+            self.clear_requested = True
+            self.records.clear()
+            self.start_writer()
+            self.condition.notify_all()
+        self.wait()
+
+    def count(self):
+        """保存されているレコード数を取得"""
+        self.wait()
+        return self.open().execute("SELECT COUNT(*) FROM charas").fetchone()[0]
+
+    def invalidate(self):
+        """キャッシュを破棄して次の取得でデータベースから読み直す"""
+        self.wait()
+        self.records.clear()
+
+    def wait(self):
+        """予約済みの書き込みがすべて終わるまで待つ"""
+        with self.condition:
+            while self.pending or self.clear_requested or self.writing:
+                self.condition.wait()
+
+    def start_writer(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.write_loop, name="save-writer", daemon=True)
+            self.thread.start()
+
+    def write_loop(self):
+        """書き込みスレッド：予約された更新を1つのトランザクションでまとめて書き込む"""
+        connection = None
+        while True:
+            with self.condition:
+                while not self.pending and not self.clear_requested:
+                    self.condition.wait()
+                values = [(folder, *record) for folder, record in self.pending.items()]
+                clear = self.clear_requested
+                self.pending.clear()
+                self.clear_requested = False
+                self.writing = True
+            try:
+                if connection is None:
+                    connection = self.connect()
+                with connection:
+                    if clear:
+                        connection.execute("DELETE FROM charas")
+                    connection.executemany(UPSERT_RECORD, values)
+                print("セーブデータを保存しました")
+            except sqlite3.Error as e:
+                print(f"セーブデータの保存に失敗しました: {e}")
+            finally:
+                with self.condition:
+                    self.writing = False
+                    self.condition.notify_all()
+
+
+# 全画面で共有するセーブデータ（終了時は書き込み待ちがなくなるまで待つ）
+save_store = SaveStore()
+atexit.register(save_store.wait)
@@ -1,9 +1,13 @@
 import pygame
 import json
-import os
 from constants.constants import *
+from text_cache import text_cache
+from config_repository import config_repository
+from icon_cache import icon_cache
 from save_manager import SaveManager
 
+CHARA_ICON_SIZE = (160, 200)  # キャラクターアイコンの表示サイズ
+
 class BaseSelector:
     """選択画面の基底クラス"""
     
@@ -20,16 +24,10 @@ class BaseSelector:
         self.subtitle = subtitle
         
         # フォントの設定
-        try:
-            self.font = pygame.font.Font("PixelMplus12-Regular.ttf", 32)
-            self.small_font = pygame.font.Font("PixelMplus12-Regular.ttf", 24)
-            self.tiny_font = pygame.font.Font("PixelMplus12-Regular.ttf", 18)
-            self.description_font = pygame.font.Font("PixelMplus12-Regular.ttf", 18)
-        except (pygame.error, FileNotFoundError):
-            self.font = pygame.font.Font(None, 32)
-            self.small_font = pygame.font.Font(None, 24)
-            self.tiny_font = pygame.font.Font(None, 18)
-            self.description_font = pygame.font.Font(None, 18)
+        self.font = text_cache.get_font(32)
+        self.small_font = text_cache.get_font(24)
+        self.tiny_font = text_cache.get_font(18)
+        self.description_font = text_cache.get_font(18)
         
         # セーブデータ管理クラスの初期化
         self.save_manager = SaveManager()
@@ -97,13 +95,13 @@ class BaseSelector:
     
     def draw_title(self, y_offset=32):
         """タイトルを描画"""
-        title_text = self.font.render(self.title, True, self.colors["text_normal"])
+        title_text = text_cache.render(self.font, self.title, self.colors["text_normal"])
         title_rect = title_text.get_rect()
         title_x = (SCREEN_WIDTH - title_rect.width) // 2
         self.screen.blit(title_text, (title_x, y_offset))
         
         if self.subtitle:
-            subtitle_text = self.small_font.render(self.subtitle, True, self.colors["text_disabled"])
+            subtitle_text = text_cache.render(self.small_font, self.subtitle, self.colors["text_disabled"])
             subtitle_rect = subtitle_text.get_rect()
             subtitle_x = (SCREEN_WIDTH - subtitle_rect.width) // 2
             self.screen.blit(subtitle_text, (subtitle_x, y_offset + 40))
@@ -145,14 +143,14 @@ class BaseSelector:
         
         # テキストを描画
         if button["text"]:
-            text_surface = self.small_font.render(button["text"], True, text_color)
+            text_surface = text_cache.render(self.small_font, button["text"], text_color)
             text_rect = text_surface.get_rect(center=rect.center)
             self.screen.blit(text_surface, text_rect)
     
     def draw_character_icon(self, chara, rect, is_cleared=False, is_selected=False, is_enabled=True, icon_display=(None, None)):
         """キャラクターアイコンを描画（共通処理）"""
         # アイコンサイズを計算
-        icon_size = (160, 200)
+        icon_size = CHARA_ICON_SIZE
         if icon_display[0] is not None:
             icon_x = icon_display[0]
         else: 
@@ -162,37 +160,20 @@ class BaseSelector:
         else:
             icon_y = rect.y + 25
         
-        try:
-            # クリア済みの場合はicon_clear.pngを優先、なければicon.pngを使用
-            if is_cleared:
-                clear_icon_path = f"{chara['folder']}/icon_clear.png"
-                if os.path.exists(clear_icon_path):
-                    icon_path = clear_icon_path
-                else:
-                    icon_path = f"{chara['folder']}/icon.png"
-            else:
-                icon_path = f"{chara['folder']}/icon.png"
-            
-            # アイコン画像があれば表示
-            if os.path.exists(icon_path):
-                icon = pygame.image.load(icon_path)
-                icon = pygame.transform.scale(icon, icon_size)
-                self.screen.blit(icon, (icon_x, icon_y))
-            else:
-                # アイコンがない場合はプレースホルダー
-                placeholder_rect = pygame.Rect(icon_x, icon_y, icon_size[0], icon_size[1])
-                pygame.draw.rect(self.screen, (40, 40, 40), placeholder_rect)
-                pygame.draw.rect(self.screen, self.colors["border_normal"], placeholder_rect, 1)
-                
-                # "No Image"テキスト
-                no_image_text = self.tiny_font.render("No Image", True, self.colors["text_disabled"])
-                no_image_rect = no_image_text.get_rect(center=placeholder_rect.center)
-                self.screen.blit(no_image_text, no_image_rect)
-        except (pygame.error, FileNotFoundError):
-            # 画像読み込みエラーの場合はプレースホルダー
+        # クリア済みの場合はicon_clear.pngを優先、なければicon.pngを使用（読み込み済みのアイコンを共有）
+        icon = icon_cache.get_icon(chara["folder"], icon_size, is_cleared)
+        if icon is not None:
+            self.screen.blit(icon, (icon_x, icon_y))
+        else:
+            # アイコンがない場合はプレースホルダー
             placeholder_rect = pygame.Rect(icon_x, icon_y, icon_size[0], icon_size[1])
             pygame.draw.rect(self.screen, (40, 40, 40), placeholder_rect)
             pygame.draw.rect(self.screen, self.colors["border_normal"], placeholder_rect, 1)
+            
+            # "No Image"テキスト
+            no_image_text = text_cache.render(self.tiny_font, "No Image", self.colors["text_disabled"])
+            no_image_rect = no_image_text.get_rect(center=placeholder_rect.center)
+            self.screen.blit(no_image_text, no_image_rect)
         
         # 選択不可の場合は半透明オーバーレイ
         if not is_enabled:
@@ -211,7 +192,7 @@ class BaseSelector:
         else:
             name_color = self.colors["text_disabled"]  # グレー（選択不可）
         
-        name_text = self.small_font.render(chara["name"], True, name_color)
+        name_text = text_cache.render(self.small_font, chara["name"], name_color)
         name_rect = name_text.get_rect()
         name_x = rect.centerx - name_rect.width // 2
         name_y = rect.bottom - 75
@@ -219,19 +200,19 @@ class BaseSelector:
         
         # 状態表示
         if is_cleared:
-            status_text = self.tiny_font.render("♥CLEARED♥", True, self.colors["text_cleared"])
+            status_text = text_cache.render(self.tiny_font, "♥CLEARED♥", self.colors["text_cleared"])
             status_rect = status_text.get_rect()
             status_x = rect.centerx - status_rect.width // 2
             status_y = rect.bottom - 30
             self.screen.blit(status_text, (status_x, status_y))
         elif not is_enabled:
-            status_text = self.tiny_font.render("ロック中", True, self.colors["text_disabled"])
+            status_text = text_cache.render(self.tiny_font, "ロック中", self.colors["text_disabled"])
             status_rect = status_text.get_rect()
             status_x = rect.centerx - status_rect.width // 2
             status_y = rect.bottom - 30
             self.screen.blit(status_text, (status_x, status_y))
         else:
-            status_text = self.tiny_font.render("未クリア", True, self.colors["text_disabled"])
+            status_text = text_cache.render(self.tiny_font, "未クリア", self.colors["text_disabled"])
             status_rect = status_text.get_rect()
             status_x = rect.centerx - status_rect.width // 2
             status_y = rect.bottom - 30
@@ -267,7 +248,7 @@ class BaseSelector:
         pygame.draw.rect(self.screen, WHITE, dialog_rect, 3)
         
         # タイトル
-        title_text = self.small_font.render(self.confirm_title, True, WHITE)
+        title_text = text_cache.render(self.small_font, self.confirm_title, WHITE)
         title_rect = title_text.get_rect()
         title_x = dialog_x + (dialog_width - title_rect.width) // 2
         title_y = dialog_y + 20
@@ -276,7 +257,7 @@ class BaseSelector:
         # メッセージ
         message_lines = self.confirm_message.split('\n')
         for i, line in enumerate(message_lines):
-            message_text = self.tiny_font.render(line, True, WHITE)
+            message_text = text_cache.render(self.tiny_font, line, WHITE)
             message_rect = message_text.get_rect()
             message_x = dialog_x + (dialog_width - message_rect.width) // 2
             message_y = dialog_y + 60 + i * 25
@@ -297,7 +278,7 @@ class BaseSelector:
         
         pygame.draw.rect(self.screen, yes_color, yes_rect)
         pygame.draw.rect(self.screen, yes_border, yes_rect, yes_border_width)
-        yes_text = self.small_font.render("はい", True, WHITE)
+        yes_text = text_cache.render(self.small_font, "はい", WHITE)
         yes_text_rect = yes_text.get_rect(center=yes_rect.center)
         self.screen.blit(yes_text, yes_text_rect)
         
@@ -308,7 +289,7 @@ class BaseSelector:
         
         pygame.draw.rect(self.screen, no_color, no_rect)
         pygame.draw.rect(self.screen, no_border, no_rect, no_border_width)
-        no_text = self.small_font.render("いいえ", True, WHITE)
+        no_text = text_cache.render(self.small_font, "いいえ", WHITE)
         no_text_rect = no_text.get_rect(center=no_rect.center)
         self.screen.blit(no_text, no_text_rect)
         
@@ -361,7 +342,7 @@ class BaseSelector:
     
     def draw_help_text(self, text="矢印キー: 選択  Enter/Space: 決定  ESC: 戻る"):
         """操作説明テキストを描画"""
-        help_text_surface = self.tiny_font.render(text, True, self.colors["text_disabled"])
+        help_text_surface = text_cache.render(self.tiny_font, text, self.colors["text_disabled"])
         help_rect = help_text_surface.get_rect()
         help_x = (SCREEN_WIDTH - help_rect.width) // 2
         self.screen.blit(help_text_surface, (help_x, SCREEN_HEIGHT - 30))
@@ -389,6 +370,7 @@ class BaseSelector:
         """前のページに移動"""
         if self.can_go_prev_page():
             self.current_page -= 1
+            self.prefetch_adjacent_page_icons()
             return True
         return False
     
@@ -396,9 +378,23 @@ class BaseSelector:
         """次のページに移動"""
         if self.can_go_next_page():
             self.current_page += 1
+            self.prefetch_adjacent_page_icons()
             return True
         return False
     
+    def get_paged_charas(self):
+        """ページ分けして表示するキャラクターのリスト（アイコンの先読み用）"""
+        return getattr(self, 'unlocked_charas', [])
+    
+    def prefetch_adjacent_page_icons(self):
+        """前後のページのキャラクターアイコンを別スレッドで読み込んでおく"""
+        charas = self.get_paged_charas()
+        for page in (self.current_page + 1, self.current_page - 1):
+            if 0 <= page < self.total_pages:
+                start = page * self.chars_per_page
+                for chara in charas[start:start + self.chars_per_page]:
+                    icon_cache.prefetch(chara["folder"], CHARA_ICON_SIZE, self.is_chara_cleared(chara))
+    
     def draw_page_buttons(self, selected_item_type=""):
         """ページ切り替えボタンを描画"""
         if self.total_pages <= 1:
@@ -422,7 +418,7 @@ class BaseSelector:
         pygame.draw.rect(self.screen, prev_border, prev_rect, prev_border_width)
         
         prev_text_color = self.colors["text_normal"] if prev_enabled else self.colors["text_disabled"]
-        prev_text = self.small_font.render("◀", True, prev_text_color)
+        prev_text = text_cache.render(self.small_font, "◀", prev_text_color)
         prev_text_rect = prev_text.get_rect(center=prev_rect.center)
         self.screen.blit(prev_text, prev_text_rect)
         
@@ -444,13 +440,13 @@ class BaseSelector:
         pygame.draw.rect(self.screen, next_border, next_rect, next_border_width)
         
         next_text_color = self.colors["text_normal"] if next_enabled else self.colors["text_disabled"]
-        next_text = self.small_font.render("▶", True, next_text_color)
+        next_text = text_cache.render(self.small_font, "▶", next_text_color)
         next_text_rect = next_text.get_rect(center=next_rect.center)
         self.screen.blit(next_text, next_text_rect)
         
         # ページ番号表示
         page_info_text = f"{self.current_page + 1}/{self.total_pages}"
-        page_info_surface = self.tiny_font.render(page_info_text, True, self.colors["text_disabled"])
+        page_info_surface = text_cache.render(self.tiny_font, page_info_text, self.colors["text_disabled"])
         page_info_rect = page_info_surface.get_rect()
         page_info_x = (prev_rect.right + next_rect.left) // 2 - page_info_rect.width // 2
         page_info_y = prev_rect.centery - page_info_rect.height // 2
@@ -541,9 +537,7 @@ class BaseSelector:
     def load_charas_data(self):
         """charas.jsonからキャラクターデータを読み込む（共通処理）"""
         try:
-            with open("settings/charas.json", "r", encoding="utf-8") as f:
-                data = json.load(f)
-            return data["charas"]
+            return config_repository.get_charas()
         except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
             print(f"charas.jsonの読み込みに失敗しました: {e}")
             raise SystemExit(f"必須ファイル charas.json の読み込みに失敗しました: {e}")
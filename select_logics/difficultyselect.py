@@ -1,7 +1,7 @@
 import pygame
-import json
-import os
 from constants.constants import *
+from text_cache import text_cache
+from config_repository import config_repository
 from select_logics.base import BaseSelector
 
 class DifficultySelect(BaseSelector):
@@ -22,14 +22,7 @@ class DifficultySelect(BaseSelector):
         
         # キャラ数が1人だけの場合は戻るボタンをCG閲覧ボタンにする
         try:
-            with open(os.path.join("settings", "charas.json"), encoding="utf-8") as f:
-                charas_data = json.load(f)
-            if isinstance(charas_data, dict) and "charas" in charas_data:
-                chara_count = len(charas_data["charas"])
-            elif isinstance(charas_data, list):
-                chara_count = len(charas_data)
-            else:
-                chara_count = 1
+            chara_count = len(config_repository.get_charas())
         except Exception:
             chara_count = 1
         self.back_button_mode = "quit" if chara_count == 1 else "back"
@@ -222,19 +215,19 @@ class DifficultySelect(BaseSelector):
         else:
             name_color = self.colors["text_normal"]  # 白色（未クリア）
         
-        char_text = self.small_font.render(self.selected_chara['name'], True, name_color)
+        char_text = text_cache.render(self.small_font, self.selected_chara['name'], name_color)
         char_text_x = icon_x + icon_size[0] + 15
         char_text_y = icon_y + 10
         self.screen.blit(char_text, (char_text_x, char_text_y))
         
         # クリア状態の表示
         if is_cleared:
-            clear_text = self.description_font.render("♥CLEARED♥", True, self.colors["text_cleared"])
+            clear_text = text_cache.render(self.description_font, "♥CLEARED♥", self.colors["text_cleared"])
             clear_text_x = char_text_x
             clear_text_y = char_text_y + 30
             self.screen.blit(clear_text, (clear_text_x, clear_text_y))
         else:
-            status_text = self.description_font.render("未クリア", True, self.colors["text_disabled"])
+            status_text = text_cache.render(self.description_font, "未クリア", self.colors["text_disabled"])
             status_text_x = char_text_x
             status_text_y = char_text_y + 30
             self.screen.blit(status_text, (status_text_x, status_text_y))
@@ -242,7 +235,7 @@ class DifficultySelect(BaseSelector):
         # ステージ数の表示
         try:
             stage_data = self.save_manager.load_stage_data(self.selected_chara["folder"])
-            stage_count_text = self.description_font.render(f"{len(stage_data)}ステージ", True, self.colors["text_normal"])
+            stage_count_text = text_cache.render(self.description_font, f"{len(stage_data)}ステージ", self.colors["text_normal"])
             stage_count_x = char_text_x
             stage_count_y = char_text_y + 55
             self.screen.blit(stage_count_text, (stage_count_x, stage_count_y))
@@ -258,7 +251,7 @@ class DifficultySelect(BaseSelector):
         
         # 各行を個別に描画
         for i, line in enumerate(description_lines):
-            description_count_text = self.description_font.render(line, True, self.colors["text_normal"])
+            description_count_text = text_cache.render(self.description_font, line, self.colors["text_normal"])
             line_y = description_count_y + i * 20
             self.screen.blit(description_count_text, (description_count_x, line_y))
 
@@ -278,7 +271,7 @@ class DifficultySelect(BaseSelector):
             pygame.draw.rect(self.screen, self.colors["text_normal"], button['rect'], 2)
             
             # ボタンテキストを描画
-            text_surface = self.small_font.render(button['name'], True, text_color)
+            text_surface = text_cache.render(self.small_font, button['name'], text_color)
             text_rect = text_surface.get_rect(center=button['rect'].center)
             self.screen.blit(text_surface, text_rect)
         
@@ -290,7 +283,7 @@ class DifficultySelect(BaseSelector):
         pygame.draw.rect(self.screen, back_color, self.back_button_rect)
         pygame.draw.rect(self.screen, self.colors["text_normal"], self.back_button_rect, 2)
         
-        back_text = self.small_font.render(back_label, True, text_color)
+        back_text = text_cache.render(self.small_font, back_label, text_color)
         back_text_rect = back_text.get_rect(center=self.back_button_rect.center)
         self.screen.blit(back_text, back_text_rect)
         
@@ -325,7 +318,7 @@ class DifficultySelect(BaseSelector):
             
             # 各行を描画
             for i, line in enumerate(lines):
-                line_surface = self.description_font.render(line, True, self.colors["text_normal"])
+                line_surface = text_cache.render(self.description_font, line, self.colors["text_normal"])
                 line_y = desc_bg_rect.y + 10 + i * 20
                 self.screen.blit(line_surface, (desc_bg_rect.x + 10, line_y))
         
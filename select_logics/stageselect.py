@@ -2,6 +2,7 @@ import pygame
 import json
 import os
 from constants.constants import *
+from text_cache import text_cache
 from gallery_logics.galleryselect import select_gallery_character, GalleryCharacterSelect
 from select_logics.base import BaseSelector
 from save_manager import SaveManager
@@ -37,6 +38,9 @@ class StageSelect(BaseSelector):
         
         # キャラクターボタンの配置を計算
         self.calculate_button_positions()
+        
+        # 前後のページのアイコンを先に読み込んでおく
+        self.prefetch_adjacent_page_icons()
     
     def load_stage_data(self, chara_folder):
         """指定されたキャラクターのステージデータを読み込む（SaveManagerに移行済み）"""
@@ -409,7 +413,7 @@ class StageSelect(BaseSelector):
             else:
                 name_color = self.colors["text_normal"]   # 白色（通常キャラクター）
             
-            name_text = self.small_font.render(chara["name"], True, name_color)
+            name_text = text_cache.render(self.small_font, chara["name"], name_color)
             name_rect = name_text.get_rect()
             name_x = rect.centerx - name_rect.width // 2
             name_y = rect.bottom - 75
@@ -417,7 +421,7 @@ class StageSelect(BaseSelector):
             
             # ハイスコアの表示
             if hi_score > 0:
-                hi_score_text = self.tiny_font.render(f"Hi: {hi_score}", True, WHITE)
+                hi_score_text = text_cache.render(self.tiny_font, f"Hi: {hi_score}", WHITE)
                 hi_score_rect = hi_score_text.get_rect()
                 hi_score_x = rect.centerx - hi_score_rect.width // 2
                 hi_score_y = rect.bottom - 50
@@ -425,7 +429,7 @@ class StageSelect(BaseSelector):
             
             # ステージ数の表示
             stages = self.load_stage_data(chara["folder"])
-            stage_count_text = self.tiny_font.render(f"{len(stages)}ステージ", True, WHITE)
+            stage_count_text = text_cache.render(self.tiny_font, f"{len(stages)}ステージ", WHITE)
             stage_count_rect = stage_count_text.get_rect()
             stage_count_x = rect.centerx - stage_count_rect.width // 2
             stage_count_y = rect.bottom - 30
@@ -433,16 +437,16 @@ class StageSelect(BaseSelector):
             
             # クリア済みの場合はクリアマークを表示
             if is_cleared:
-                clear_text = self.tiny_font.render("♥CLEARED♥", True, self.colors["text_cleared"])
+                clear_text = text_cache.render(self.tiny_font, "♥CLEARED♥", self.colors["text_cleared"])
             # クリアしていないならキャラクタータイプ表示
             elif is_hard_character == "boss":
-                clear_text = self.tiny_font.render("BOSS", True, (255, 150, 150))
+                clear_text = text_cache.render(self.tiny_font, "BOSS", (255, 150, 150))
             elif is_hard_character == "hard":
-                clear_text = self.tiny_font.render("HARD", True, (200, 150, 220))
+                clear_text = text_cache.render(self.tiny_font, "HARD", (200, 150, 220))
             elif is_hard_character == "medley":
-                clear_text = self.tiny_font.render("MEDLEY", True, self.colors["text_normal"])
+                clear_text = text_cache.render(self.tiny_font, "MEDLEY", self.colors["text_normal"])
             else:
-                clear_text = self.tiny_font.render("NORMAL", True, self.colors["text_normal"])
+                clear_text = text_cache.render(self.tiny_font, "NORMAL", self.colors["text_normal"])
             clear_rect = clear_text.get_rect()
             clear_x = rect.centerx - clear_rect.width // 2
             clear_y = rect.top + 5
@@ -455,7 +459,7 @@ class StageSelect(BaseSelector):
         
         pygame.draw.rect(self.screen, gallery_color, self.gallery_button_rect)
         pygame.draw.rect(self.screen, gallery_border, self.gallery_button_rect, gallery_border_width)
-        gallery_text = self.small_font.render("ＣＧ閲覧", True, self.colors["text_normal"])
+        gallery_text = text_cache.render(self.small_font, "ＣＧ閲覧", self.colors["text_normal"])
         gallery_text_rect = gallery_text.get_rect(center=self.gallery_button_rect.center)
         self.screen.blit(gallery_text, gallery_text_rect)
         
@@ -469,7 +473,7 @@ class StageSelect(BaseSelector):
         
         pygame.draw.rect(self.screen, reset_color, self.reset_button_rect)
         pygame.draw.rect(self.screen, reset_border, self.reset_button_rect, reset_border_width)
-        reset_text = self.small_font.render("データ初期化", True, self.colors["text_normal"])
+        reset_text = text_cache.render(self.small_font, "データ初期化", self.colors["text_normal"])
         reset_text_rect = reset_text.get_rect(center=self.reset_button_rect.center)
         self.screen.blit(reset_text, reset_text_rect)
         
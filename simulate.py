@@ -0,0 +1,187 @@
+"""ステージのバランス調整用シミュレーター
+
+ウィンドウを開かずに自動操作でステージを何度もプレイし、クリア率・スコア・
+クリア時間・アイテム取得数を集計する。プレイは複数プロセスに分けて並列に実行する。
+
+使い方:
+    python simulate.py <キャラクターフォルダ> <難易度キー> [--stage 番号] [--runs 回数] [--workers 数]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# ワーカープロセスごとにpygameの起動メッセージが出ないようにする
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from constants.constants import *
+from save_manager import SaveManager
+
+DEFAULT_RUNS = 100
+DEFAULT_MAX_SECONDS = 600  # 1回のプレイの上限（ゲーム内の秒数）
+
+
+def find_chara(save_manager, chara_folder):
+    """キャラクターフォルダに対応するキャラクター情報を取得（charas.jsonになければフォルダ名を使う）"""
+    for chara in save_manager.load_charas_data():
+        if os.path.normpath(chara["folder"]) == os.path.normpath(chara_folder):
+            return chara
+    return {"name": os.path.basename(os.path.normpath(chara_folder)), "folder": chara_folder}
+
+
+def simulate_run(chara, difficulty_key, difficulty_settings, stage_index, seed, max_ticks):
+    """1回分のプレイをヘッドレスで実行して結果を返す（ワーカープロセスで実行）"""
+    # 各プロセスで読み込む（pygameのウィンドウは作らない）
+    from game_logics.game import Game
+    from game_logics.input_source import AutoPilotInputSource
+
+    rng = random.Random(seed)
+    # 打ち返す位置を回ごとにずらしてプレイにばらつきを持たせる
+    input_source = AutoPilotInputSource(offset=rng.randint(-PADDLE_WIDTH // 3, PADDLE_WIDTH // 3))
+
+    game = Game({
+        "chara": chara,
+        "difficulty": difficulty_key,
+        "difficulty_settings": difficulty_settings,
+        "stage_index": stage_index,
+        "seed": seed,
+        "headless": True,
+        "input_source": input_source,
+    })
+    result = game.run_headless(max_ticks, stop_at_stage_clear=True)
+    result["seed"] = seed
+    result["cleared"] = result["state"] in ["stage_clear", "game_clear"]
+    return result
+
+
+def percentile(values, ratio):
+    """値のリストから指定割合の位置の値を取得（最近傍法）"""
+    if not values:
+        return 0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(ratio * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(results, stage_config):
+    """プレイ結果を集計する"""
+    runs = len(results)
+    cleared = [r for r in results if r["cleared"]]
+    scores = [r["score"] for r in results]
+    clear_times = [r["play_time"] for r in cleared]
+
+    item_totals = {}
+    for r in results:
+        for item_type, count in r["item_pickups"].items():
+            item_totals[item_type] = item_totals.get(item_type, 0) + count
+
+    target_score = stage_config["target_score"]
+    target_time = stage_config["target_time"]
+    return {
+        "runs": runs,
+        "clear_rate": len(cleared) / runs if runs else 0,
+        "timeout_rate": sum(1 for r in results if r["state"] == "playing") / runs if runs else 0,
+        "score_mean": statistics.mean(scores) if scores else 0,
+        "score_median": statistics.median(scores) if scores else 0,
+        "score_p10": percentile(scores, 0.1),
+        "score_p90": percentile(scores, 0.9),
+        "target_score": target_score,
+        "target_score_rate": sum(1 for s in scores if s >= target_score) / runs if runs else 0,
+        "clear_time_mean": statistics.mean(clear_times) if clear_times else None,
+        "clear_time_median": statistics.median(clear_times) if clear_times else None,
+        "target_time": target_time,
+        "target_time_rate": sum(1 for t in clear_times if t <= target_time) / runs if runs else 0,
+        "item_pickups_per_run": {item_type: count / runs for item_type, count in sorted(item_totals.items())},
+    }
+
+
+def run_simulation(chara_folder, difficulty_key, stage_indices=None, runs=DEFAULT_RUNS, workers=None,
+                   seed=0, max_seconds=DEFAULT_MAX_SECONDS):
+    """指定ステージ（省略時は全ステージ）を runs 回ずつシミュレーションし、ステージ順に (集計結果, プレイ結果) を返す
+
+    全ステージのプレイを1つのプロセスプールに渡すため、ワーカープロセスの起動と
+    pygameの読み込みは実行全体で1回だけ行う。ステージの結果がそろうたびに返す。
+    """
+    save_manager = SaveManager()
+    chara = find_chara(save_manager, chara_folder)
+    difficulties = save_manager.load_difficulty_data()
+    if difficulty_key not in difficulties:
+        raise SystemExit(f"難易度 {difficulty_key} が見つかりません: {', '.join(difficulties)}")
+    difficulty_settings = difficulties[difficulty_key]
+
+    stage_data = save_manager.load_stage_data(chara["folder"])
+    if stage_indices is None:
+        stage_indices = range(len(stage_data))
+    for stage_index in stage_indices:
+        if not 0 <= stage_index < len(stage_data):
+            raise SystemExit(f"ステージ番号が範囲外です（0～{len(stage_data) - 1}）: {stage_index}")
+
+    max_ticks = int(max_seconds * LOGIC_FPS)
+    jobs = [(stage_index, seed + i) for stage_index in stage_indices for i in range(runs)]
+    workers = workers or os.cpu_count() or 1
+    # プロセス間のやり取りを減らすため、プレイをまとめて各プロセスに渡す
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(
+            simulate_run,
+            [chara] * len(jobs), [difficulty_key] * len(jobs), [difficulty_settings] * len(jobs),
+            [stage_index for stage_index, _ in jobs], [run_seed for _, run_seed in jobs], [max_ticks] * len(jobs),
+            chunksize=chunksize,
+        )
+        # 結果はプレイを渡した順に返るため、runs 回ずつ区切ればステージごとになる
+        for stage_index in stage_indices:
+            stage_results = [next(results) for _ in range(runs)]
+            summary = summarize(stage_results, stage_data[stage_index])
+            summary["chara"] = chara["folder"]
+            summary["difficulty"] = difficulty_key
+            summary["stage"] = stage_data[stage_index]["stage"]
+            yield summary, stage_results
+
+
+def print_summary(summary):
+    """集計結果を表示"""
+    print(f"=== {summary['chara']} ステージ{summary['stage']} ({summary['difficulty']}) {summary['runs']}回 ===")
+    print(f"クリア率: {summary['clear_rate']:.1%}（時間切れ {summary['timeout_rate']:.1%}）")
+    print(f"スコア: 平均 {summary['score_mean']:.0f} / 中央値 {summary['score_median']:.0f} "
+          f"/ 10% {summary['score_p10']} / 90% {summary['score_p90']}")
+    print(f"目標スコア {summary['target_score']} 到達率: {summary['target_score_rate']:.1%}")
+    if summary["clear_time_mean"] is not None:
+        print(f"クリア時間: 平均 {summary['clear_time_mean']:.1f}秒 / 中央値 {summary['clear_time_median']:.1f}秒")
+    print(f"目標時間 {summary['target_time']}秒 以内のクリア率: {summary['target_time_rate']:.1%}")
+    if summary["item_pickups_per_run"]:
+        items = ", ".join(f"{item_type}={count:.2f}" for item_type, count in summary["item_pickups_per_run"].items())
+        print(f"アイテム取得数（1回あたり）: {items}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ステージのバランス調整用シミュレーター")
+    parser.add_argument("chara_folder", help="キャラクターフォルダ（stage.jsonがあるフォルダ）")
+    parser.add_argument("difficulty", help="難易度キー（settings/game_difficulty.json）")
+    parser.add_argument("--stage", type=int, default=None, help="ステージ番号（0から。省略時は全ステージ）")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="1ステージあたりのプレイ回数")
+    parser.add_argument("--workers", type=int, default=None, help="並列プロセス数（省略時はCPU数）")
+    parser.add_argument("--seed", type=int, default=0, help="最初のプレイの乱数シード")
+    parser.add_argument("--max-seconds", type=float, default=DEFAULT_MAX_SECONDS, help="1回のプレイの上限秒数（ゲーム内）")
+    parser.add_argument("--json", dest="json_path", default=None, help="集計結果をJSONで書き出すファイル")
+    args = parser.parse_args(argv)
+
+    stage_indices = None if args.stage is None else [args.stage]
+
+    summaries = []
+    start = time.perf_counter()
+    for summary, _ in run_simulation(args.chara_folder, args.difficulty, stage_indices, args.runs,
+                                     args.workers, args.seed, args.max_seconds):
+        print_summary(summary)
+        print(f"（経過時間 {time.perf_counter() - start:.1f}秒）")
+        summaries.append(summary)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(summaries, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import threading
+import unittest
+import pygame
+from background_loader import BackgroundLoader
+
+
+class BackgroundLoaderTest(unittest.TestCase):
+    """読み込みに失敗しても読み込みスレッドが止まらないこと"""
+
+    def test_failed_load_is_cached_and_worker_keeps_running(self):
+        calls = []
+        done = threading.Event()
+
+        def load(key):
+            calls.append(key)
+            if key == "last":
+                done.set()
+            if key == "broken":
+                raise OSError("壊れたファイル")
+            if key == "huge":
+                raise MemoryError()
+            return pygame.Surface((4, 4))
+
+        loader = BackgroundLoader(load, max_entries=8, name="test-loader")
+        for key in ["broken", "huge", "ok", "last"]:
+            loader.prefetch(key)
+        self.assertTrue(done.wait(5))
+        self.assertTrue(loader._thread.is_alive())
+
+        # 失敗したものも記録されているため、取得してもその場で読み直さない
+        self.assertIsNone(loader.get("broken"))
+        self.assertIsNone(loader.get("huge"))
+        self.assertIsNotNone(loader.get("ok"))
+        self.assertEqual(sorted(calls), ["broken", "huge", "last", "ok"])
+
+    def test_failed_inline_load_returns_none(self):
+        def load(key):
+            raise ValueError(key)
+
+        loader = BackgroundLoader(load, name="test-loader")
+        self.assertIsNone(loader.get("broken"))
+        self.assertEqual(len(loader), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import os
+import unittest
+from game_logics.ball_system import BallSystem, np
+from tests.test_replay import ROOT, create_game
+
+TICKS = 500  # ステージをクリアする前（クリアするとセーブデータに書き込むため）
+MULTI_BALL_INTERVAL = 100  # この間隔でマルチボールを出してボールを増やす
+
+
+def setUpModule():
+    global previous_cwd
+    previous_cwd = os.getcwd()
+    os.chdir(ROOT)
+
+
+def tearDownModule():
+    os.chdir(previous_cwd)
+
+
+def play(vectorized, seed):
+    """Chaos の難易度でボールを増やしながらプレイし、更新ごとのボールの状態と最後の状態を返す"""
+    game = create_game(seed, difficulty="chaos")
+    game.ball_system = BallSystem(game, vectorized=vectorized, min_balls=1)
+    balls = []
+    speeds = set()
+    for tick in range(TICKS):
+        if tick % MULTI_BALL_INTERVAL == 0:
+            game.activate_item_effect("multi_ball")
+        game.handle_input()
+        game.update()
+        balls.append([(ball.x, ball.y, ball.velocity_x, ball.velocity_y) for ball in game.balls])
+        speeds.add(game.current_ball_speed)
+    return balls, speeds, game.snapshot()
+
+
+@unittest.skipIf(np is None, "NumPyがないためまとめて計算する処理は使われない")
+class BallSystemTest(unittest.TestCase):
+    """まとめて計算した場合と1個ずつ計算した場合でボールの動きが完全に一致すること"""
+
+    def test_vectorized_matches_scalar(self):
+        for seed in (1, 3, 5):
+            with self.subTest(seed=seed):
+                scalar_balls, speeds, scalar_state = play(False, seed)
+                vectorized_balls, _, vectorized_state = play(True, seed)
+                # ボールが多い状態でブロックを壊して速度が上がる（移動のやり直しが起きる）こと
+                self.assertGreater(max(len(balls) for balls in scalar_balls), 8)
+                self.assertGreater(len(speeds), 1)
+                self.assertEqual(scalar_state["game_state"], "playing")
+                for tick, (expected, actual) in enumerate(zip(scalar_balls, vectorized_balls)):
+                    self.assertEqual(actual, expected, f"更新番号 {tick}")
+                self.assertEqual(vectorized_state, scalar_state)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+from constants.constants import *
+from game_logics.block import BlockField
+from game_logics.collision import sweep_aabb, find_block_hit, HIT_BLOCK
+
+
+class SweepAabbTest(unittest.TestCase):
+    """移動する矩形と静止した矩形の衝突判定"""
+
+    def test_hit_while_moving(self):
+        # 左から近づいて左の面に当たる
+        result = sweep_aabb(0, 10, 16, 16, 40, 0, 32, 0, 64, 32)
+        self.assertIsNotNone(result)
+        t, _, _, normal_x, normal_y = result
+        self.assertAlmostEqual(t, 16 / 40)
+        self.assertEqual((normal_x, normal_y), (-1, 0))
+
+    def test_no_hit(self):
+        self.assertIsNone(sweep_aabb(0, 40, 16, 16, 40, 0, 32, 0, 64, 32))
+
+    def test_starting_overlap_hits_at_time_zero(self):
+        # 左の面から4ピクセルめり込んだ状態で右に動くと、左の面で時刻0に当たる
+        result = sweep_aabb(20, 10, 16, 16, 5, 3, 32, 0, 64, 32)
+        self.assertIsNotNone(result)
+        t, _, _, normal_x, normal_y = result
+        self.assertEqual(t, 0.0)
+        self.assertEqual((normal_x, normal_y), (-1, 0))
+
+    def test_starting_overlap_uses_least_penetration_axis(self):
+        # 下の面から2ピクセルだけめり込んで上に動く場合は下の面で押し出す
+        result = sweep_aabb(40, 30, 16, 16, -3, -5, 32, 0, 64, 32)
+        self.assertIsNotNone(result)
+        t, _, _, normal_x, normal_y = result
+        self.assertEqual(t, 0.0)
+        self.assertEqual((normal_x, normal_y), (0, 1))
+
+    def test_starting_overlap_moving_out_is_ignored(self):
+        # めり込みの浅い面から出ていく向きに動いている場合は衝突しない
+        self.assertIsNone(sweep_aabb(20, 10, 16, 16, -5, 0, 32, 0, 64, 32))
+
+
+class FindBlockHitTest(unittest.TestCase):
+    """ブロックの中から動き始めたボールがすり抜けないこと"""
+
+    def test_ball_inside_block_hits_it(self):
+        field = BlockField(1, 3, None, None)
+        field.place(0, 1, 1)
+        bx, by = field.position(1)
+        hit = find_block_hit(bx + 6, by + 8, BALL_SIZE, 4, 4, field)
+        self.assertIsNotNone(hit)
+        self.assertEqual(hit.kind, HIT_BLOCK)
+        self.assertEqual(hit.block_index, 1)
+        self.assertEqual(hit.time, 0.0)
+        self.assertEqual((hit.normal_x, hit.normal_y), (-1, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import os
+import shutil
+import tempfile
+import unittest
+from save_manager import SaveManager
+from game_logics.game import Game
+from game_logics.input_source import AutoPilotInputSource
+from game_logics.replay import Replay, ReplayReader, play_replay, verify_replay
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TICKS = 1500  # キーフレーム（600回ごと）を2つ越えるまでプレイする
+PAUSE_TICK = 700  # この更新の前に一時停止し、数回後に再開する
+
+
+def setUpModule():
+    # キャラクターフォルダと設定ファイルはリポジトリからの相対パスで読む
+    global previous_cwd
+    previous_cwd = os.getcwd()
+    os.chdir(ROOT)
+
+
+def tearDownModule():
+    os.chdir(previous_cwd)
+
+
+def create_game(seed, difficulty="normal", **options):
+    """自動操作のヘッドレスのゲームを作る"""
+    save_manager = SaveManager()
+    difficulties = save_manager.load_difficulty_data()
+    game_config = {
+        "chara": save_manager.load_charas_data()[0],
+        "difficulty": difficulty,
+        "difficulty_settings": difficulties[difficulty],
+        "seed": seed,
+        "headless": True,
+        "input_source": AutoPilotInputSource(offset=7),
+    }
+    game_config.update(options)
+    return Game(game_config)
+
+
+def play_tick(game, tick, pause_tick=None):
+    """1回分の更新（pause_tick の前に一時停止し、5回後に再開する）"""
+    if tick == pause_tick:
+        game.perform_action("pause")
+    elif pause_tick is not None and tick == pause_tick + 5:
+        game.perform_action("resume")
+    game.handle_input()
+    game.update()
+
+
+def play(game, ticks, pause_tick=None):
+    """ゲームを ticks 回更新する"""
+    for tick in range(ticks):
+        play_tick(game, tick, pause_tick)
+    return game
+
+
+class SeededGameTest(unittest.TestCase):
+    """同じシードと入力なら同じ展開になること"""
+
+    def test_same_seed_gives_same_state(self):
+        first = play(create_game(1234), TICKS, PAUSE_TICK).snapshot()
+        second = play(create_game(1234), TICKS, PAUSE_TICK).snapshot()
+        self.assertEqual(first, second)
+
+    def test_different_seed_gives_different_state(self):
+        first = play(create_game(1234), TICKS).snapshot()
+        second = play(create_game(4321), TICKS).snapshot()
+        self.assertNotEqual(first, second)
+
+
+class ReplayRoundTripTest(unittest.TestCase):
+    """記録したリプレイを読み込んで同じ展開を再現できること"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.game = create_game(99, record_replay=True, replay_dir=self.directory)
+        self.snapshots = {}
+        # キーフレームの前後と一時停止中の状態を記録しておく
+        for tick in range(TICKS):
+            if tick in (300, 650, PAUSE_TICK + 2, 1200):
+                self.snapshots[tick] = self.game.snapshot()
+            play_tick(self.game, tick, PAUSE_TICK)
+        self.path = self.game.replay_recorder.finish()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_replay_file_is_written(self):
+        self.assertIsNotNone(self.path)
+        self.assertEqual(os.path.dirname(self.path), self.directory)
+
+    def test_verify_replay(self):
+        replay = Replay.load(self.path)
+        self.assertEqual(replay.tick_count(), TICKS)
+        self.assertEqual(replay.actions[PAUSE_TICK], ["pause"])
+        self.assertEqual(replay.actions[PAUSE_TICK + 5], ["resume"])
+        self.assertTrue(verify_replay(replay))
+
+    def test_play_replay_reaches_recorded_state(self):
+        game = play_replay(Replay.load(self.path))
+        self.assertEqual(game.snapshot(), self.game.snapshot())
+
+    def test_game_at_matches_recorded_states(self):
+        with ReplayReader(self.path) as reader:
+            for tick, snapshot in self.snapshots.items():
+                self.assertEqual(reader.game_at(tick).snapshot(), snapshot, f"更新番号 {tick}")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from game_logics.replay import (
+    ReplayReader, ReplayRecorder, ReplayWriter, read_varint, unzigzag, write_varint, zigzag,
+)
+from tests.test_replay import ROOT, create_game, play_tick
+
+KEYFRAME_INTERVAL = 50
+
+
+def setUpModule():
+    global previous_cwd
+    previous_cwd = os.getcwd()
+    os.chdir(ROOT)
+
+
+def tearDownModule():
+    os.chdir(previous_cwd)
+
+
+class VarintTest(unittest.TestCase):
+    """可変長整数とジグザグ変換"""
+
+    def test_varint_round_trip(self):
+        values = [0, 1, 127, 128, 255, 300, 16383, 16384, 2**32 - 1, 2**63]
+        buffer = bytearray()
+        for value in values:
+            write_varint(buffer, value)
+        pos = 0
+        for value in values:
+            decoded, pos = read_varint(buffer, pos)
+            self.assertEqual(decoded, value)
+        self.assertEqual(pos, len(buffer))
+
+    def test_varint_length(self):
+        for value, length in [(0, 1), (127, 1), (128, 2), (16383, 2), (16384, 3)]:
+            buffer = bytearray()
+            write_varint(buffer, value)
+            self.assertEqual(len(buffer), length, value)
+
+    def test_zigzag_round_trip(self):
+        for value in list(range(-300, 301)) + [-2**40, 2**40]:
+            self.assertGreaterEqual(zigzag(value), 0)
+            self.assertEqual(unzigzag(zigzag(value)), value)
+        # 絶対値が小さいほど小さな値になる
+        self.assertEqual([zigzag(v) for v in (0, -1, 1, -2, 2)], [0, 1, 2, 3, 4])
+
+
+class ReplayFileTest(unittest.TestCase):
+    """チャンクの書き込み・読み込みとフッターのないファイル"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "synthetic.replay")
+        rng = random.Random(3)
+        # 同じ入力の繰り返し・大きなパドルXの差分・パドルXなし（-1）を含める
+        self.inputs = []
+        for _ in range(230):
+            if rng.random() < 0.3 and self.inputs:
+                self.inputs.append(self.inputs[-1])
+            else:
+                self.inputs.append((rng.choice([-1, rng.randrange(0, 700)]), rng.randrange(16)))
+        self.actions = {0: ["pause"], 49: ["resume", "click"], 50: ["pause"], 229: ["resume"]}
+
+        writer = ReplayWriter(self.path, 42, {"difficulty": "normal"}, KEYFRAME_INTERVAL)
+        for tick, (paddle_x, flags) in enumerate(self.inputs):
+            if tick % KEYFRAME_INTERVAL == 0:
+                writer.start_chunk(tick, {"tick": tick})
+            for action in self.actions.get(tick, []):
+                writer.add_action(tick, action)
+            writer.add_input(paddle_x, flags)
+        writer.close({"state": "playing", "score": 1})
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_round_trip(self):
+        with ReplayReader(self.path) as reader:
+            self.assertEqual(reader.seed, 42)
+            self.assertEqual(reader.game_config, {"difficulty": "normal"})
+            self.assertEqual(reader.result, {"state": "playing", "score": 1})
+            self.assertEqual(reader.chunk_count(), 5)
+            self.assertEqual(reader.tick_count(), len(self.inputs))
+            replay = reader.to_replay()
+        self.assertEqual(replay.inputs, self.inputs)
+        self.assertEqual(replay.actions, self.actions)
+
+    def test_chunk_index_at(self):
+        with ReplayReader(self.path) as reader:
+            for tick in [0, 49, 50, 120, 199, 200, 229, 10000]:
+                index = reader.chunk_index_at(tick)
+                chunk = reader.read_chunk(index)
+                self.assertEqual(chunk.snapshot, {"tick": chunk.start_tick})
+                self.assertLessEqual(chunk.start_tick, tick)
+                if tick < len(self.inputs):
+                    self.assertLess(tick, chunk.end_tick())
+
+    def test_missing_trailer_reads_complete_chunks(self):
+        with open(self.path, "rb") as f:
+            data = f.read()
+        with ReplayReader(self.path) as reader:
+            last_chunk_offset = reader.chunk_offsets[-1]
+        # 記録中の強制終了：最後のチャンクの途中で切れている
+        with open(self.path, "wb") as f:
+            f.write(data[:last_chunk_offset + 10])
+        with ReplayReader(self.path) as reader:
+            self.assertIsNone(reader.result)
+            self.assertEqual(reader.chunk_count(), 4)
+            replay = reader.to_replay()
+        self.assertEqual(replay.inputs, self.inputs[:200])
+
+    def test_missing_footer_keeps_every_chunk(self):
+        with open(self.path, "rb") as f:
+            data = f.read()
+        # フッターを書く前に終了：末尾の b"BRPE" がない
+        with open(self.path, "wb") as f:
+            f.write(data[:-4])
+        with ReplayReader(self.path) as reader:
+            self.assertIsNone(reader.result)
+            self.assertEqual(reader.to_replay().inputs, self.inputs)
+
+    def test_not_a_replay(self):
+        with open(self.path, "wb") as f:
+            f.write(b"NOPE" + bytes(32))
+        with self.assertRaises(ValueError):
+            ReplayReader(self.path)
+
+
+class ReplaySeekTest(unittest.TestCase):
+    """キーフレームの間の更新番号から再生を始められること"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        game = create_game(7)
+        game.replay_recorder = ReplayRecorder(game, {
+            "chara": game.selected_chara,
+            "difficulty": game.difficulty_key,
+            "difficulty_settings": game.difficulty_settings,
+        }, self.directory, KEYFRAME_INTERVAL)
+        self.snapshots = {}
+        for tick in range(400):
+            self.snapshots[tick] = game.snapshot()
+            play_tick(game, tick, pause_tick=130)
+        self.path = game.replay_recorder.finish()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_game_at_between_keyframes(self):
+        with ReplayReader(self.path) as reader:
+            for tick in [0, 1, 49, 50, 73, 131, 133, 249, 399]:
+                self.assertEqual(reader.game_at(tick).snapshot(), self.snapshots[tick], f"更新番号 {tick}")
+
+    def test_game_at_without_trailer(self):
+        with open(self.path, "rb") as f:
+            data = f.read()
+        with open(self.path, "wb") as f:
+            f.write(data[:-4])
+        with ReplayReader(self.path) as reader:
+            self.assertIsNone(reader.result)
+            self.assertEqual(reader.game_at(273).snapshot(), self.snapshots[273])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import pygame
+from collections import OrderedDict
+from constants.constants import TEXT_CACHE_SIZE
+
+FONT_FILE = "PixelMplus12-Regular.ttf"
+
+# 縁取り文字を描く時のずらし方（8方向）
+OUTLINE_OFFSETS = [(-1,-1), (-1,1), (1,-1), (1,1), (-1,0), (1,0), (0,-1), (0,1)]
+
+
+class TextCache:
+    """描画済みの文字サーフェスを共有するLRUキャッシュ
+
+    (フォント, サイズ, 文字列, 色, 縁取り色) をキーに font.render() の結果を保持し、
+    上限を超えたら最も長く使われていないものから破棄する。
+    フォントもサイズごとに一度だけ読み込んで共有する。
+    """
+
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._fonts = {}  # サイズ -> フォント
+        self._sizes = {}  # フォント -> サイズ（キャッシュキー用）
+        self._surfaces = OrderedDict()  # キー -> サーフェス（縁取り文字は (サーフェス, ずれ) のリスト）
+
+    def get_font(self, size):
+        """指定サイズのフォントを取得（初回のみ読み込み）"""
+        font = self._fonts.get(size)
+        if font is None:
+            try:
+                font = pygame.font.Font(FONT_FILE, size)
+            except (pygame.error, FileNotFoundError):
+                font = pygame.font.Font(None, size)
+            self._fonts[size] = font
+            self._sizes[font] = size
+        return font
+
+    def render(self, font, text, color):
+        """文字列を描画したサーフェスを取得（アンチエイリアスあり、共有のサーフェス）"""
+        key = (FONT_FILE, self._sizes.get(font, font), text, tuple(color), None)
+        surface = self._get(key)
+        if surface is None:
+            surface = font.render(text, True, color)
+            self._put(key, surface)
+        return surface
+
+    def render_outlined(self, font, text, color, outline_color):
+        """縁取り文字を描くための (サーフェス, ずれ) のリストを取得"""
+        key = (FONT_FILE, self._sizes.get(font, font), text, tuple(color), tuple(outline_color))
+        parts = self._get(key)
+        if parts is None:
+            # 縁取りを8方向に重ねてから本体の文字を重ねる（元の描画と同じ順序）
+            outline = self.render(font, text, outline_color)
+            parts = [(outline, offset) for offset in OUTLINE_OFFSETS]
+            parts.append((self.render(font, text, color), (0, 0)))
+            self._put(key, parts)
+        return parts
+
+    def draw_outlined(self, screen, font, text, color, outline_color, center):
+        """縁取り文字を中心座標に合わせて描画"""
+        parts = self.render_outlined(font, text, color, outline_color)
+        text_rect = parts[-1][0].get_rect(center=center)
+        screen.blits([(surface, (text_rect.x + dx, text_rect.y + dy)) for surface, (dx, dy) in parts], False)
+
+    def clear(self):
+        """キャッシュを破棄する"""
+        self._surfaces.clear()
+
+    def _get(self, key):
+        value = self._surfaces.get(key)
+        if value is not None:
+            self._surfaces.move_to_end(key)
+        return value
+
+    def _put(self, key, value):
+        self._surfaces[key] = value
+        while len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+
+
+# プロセス全体で共有するキャッシュ
+text_cache = TextCache()